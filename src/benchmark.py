@@ -0,0 +1,148 @@
+# benchmark.py
+#
+# This script benchmarks each pipeline stage on synthetic Iris-shaped data.
+# Data is sampled from the class-conditional Gaussians of the raw Iris dataset
+# at increasing row counts. Wall time, rows/sec and peak RSS are appended to a
+# JSON history, and slowdowns versus the previous commit are flagged.
+#
+# Usage:
+# python src/benchmark.py --sizes 1000,10000,100000,1000000 \
+#     --history results/benchmarks/history.json
+# python src/benchmark.py --artifact results/metrics/logreg_model.pickle \
+#     --artifact results/metrics/logreg_model.artifact
+
+
+import click
+
+from utils_benchmark import (
+    STAGES,
+    append_history,
+    artifact_cold_start,
+    find_regressions,
+    load_history,
+    previous_run,
+    run_isolated,
+    run_stage,
+)
+
+
+@click.command()
+@click.option(
+    "--raw",
+    default="data/raw/iris.csv",
+    help="Iris CSV used to fit the synthetic data generator."
+)
+@click.option(
+    "--sizes",
+    default="1000,10000,100000,1000000",
+    show_default=True,
+    help="Comma-separated row counts (up to 1e7 or more)."
+)
+@click.option(
+    "--stage",
+    "stages",
+    multiple=True,
+    type=click.Choice(STAGES),
+    help="Stage to benchmark (repeatable); all stages by default."
+)
+@click.option(
+    "--history",
+    default="results/benchmarks/history.json",
+    help="JSON file accumulating benchmark runs."
+)
+@click.option(
+    "--threshold",
+    default=0.2,
+    show_default=True,
+    help="Relative slowdown flagged as a regression."
+)
+@click.option(
+    "--isolate/--no-isolate",
+    default=True,
+    help="Run each case in a fresh process so peak RSS is per case."
+)
+@click.option(
+    "--fail-on-regression",
+    is_flag=True,
+    help="Exit with status 1 if any regression is flagged."
+)
+@click.option(
+    "--artifact",
+    "artifacts",
+    multiple=True,
+    help="Compare cold start and size of model artifacts (repeatable) instead."
+)
+def main(raw, sizes, stages, history, threshold, isolate, fail_on_regression, artifacts):
+    """Benchmark pipeline stages at increasing data sizes."""
+    if artifacts:
+        compare_artifacts(artifacts)
+        return
+
+    row_counts = [int(float(size)) for size in sizes.split(",")]
+    runner = run_isolated if isolate else run_stage
+
+    results = []
+    failures = []
+    print(f"{'stage':<18}{'rows':>12}{'wall (s)':>12}{'rows/sec':>14}{'peak RSS (MB)':>16}")
+    for stage in stages or STAGES:
+        for n_rows in row_counts:
+            try:
+                result = runner(stage, n_rows, raw)
+            except ValueError as e:
+                # A run that stopped partway is not a timing of the stage; leave it out
+                failures.append((stage, n_rows, str(e)))
+                print(f"{stage:<18}{n_rows:>12}  FAILED: {e}")
+                continue
+            results.append(result)
+            print(
+                f"{stage:<18}{n_rows:>12}{result['wall_seconds']:>12.4f}"
+                f"{result['rows_per_sec']:>14,.0f}{result['peak_rss_mb']:>16.1f}"
+            )
+
+    record = append_history(history, results)
+    print(f"Benchmark results appended to: {history}")
+
+    regressions = report_regressions(results, history, record["commit"], threshold)
+    if failures:
+        print(f"[ERROR] {len(failures)} case(s) failed and were not recorded.")
+        raise SystemExit(1)
+    if regressions and fail_on_regression:
+        raise SystemExit(1)
+
+
+def report_regressions(results, history, commit, threshold):
+    """Print slowdowns versus the previous commit's run; returns them."""
+    previous = previous_run(load_history(history), commit)
+    if previous is None:
+        print("No earlier run to compare against.")
+        return []
+
+    regressions = find_regressions(results, previous["results"], threshold)
+    if not regressions:
+        print(f"No regressions versus commit {previous['commit']}.")
+        return []
+
+    print(f"[WARNING] Regressions versus commit {previous['commit']} (> {threshold:.0%} slower):")
+    for reg in regressions:
+        print(
+            f"  - {reg['stage']} @ {reg['n_rows']} rows: "
+            f"{reg['previous_seconds']:.4f}s -> {reg['current_seconds']:.4f}s "
+            f"({reg['ratio']:.2f}x)"
+        )
+    return regressions
+
+
+def compare_artifacts(paths):
+    """Print cold-start time and size for each model artifact."""
+    print(f"{'artifact':<44}{'size (B)':>10}{'import (s)':>12}{'load (s)':>10}"
+          f"{'1st pred (s)':>14}{'total (s)':>11}{'modules':>9}")
+    for path in paths:
+        r = artifact_cold_start(path)
+        print(
+            f"{path:<44}{r['size_bytes']:>10}{r['import_seconds']:>12.4f}{r['load_seconds']:>10.4f}"
+            f"{r['first_predict_seconds']:>14.4f}{r['cold_start_seconds']:>11.4f}{r['modules_loaded']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ import pandera.pandas as pa
 from pandera.pandas import Column, DataFrameSchema, Check
 import numpy as np
 
+from utils_profile import profile_step
+
 iris_schema = DataFrameSchema(
     {
         "sepal_length": Column(float, nullable=False, checks=Check.greater_than(0)),
@@ -26,10 +28,55 @@ iris_schema = DataFrameSchema(
     coerce=True,
 )
 
+NUMERIC_COLS = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+EXPECTED_SPECIES = {"setosa", "versicolor", "virginica"}
+CORRELATION_THRESHOLD = 0.97
+# Allowed rows per species: Iris is balanced (50 each), with a tolerance of 10
+SPECIES_COUNT_RANGE = (40, 60)
+
+
+def _report_feature_correlations(corr_matrix: pd.DataFrame, numeric_cols: list):
+    """
+    Print a warning for feature pairs whose |correlation| exceeds the threshold.
+    """
+    upper = corr_matrix.where(
+        np.triu(np.ones(corr_matrix.shape), k=1).astype(bool)
+    )
+
+    high_corr_pairs = []
+    threshold = CORRELATION_THRESHOLD
+
+    for col_i in numeric_cols:
+        for col_j in numeric_cols:
+            if col_i == col_j:
+                continue
+            corr_val = upper.loc[col_i, col_j]
+            if pd.notna(corr_val) and corr_val > threshold:
+                high_corr_pairs.append((col_i, col_j, corr_val))
+
+    if high_corr_pairs:
+        msg_lines = [
+            f"[WARNING] High correlations between features detected (|corr| > {threshold}):"
+        ]
+        for col_i, col_j, corr_val in sorted(high_corr_pairs, key=lambda x: -x[2]):
+            msg_lines.append(f"  - {col_i} & {col_j}: corr = {corr_val:.3f}")
+
+        msg_lines.append(
+            "This is a warning only — continuing the analysis (no error raised)."
+        )
 
-def validate_iris_dataframe(df: pd.DataFrame):
+        print("\n".join(msg_lines))
+
+    else:
+        print("Correlation check (feature vs feature) passed.")
+
+
+def validate_iris_dataframe(df: pd.DataFrame, species_count_range: tuple = SPECIES_COUNT_RANGE):
     """
     Validate the Iris dataset.
+
+    `species_count_range` bounds the rows per known species, (40, 60) by
+    default; e.g. synthetic data of another size passes its own bounds.
     """
 
     print("\n=== RUNNING IRIS DATA VALIDATION CHECKS ===")
@@ -40,29 +87,33 @@ def validate_iris_dataframe(df: pd.DataFrame):
     print("Data loaded as pandas DataFrame.")
 
     # Duplicate observations — remove them
-    duplicates = df.duplicated().sum()
-    if duplicates > 0:
-        df = df.drop_duplicates()
+    with profile_step("duplicate_check", rows=len(df)):
+        duplicates = df.duplicated().sum()
+        if duplicates > 0:
+            df = df.drop_duplicates()
     print("Duplicate check passed (duplicates removed if present).")
 
     # Schema validation (columns, types, missingness, empty rows)
     try:
-        df_validated = iris_schema.validate(df)
+        with profile_step("schema_validation", rows=len(df)):
+            df_validated = iris_schema.validate(df)
         print("Schema validation passed.")
     except pa.errors.SchemaError as e:
         raise ValueError(f"Pandera schema validation failed:\n{e}")
 
     # Outlier and anomalies value checks
-    numeric_cols = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
-    z_scores = ((df_validated[numeric_cols] - df_validated[numeric_cols].mean()) /
-                df_validated[numeric_cols].std())
+    numeric_cols = NUMERIC_COLS
+    with profile_step("outlier_check", rows=len(df_validated)):
+        z_scores = ((df_validated[numeric_cols] - df_validated[numeric_cols].mean()) /
+                    df_validated[numeric_cols].std())
+        has_outliers = (z_scores.abs() > 4).any().any()
 
-    if (z_scores.abs() > 4).any().any():
+    if has_outliers:
         raise ValueError("Outlier values detected in numeric columns.")
     print("Outlier check passed.")
 
     #Correct Category levels
-    expected_species = {"setosa", "versicolor", "virginica"}
+    expected_species = EXPECTED_SPECIES
     actual_species = set(df_validated["species"].unique())
 
     unknown_species = actual_species - expected_species
@@ -76,7 +127,7 @@ def validate_iris_dataframe(df: pd.DataFrame):
     #Target response  (Iris is totally balanced but allow a tolerance of 10)
 
     species_count = df_validated["species"].value_counts()
-    if not species_count.between(40,60).all():
+    if not species_count.between(*species_count_range).all():
         raise ValueError("Species distribution outside expected range.")
     print("Target Distribution check passed")
 
@@ -90,43 +141,433 @@ def validate_iris_dataframe(df: pd.DataFrame):
 
     #No anomalous correlations between features
 
-    corr_matrix = df_validated[numeric_cols].corr().abs()
+    with profile_step("feature_correlation_check", rows=len(df_validated)):
+        corr_matrix = df_validated[numeric_cols].corr().abs()
+    _report_feature_correlations(corr_matrix, numeric_cols)
 
-    upper = corr_matrix.where(
-        np.triu(np.ones(corr_matrix.shape), k=1).astype(bool)
+
+    print("=== IRIS DATA VALIDATION — ALL CHECKS PASSED ===\n")
+
+
+    return df_validated
+
+
+class IrisStatistics:
+    """
+    Mergeable sufficient statistics for the dataset-wide Iris checks.
+
+    Holds counts, sums, sums of squares and min/max over all validated rows
+    (for the outlier check), plus per-species counts and sums and the
+    feature cross-product matrix over known-species rows (for the target
+    distribution, feature-target and feature-feature correlation checks).
+    """
+
+    def __init__(self):
+        n_features = len(NUMERIC_COLS)
+        self.n = 0
+        self.sums = np.zeros(n_features)
+        self.sumsq = np.zeros(n_features)
+        self.mins = np.full(n_features, np.inf)
+        self.maxs = np.full(n_features, -np.inf)
+        self.species_counts = {}
+        self.species_sums = {}
+        self.cross = np.zeros((n_features, n_features))
+
+    @classmethod
+    def from_frames(cls, df_all: pd.DataFrame, df_known: pd.DataFrame) -> "IrisStatistics":
+        """
+        Compute statistics for one batch.
+
+        Parameters
+        ----------
+        df_all : pandas.DataFrame
+            Schema-validated rows, including unknown species.
+        df_known : pandas.DataFrame
+            The same rows restricted to expected species.
+        """
+        X = df_all[NUMERIC_COLS].to_numpy(dtype=float)
+        codes, names = pd.factorize(df_all["species"])
+        known = df_all["species"].isin(set(df_known["species"])).to_numpy()
+        return cls.from_arrays(X, codes, np.asarray(names, dtype=object), known)
+
+    @classmethod
+    def from_arrays(
+        cls, X: np.ndarray, codes: np.ndarray, names: np.ndarray, known: np.ndarray
+    ) -> "IrisStatistics":
+        """
+        Compute statistics for one batch from its feature matrix and species codes.
+
+        Parameters
+        ----------
+        X : numpy.ndarray
+            Float64 feature matrix (n_rows, n_features) of validated rows.
+        codes : numpy.ndarray
+            Integer species code per row, indexing `names`.
+        names : numpy.ndarray
+            Species name for each code.
+        known : numpy.ndarray
+            Boolean mask of rows whose species is expected.
+        """
+        stats = cls()
+        stats.n = len(X)
+        if stats.n:
+            stats.sums = X.sum(axis=0)
+            stats.sumsq = np.einsum("ij,ij->j", X, X)
+            stats.mins = X.min(axis=0)
+            stats.maxs = X.max(axis=0)
+
+        X_known = X[known] if not known.all() else X
+        codes_known = codes[known]
+        stats.cross = X_known.T @ X_known
+        counts = np.bincount(codes_known, minlength=len(names))
+        sums = np.column_stack([
+            np.bincount(codes_known, weights=X_known[:, j], minlength=len(names))
+            for j in range(X.shape[1])
+        ]) if len(names) else np.empty((0, X.shape[1]))
+        for code in np.flatnonzero(counts):
+            stats.species_counts[names[code]] = int(counts[code])
+            stats.species_sums[names[code]] = sums[code]
+        return stats
+
+    def merge(self, other: "IrisStatistics") -> "IrisStatistics":
+        """Return the statistics of both batches combined."""
+        merged = IrisStatistics()
+        merged.n = self.n + other.n
+        merged.sums = self.sums + other.sums
+        merged.sumsq = self.sumsq + other.sumsq
+        merged.mins = np.minimum(self.mins, other.mins)
+        merged.maxs = np.maximum(self.maxs, other.maxs)
+        merged.cross = self.cross + other.cross
+        for name in set(self.species_counts) | set(other.species_counts):
+            merged.species_counts[name] = (
+                self.species_counts.get(name, 0) + other.species_counts.get(name, 0)
+            )
+            merged.species_sums[name] = (
+                self.species_sums.get(name, 0.0) + other.species_sums.get(name, 0.0)
+            )
+        return merged
+
+    def check(self, species_count_range: tuple = SPECIES_COUNT_RANGE):
+        """
+        Run the dataset-wide checks of `validate_iris_dataframe` from the
+        statistics alone, raising ValueError on the same conditions.
+        """
+        self.check_outliers()
+        self.check_species(species_count_range)
+
+    def check_outliers(self):
+        """Outlier check over all validated rows."""
+        # Outlier check: some |z| > 4 iff the farthest value from the mean is
+        # more than 4 standard deviations away
+        if self.n > 1:
+            mean = self.sums / self.n
+            var = (self.sumsq - self.n * mean**2) / (self.n - 1)
+            std = np.sqrt(np.maximum(var, 0.0))
+            max_dev = np.maximum(self.maxs - mean, mean - self.mins)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if (max_dev / std > 4).any():
+                    raise ValueError("Outlier values detected in numeric columns.")
+        print("Outlier check passed.")
+
+    def check_species(self, species_count_range: tuple = SPECIES_COUNT_RANGE):
+        """Target distribution and correlation checks over known-species rows."""
+        counts = pd.Series(self.species_counts, dtype=int)
+        if not counts.between(*species_count_range).all():
+            raise ValueError("Species distribution outside expected range.")
+        print("Target Distribution check passed")
+
+        grouped_means = pd.DataFrame(
+            {name: self.species_sums[name] / self.species_counts[name] for name in counts.index},
+            index=NUMERIC_COLS,
+        ).T
+        if (grouped_means.nunique() == 1).any():
+            raise ValueError("No variation in feature means across species.")
+        print("Correlation check (features vs target) passed.")
+
+        n_known = int(counts.sum())
+        if n_known > 1:
+            known_sums = sum(self.species_sums.values())
+            cov = (self.cross - np.outer(known_sums, known_sums) / n_known) / (n_known - 1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sd = np.sqrt(np.diag(cov))
+                corr = cov / np.outer(sd, sd)
+        else:
+            corr = np.full(self.cross.shape, np.nan)
+        corr_matrix = pd.DataFrame(np.abs(corr), index=NUMERIC_COLS, columns=NUMERIC_COLS)
+        _report_feature_correlations(corr_matrix, NUMERIC_COLS)
+
+
+class IrisValidationState:
+    """
+    Running state for incremental validation of appended Iris batches.
+
+    Combines `IrisStatistics` for everything accepted so far with the set of
+    row hashes used to detect duplicates against earlier batches. Validating
+    a batch only touches the batch rows, so cost is proportional to the
+    batch rather than the accumulated history.
+    """
+
+    def __init__(self):
+        self.stats = IrisStatistics()
+        self.row_hashes = set()
+
+    def save(self, path: str):
+        """Persist the state to an `.npz` file."""
+        names = sorted(self.stats.species_counts)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                n=self.stats.n,
+                sums=self.stats.sums,
+                sumsq=self.stats.sumsq,
+                mins=self.stats.mins,
+                maxs=self.stats.maxs,
+                cross=self.stats.cross,
+                species=np.asarray(names, dtype=str),
+                species_counts=np.asarray([self.stats.species_counts[k] for k in names], dtype=np.int64),
+                species_sums=np.asarray(
+                    [self.stats.species_sums[k] for k in names], dtype=float
+                ).reshape(len(names), len(NUMERIC_COLS)),
+                row_hashes=np.fromiter(self.row_hashes, dtype=np.uint64, count=len(self.row_hashes)),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "IrisValidationState":
+        """Load a state written by `save`."""
+        state = cls()
+        with np.load(path, allow_pickle=False) as data:
+            stats = state.stats
+            stats.n = int(data["n"])
+            stats.sums = data["sums"]
+            stats.sumsq = data["sumsq"]
+            stats.mins = data["mins"]
+            stats.maxs = data["maxs"]
+            stats.cross = data["cross"]
+            for name, count, sums in zip(data["species"], data["species_counts"], data["species_sums"]):
+                stats.species_counts[str(name)] = int(count)
+                stats.species_sums[str(name)] = sums
+            state.row_hashes = set(data["row_hashes"].tolist())
+        return state
+
+
+def _hash_rows(df: pd.DataFrame) -> np.ndarray:
+    # Hash numeric columns as float so 5 and 5.0 collide, as they would in
+    # a single DataFrame read from one file
+    normalized = df.apply(
+        lambda col: col.astype(float) if pd.api.types.is_numeric_dtype(col) else col
     )
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
 
-    high_corr_pairs = []
-    threshold = 0.97
 
-    for col_i in numeric_cols:
-        for col_j in numeric_cols:
-            if col_i == col_j:
-                continue
-            corr_val = upper.loc[col_i, col_j]
-            if pd.notna(corr_val) and corr_val > threshold:
-                high_corr_pairs.append((col_i, col_j, corr_val))
+def validate_iris_increment(
+    batch: pd.DataFrame,
+    state: IrisValidationState,
+    finalize: bool = True,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Validate a newly appended batch against the accumulated state.
+
+    Produces the same pass/fail verdicts as running `validate_iris_dataframe`
+    on all batches seen so far plus this one. Duplicates (within the batch
+    or of earlier rows) and unknown species are removed, the schema is
+    checked on the batch, and the dataset-wide checks run on the merged
+    statistics. The state is only updated when the batch is accepted.
+
+    Parameters
+    ----------
+    batch : pandas.DataFrame
+        New raw rows.
+    state : IrisValidationState
+        Accumulated state; updated in place on success.
+    finalize : bool, optional
+        Run the dataset-wide checks after merging, by default True. Set to
+        False when streaming chunks of one dataset and call
+        `state.stats.check()` after the last chunk.
+    verbose : bool, optional
+        Print per-check progress messages, by default True. Warnings about
+        removed unknown species are always printed.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The accepted, validated rows of this batch.
+    """
+    log = print if verbose else (lambda *args: None)
+    log("\n=== RUNNING INCREMENTAL IRIS DATA VALIDATION CHECKS ===")
 
-    if high_corr_pairs:
-        msg_lines = [
-            f"[WARNING] High correlations between features detected (|corr| > {threshold}):"
-        ]
-        for col_i, col_j, corr_val in sorted(high_corr_pairs, key=lambda x: -x[2]):
-            msg_lines.append(f"  - {col_i} & {col_j}: corr = {corr_val:.3f}")
+    if not isinstance(batch, pd.DataFrame):
+        raise TypeError("Data is not a pandas DataFrame.")
+    log("Data loaded as pandas DataFrame.")
 
-        msg_lines.append(
-            "This is a warning only — continuing the analysis (no error raised)."
-        )
+    hashes = _hash_rows(batch) if len(batch) else np.empty(0, dtype=np.uint64)
+    seen = set()
+    keep = np.empty(len(hashes), dtype=bool)
+    for i, h in enumerate(hashes.tolist()):
+        keep[i] = h not in state.row_hashes and h not in seen
+        seen.add(h)
+    batch = batch[keep]
+    log("Duplicate check passed (duplicates removed if present).")
 
-        print("\n".join(msg_lines))
+    try:
+        with profile_step("schema_validation", rows=len(batch)):
+            df_validated = iris_schema.validate(batch)
+        log("Schema validation passed.")
+    except pa.errors.SchemaError as e:
+        raise ValueError(f"Pandera schema validation failed:\n{e}")
 
-    else:
-        print("Correlation check (feature vs feature) passed.")
+    unknown_species = set(df_validated["species"].unique()) - EXPECTED_SPECIES
+    df_known = df_validated
+    if unknown_species:
+        print(f"Warning: Unknown species values found and removed: {unknown_species}")
+        df_known = df_validated[df_validated["species"].isin(EXPECTED_SPECIES)]
+    log("Species category level check passed (unknown categories removed if present).")
 
+    merged = state.stats.merge(IrisStatistics.from_frames(df_validated, df_known))
+    if finalize:
+        merged.check()
 
-    print("=== IRIS DATA VALIDATION — ALL CHECKS PASSED ===\n")
+    state.stats = merged
+    state.row_hashes.update(hashes[keep].tolist())
 
+    log("=== INCREMENTAL IRIS DATA VALIDATION — BATCH ACCEPTED ===\n")
+    return df_known
 
-    return df_validated
 
+def _feature_matrix(df: pd.DataFrame):
+    """
+    Float64 feature matrix and species codes for `validate_iris_fast`, or
+    None when the data needs the reference path (schema violations or
+    column types pandera would have to coerce, so its error is reported).
+    """
+    if len(set(df.columns)) != len(df.columns) or set(df.columns) != set(iris_schema.columns):
+        return None
+    for col in NUMERIC_COLS:
+        dtype = df[col].dtype
+        if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            return None
+
+    X = np.empty((len(df), len(NUMERIC_COLS)))
+    for j, col in enumerate(NUMERIC_COLS):
+        X[:, j] = df[col].to_numpy(dtype=float)
+    codes, names = pd.factorize(df["species"])
+
+    # Non-null and > 0 (NaN fails the comparison); null species get code -1
+    if not (X > 0).all() or (codes < 0).any():
+        return None
+    return X, codes, np.asarray(names, dtype=object)
+
+
+def _first_occurrences(X: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Boolean mask keeping the first occurrence of each (features, species) row."""
+    keep = np.ones(len(X), dtype=bool)
+    if len(X) < 2:
+        return keep
+    # Values are positive (no NaN or -0.0), so equal floats have equal bits
+    keys = np.column_stack([X.view(np.int64), codes.astype(np.int64)])
+
+    # Hash the rows and only sort those whose hash repeats; the sort compares
+    # the actual keys, so hash collisions cannot drop distinct rows
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(keys), index=False)
+    candidates = np.flatnonzero(hashes.duplicated(keep=False).to_numpy())
+    if len(candidates) == 0:
+        return keep
+
+    sub = keys[candidates]
+    order = np.lexsort(sub.T[::-1])
+    sorted_keys = sub[order]
+    repeat = (sorted_keys[1:] == sorted_keys[:-1]).all(axis=1)
+    # lexsort is stable, so within a run of equal rows the first one is the
+    # earliest in the original order
+    keep[candidates[order[1:][repeat]]] = False
+    return keep
+
+
+def validate_iris_fast(
+    df: pd.DataFrame,
+    keep_dtypes: bool = False,
+    species_count_range: tuple = SPECIES_COUNT_RANGE,
+) -> pd.DataFrame:
+    """
+    Validate the Iris dataset in a single vectorized pass.
+
+    Gives the same result, errors and messages as `validate_iris_dataframe`.
+    The features are read once into a float64 matrix and the species into
+    integer codes; duplicates are found with one sort of the rows, and the
+    outlier, target distribution and correlation checks run on
+    `IrisStatistics` computed from the matrix (bincounts per species and a
+    single cross-product) instead of separate pandas passes. Data that
+    would fail or need coercion in the pandera schema is handed to
+    `validate_iris_dataframe`, so its error messages are unchanged.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw Iris data.
+    keep_dtypes : bool, optional
+        Return the rows with the input's column dtypes (e.g. the compact
+        float32/categorical policy of `utils_io.read_iris`) instead of
+        casting them to float64 and object, by default False. When no row
+        is dropped, `df` itself is then returned without copying.
+    species_count_range : tuple of int, optional
+        Allowed rows per known species, by default (40, 60).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Deduplicated rows with known species, float64 features and object
+        species, as returned by `validate_iris_dataframe`.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("Data is not a pandas DataFrame.")
+
+    with profile_step("build_matrix", rows=len(df)):
+        arrays = _feature_matrix(df)
+    if arrays is None:
+        return validate_iris_dataframe(df, species_count_range)
+    X, codes, names = arrays
+
+    print("\n=== RUNNING IRIS DATA VALIDATION CHECKS ===")
+    print("Data loaded as pandas DataFrame.")
+
+    with profile_step("duplicate_check", rows=len(df)):
+        keep = _first_occurrences(X, codes)
+        if not keep.all():
+            X, codes = X[keep], codes[keep]
+    print("Duplicate check passed (duplicates removed if present).")
+    print("Schema validation passed.")
+
+    with profile_step("statistics", rows=len(X)):
+        known_codes = [i for i, name in enumerate(names) if name in EXPECTED_SPECIES]
+        known = np.isin(codes, known_codes)
+        stats = IrisStatistics.from_arrays(X, codes, names, known)
+
+    stats.check_outliers()
+
+    unknown_species = set(names) - EXPECTED_SPECIES
+    if unknown_species:
+        print(f"Warning: Unknown species values found and removed: {unknown_species}")
+    print("Species category level check passed (unknown categories removed if present).")
+
+    stats.check_species(species_count_range)
+
+    print("=== IRIS DATA VALIDATION — ALL CHECKS PASSED ===\n")
 
+    mask = keep.copy()
+    mask[keep] = known
+    if keep_dtypes:
+        if mask.all():
+            return df
+        df_validated = df[mask]
+        species = df_validated["species"]
+        if isinstance(species.dtype, pd.CategoricalDtype):
+            # Drop the removed unknown species from the categories, reusing the other columns
+            columns = {col: df_validated[col] for col in df_validated.columns}
+            columns["species"] = species.cat.remove_unused_categories()
+            df_validated = pd.DataFrame(columns, copy=False)
+        return df_validated
+    df_validated = df[mask]
+    casts = {col: "float64" for col in NUMERIC_COLS if df[col].dtype != np.float64}
+    if df["species"].dtype != object:
+        casts["species"] = object
+    return df_validated.astype(casts) if casts else df_validated
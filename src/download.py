@@ -2,27 +2,90 @@
 # Author: Sidharth Malik
 # Date: 2025-12-10
 #
-# This script downloads the Iris dataset from scikit-learn and saves it as a CSV file.
+# This script fetches the raw Iris dataset and saves it as a CSV file.
+# A local mirror is tried first, then the remote URL (a conditional GET against
+# the download cache), then the cached copy, and finally the bundled
+# data/iris.data, so the pipeline also runs without network access. Raw bytes
+# are copied and checked against a SHA-256; the output is only rewritten when
+# its contents change.
 #
 # Usage:
 # python src/download.py --output data/raw/iris.csv
+# python src/download.py --output data/raw/iris.csv --offline
+# python src/download.py --output data/raw/iris.csv --mirror /mnt/datasets/iris
 
 import click
-import pandas as pd
+
+from utils_fetch import IRIS_SHA256, IRIS_URL
+from utils_profile import profile_step, profiled
 
 @click.command()
+@profiled("download")
 @click.option(
     "--output",
     default="data/raw/iris.csv",
     help="Path to save raw dataset."
 )
-def main(output):
-    print("Downloading Iris dataset...")
-    url = "https://raw.githubusercontent.com/mwaskom/seaborn-data/master/iris.csv"
-    iris = pd.read_csv(url)
+@click.option(
+    "--url",
+    default=IRIS_URL,
+    envvar="IRIS_DATA_URL",
+    show_default=True,
+    help="Remote CSV (or set IRIS_DATA_URL)."
+)
+@click.option(
+    "--mirror",
+    default=None,
+    envvar="IRIS_DATA_MIRROR",
+    help="Local mirror file, or directory containing iris.csv, tried before the remote (or set IRIS_DATA_MIRROR)."
+)
+@click.option(
+    "--cache-dir",
+    default=".cache/downloads",
+    envvar="IRIS_DOWNLOAD_CACHE",
+    show_default=True,
+    help="Download cache holding the last remote copy and its ETag/Last-Modified (or set IRIS_DOWNLOAD_CACHE)."
+)
+@click.option(
+    "--sha256",
+    default=IRIS_SHA256,
+    show_default=True,
+    help="Expected SHA-256 of the CSV; pass an empty string to skip the check."
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    envvar="IRIS_OFFLINE",
+    help="Never contact the remote (or set IRIS_OFFLINE=1)."
+)
+@click.option(
+    "--timeout",
+    default=10.0,
+    show_default=True,
+    help="Remote timeout in seconds."
+)
+def main(output, url, mirror, cache_dir, sha256, offline, timeout):
+    from utils_fetch import fetch_iris
+
+    print("Fetching Iris dataset...")
+    try:
+        with profile_step("download") as step:
+            result = fetch_iris(
+                output,
+                url=None if offline else url or None,
+                mirror=mirror,
+                cache_dir=cache_dir or None,
+                sha256=sha256 or None,
+                timeout=timeout,
+            )
+            step["source"] = result["source"]
+    except ValueError as e:
+        raise click.ClickException(str(e))
 
-    iris.to_csv(output, index=False)
-    print(f"Raw dataset saved to: {output}")
+    for reason in result["skipped"]:
+        print(f"Skipped {reason}")
+    status = "saved to" if result["changed"] else "unchanged at"
+    print(f"Raw dataset ({result['source']}) {status}: {output}")
 
 if __name__ == "__main__":
     main()
@@ -10,36 +10,26 @@
 # python src/eda.py --input data/processed/iris_clean.csv --output-dir results/figures
 
 import os
+from importlib.metadata import version
 
-import altair as alt
 import click
-import pandas as pd
 
-from utils_eda import compute_correlation_long
+from utils_cache import StageCache, stage_key
+from utils_profile import profile_record, profile_step, profiled, record_frame
 
+FIGURE_LABELS = {
+    "scatter_petal.png": "Scatter plot",
+    "boxplots.png": "Boxplots",
+    "correlation_heatmap.png": "Correlation heatmap",
+}
+FIGURE_NAMES = list(FIGURE_LABELS)
 
-@click.command()
-@click.option(
-    "--input",
-    default="data/processed/iris_clean.csv",
-    help="Path to cleaned dataset."
-)
-@click.option(
-    "--output-dir",
-    default="results/figures",
-    help="Directory to save EDA figures."
-)
-def main(input, output_dir):
-    """Generate scatter, boxplot and correlation heatmap figures."""
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
 
-    # Load cleaned data
-    df = pd.read_csv(input)
+def scatter_chart(df):
+    """Scatter plot: Petal length vs Petal width by species."""
+    import altair as alt
 
-    # Scatter plot: Petal length vs Petal width by species
-    print("Creating scatter plot...")
-    scatter = (
+    return (
         alt.Chart(df)
         .mark_circle(size=120)
         .encode(
@@ -53,14 +43,13 @@ def main(input, output_dir):
         )
         .interactive()
     )
-    scatter_path = os.path.join(output_dir, "scatter_petal.png")
-    scatter.save(scatter_path)
-    print(f"Scatter plot saved to: {scatter_path}")
-
-    # Boxplots
-    print("Creating boxplots...")
-    df_melt = df.melt(id_vars="species", var_name="feature", value_name="value")
-    boxplot = (
+
+
+def boxplot_chart(df_melt):
+    """Boxplots of each feature by species, faceted by feature."""
+    import altair as alt
+
+    return (
         alt.Chart(df_melt)
         .mark_boxplot(size=40)
         .encode(
@@ -71,13 +60,57 @@ def main(input, output_dir):
         .properties(width=400, height=150)
         .facet(row=alt.Row("feature:N", title="Feature"))
     )
-    boxplot_path = os.path.join(output_dir, "boxplots.png")
-    boxplot.save(boxplot_path)
-    print(f"Boxplots saved to: {boxplot_path}")
 
-    # Correlation heatmap (now uses utility function)
-    print("Creating correlation heatmap...")
-    corr = compute_correlation_long(df, drop_col="species")
+
+def density_chart(density):
+    """Binned petal scatter: one circle per occupied cell, sized by count."""
+    import altair as alt
+
+    return (
+        alt.Chart(density)
+        .mark_circle(opacity=0.7)
+        .encode(
+            x=alt.X("petal_length:Q", title="Petal Length (cm)"),
+            y=alt.Y("petal_width:Q", title="Petal Width (cm)"),
+            size=alt.Size("count:Q", title="Count"),
+            color=alt.Color("species:N", title="Species"),
+            tooltip=["species", "petal_length", "petal_width", "count"],
+        )
+        .properties(
+            width=500, height=400, title="Petal Length vs Petal Width by Species"
+        )
+        .interactive()
+    )
+
+
+def boxplot_summary_chart(summary):
+    """Boxplots drawn from precomputed quartiles, whiskers and outliers."""
+    import altair as alt
+
+    y = alt.Y("species:N", title="Species")
+    color = alt.Color("species:N", legend=None)
+    boxes = alt.Chart().transform_filter(alt.datum.kind == "box")
+    whiskers = boxes.mark_rule().encode(
+        y=y, x=alt.X("lower:Q", title="Measurement (cm)"), x2="upper:Q", color=color
+    )
+    bars = boxes.mark_bar(size=40).encode(y=y, x="q1:Q", x2="q3:Q", color=color)
+    medians = boxes.mark_tick(size=40, color="white").encode(y=y, x="median:Q")
+    outliers = (
+        alt.Chart()
+        .transform_filter(alt.datum.kind == "outlier")
+        .mark_point()
+        .encode(y=y, x="value:Q", color=color)
+    )
+    return (
+        alt.layer(whiskers, bars, medians, outliers, data=summary)
+        .properties(width=400, height=150)
+        .facet(row=alt.Row("feature:N", title="Feature"))
+    )
+
+
+def heatmap_chart(corr):
+    """Correlation heatmap with the coefficients printed in each cell."""
+    import altair as alt
 
     heatmap = (
         alt.Chart(corr)
@@ -108,10 +141,115 @@ def main(input, output_dir):
             ),
         )
     )
+    return heatmap + text
+
+
+
+@click.command()
+@profiled("eda")
+@click.option(
+    "--input",
+    default="data/processed/iris_clean.csv",
+    help="Path to cleaned dataset (.csv, .parquet or .arrow)."
+)
+@click.option(
+    "--output-dir",
+    default="results/figures",
+    help="Directory to save EDA figures."
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar="IRIS_CACHE_DIR",
+    help="Directory for the content-addressed stage cache (disabled if unset)."
+)
+@click.option(
+    "--cache-max-mb",
+    default=1024.0,
+    show_default=True,
+    help="Size budget for the stage cache in megabytes."
+)
+@click.option(
+    "--n-jobs",
+    default=-1,
+    show_default=True,
+    help="Worker processes rendering figures (-1: one per figure, 1: serial)."
+)
+@click.option(
+    "--max-chart-rows",
+    default=5000,
+    show_default=True,
+    help="Above this many rows, draw charts from pre-aggregated summaries."
+)
+def main(input, output_dir, cache_dir, cache_max_mb, n_jobs, max_chart_rows):
+    """Generate scatter, boxplot and correlation heatmap figures."""
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    figure_paths = {name: os.path.join(output_dir, name) for name in FIGURE_NAMES}
+    cache = StageCache(cache_dir, cache_max_mb) if cache_dir else None
+    if cache:
+        key = stage_key(
+            "eda",
+            inputs=[input],
+            code=["eda.py", "utils_eda.py", "utils_io.py"],
+            params={"altair": version("altair"), "max_chart_rows": max_chart_rows},
+        )
+        if cache.restore(key, figure_paths):
+            print(f"Cache hit: EDA figures restored to: {output_dir}")
+            return
+
+    # Deferred so --help and cache hits do not import pandas and altair
+    from utils_eda import aggregate_eda, chart_spec, compute_correlation_long, render_figures
+    from utils_io import read_iris, widen_float32
+
+    # Load cleaned data
+    with profile_step("read") as step:
+        df = read_iris(input, compact=True)
+        record_frame(step, df)
+
+    print("Creating scatter plot, boxplots and correlation heatmap...")
+    if len(df) > max_chart_rows:
+        # Chart size and render time would grow with the rows; draw from
+        # summaries of fixed size instead
+        print(f"{len(df)} rows: drawing charts from aggregated summaries.")
+        with profile_step("aggregate", rows=len(df)):
+            summaries = aggregate_eda(df, target_col="species")
+        charts = {
+            "scatter_petal.png": density_chart(summaries["density"]),
+            "boxplots.png": boxplot_summary_chart(summaries["boxplot"]),
+            "correlation_heatmap.png": heatmap_chart(summaries["correlation"]),
+        }
+    else:
+        # Charts embed the rows as JSON; widen the float32 columns so values
+        # keep their decimal form (5.1, not 5.099999904632568) and the
+        # boxplot quartiles and whiskers match the data as recorded
+        df = widen_float32(df)
+        df_melt = df.melt(id_vars="species", var_name="feature", value_name="value")
+        with profile_step("correlation", rows=len(df)):
+            corr = compute_correlation_long(df, drop_col="species")
+        charts = {
+            "scatter_petal.png": scatter_chart(df),
+            "boxplots.png": boxplot_chart(df_melt),
+            "correlation_heatmap.png": heatmap_chart(corr),
+        }
+
+    with profile_step("build_specs"):
+        specs = {name: chart_spec(chart) for name, chart in charts.items()}
+
+    # Render concurrently; figures whose spec is unchanged are skipped
+    with profile_step("render_figures"):
+        timings = render_figures(specs, output_dir, n_jobs=n_jobs)
+
+    for name, seconds in timings.items():
+        if seconds is None:
+            print(f"{FIGURE_LABELS[name]} unchanged, kept: {figure_paths[name]}")
+        else:
+            profile_record(f"save_{name[:-4]}", wall_seconds=seconds)
+            print(f"{FIGURE_LABELS[name]} saved to: {figure_paths[name]}")
 
-    heatmap_path = os.path.join(output_dir, "correlation_heatmap.png")
-    (heatmap + text).save(heatmap_path)
-    print(f"Correlation heatmap saved to: {heatmap_path}")
+    if cache:
+        cache.store(key, figure_paths)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+# iris.py
+#
+# Single entry point for the pipeline scripts. Each subcommand is the `main`
+# command of the matching script in src/, imported only when that subcommand
+# runs, so `iris.py --help` and small invocations do not pay for pandas,
+# scikit-learn, altair or pandera. `imports` reports what each command's
+# startup costs.
+#
+# Usage:
+# python src/iris.py --help
+# python src/iris.py model --input data/processed/iris_clean.csv --output-dir results/metrics
+# python src/iris.py imports model eda --top 5
+
+
+import importlib
+import os
+
+import click
+
+# Subcommand -> (script module in src/, one-line help shown by `--help`)
+COMMANDS = {
+    "download": ("download", "Download the raw Iris dataset."),
+    "generate": ("generate", "Generate a large synthetic Iris dataset as shards."),
+    "process": ("process", "Validate and clean the raw dataset."),
+    "eda": ("eda", "Generate the EDA figures."),
+    "model": ("model", "Train and evaluate the models and save artifacts."),
+    "predict": ("predict", "Score measurements in chunks with a trained model."),
+    "serve": ("serve", "Serve a trained model over HTTP."),
+    "benchmark": ("benchmark", "Benchmark pipeline stages on synthetic data."),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a subcommand's script only when it is invoked."""
+
+    def list_commands(self, ctx):
+        return sorted(COMMANDS) + super().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        if name in COMMANDS:
+            return importlib.import_module(COMMANDS[name][0]).main
+        return super().get_command(ctx, name)
+
+    def format_commands(self, ctx, formatter):
+        # Listing the commands must not import them, so use the static help
+        rows = [(name, help) for name, (_, help) in sorted(COMMANDS.items())]
+        rows += [
+            (name, self.commands[name].get_short_help_str())
+            for name in super().list_commands(ctx)
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup)
+def cli():
+    """Iris classification pipeline."""
+
+
+@cli.command()
+@click.argument("commands", nargs=-1)
+@click.option(
+    "--top",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Slowest top-level imports listed per command."
+)
+def imports(commands, top):
+    """Report the startup and import time of each command's --help."""
+    from utils_benchmark import startup_report
+
+    unknown = sorted(set(commands) - set(COMMANDS))
+    if unknown:
+        raise click.BadParameter(f"unknown commands {unknown}", param_hint="COMMANDS")
+
+    script = os.path.abspath(__file__)
+    for name in commands or sorted(COMMANDS):
+        report = startup_report([script, name, "--help"], top=top)
+        heaviest = ", ".join(f"{module} {seconds:.2f}s" for module, seconds in report["top_imports"])
+        print(
+            f"{name:<10} {report['wall_seconds']:6.2f}s wall "
+            f"{report['import_seconds']:6.2f}s imports {report['modules']:5d} modules  {heaviest}"
+        )
+
+
+if __name__ == "__main__":
+    cli()
@@ -5,112 +5,506 @@
 # This script trains classification models on the Iris dataset.
 # It runs a baseline DummyClassifier and a tuned LogisticRegression model with scaling,
 # cross-validation, and hyperparameter optimization.
-# Outputs metrics, confusion matrix, and the trained model artifact to the specified directory.
+# Outputs metrics, confusion matrix, and the trained model artifact to the specified directory,
+# plus the exported weights used by the sklearn-free fast-path scorer.
 #
 # Usage:
 # python src/model.py --input data/processed/iris_clean.csv --output-dir results/metrics
+# python src/model.py --zoo all --output-dir results/metrics
+# python src/model.py --train-shards data/synthetic --output-dir results/sharded --compare-baseline
 
 
 import os
 import pickle
+import time
+from importlib.metadata import version
 
 import click
-import matplotlib.pyplot as plt
-import pandas as pd
-from scipy.stats import loguniform
-from sklearn.compose import make_column_transformer
-from sklearn.dummy import DummyClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import ConfusionMatrixDisplay
-from sklearn.model_selection import RandomizedSearchCV, cross_validate
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
-from utils_model import prepare_features_and_target, create_train_test_split
+from utils_cache import StageCache, stage_key
+from utils_model import SEARCH_STRATEGIES, prepare_features_and_target
+from utils_profile import profile_record, profile_step, profiled, profiling_active, record_frame
+from utils_zoo import ZOO_MODELS
+
+
+def run_search(search, X, y, backend):
+    """Fit `search` under the given joblib backend and return the wall time."""
+    from joblib import parallel_config
+
+    start = time.perf_counter()
+    with parallel_config(backend=backend):
+        search.fit(X, y)
+    return time.perf_counter() - start
+
+
+def record_cv_folds(name, cv_output, X, y, cv=5):
+    """Add one profiling record per fold of a `cross_validate` result."""
+    from sklearn.model_selection import check_cv
+
+    splits = check_cv(cv, y, classifier=True).split(X, y)
+    for k, (train_idx, test_idx) in enumerate(splits):
+        fit_seconds = float(cv_output["fit_time"][k])
+        score_seconds = float(cv_output["score_time"][k])
+        profile_record(
+            f"{name}_fold{k}",
+            rows=len(train_idx),
+            test_rows=len(test_idx),
+            fit_seconds=fit_seconds,
+            score_seconds=score_seconds,
+            wall_seconds=fit_seconds + score_seconds,
+        )
+
+
+def split_folds(X, y, fold_cache):
+    """Holdout split and CV folds of `X`, `y`, reused from `fold_cache` if set."""
+    from utils_folds import load_folds
+
+    with profile_step("folds", rows=len(X)):
+        folds = load_folds(X, y, fold_cache, test_size=0.2, random_state=522, cv=5)
+    return (
+        X.iloc[folds.train_idx],
+        X.iloc[folds.test_idx],
+        y.iloc[folds.train_idx],
+        y.iloc[folds.test_idx],
+        folds,
+    )
+
+
+def run_model_zoo(input, output_dir, models, n_jobs, fold_cache):
+    """Cross-validate the model zoo on the training split and save the comparison."""
+    from utils_io import read_iris
+    from utils_zoo import run_zoo
+
+    df = read_iris(input)
+    X, y = prepare_features_and_target(df, target_col="species")
+    X_train, _, y_train, _, folds = split_folds(X, y, fold_cache)
+
+    print(f"Cross-validating {len(models)} models on shared scaled folds...")
+    with profile_step("model_zoo", rows=len(X_train)):
+        table = run_zoo(
+            X_train, y_train, models=models, n_jobs=n_jobs, random_state=522, folds=folds
+        )
+
+    zoo_path = os.path.join(output_dir, "model_zoo.csv")
+    table.to_csv(zoo_path, index=False)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    print(f"Model comparison saved to: {zoo_path}")
+
+
+def run_sharded_training(shards, output_dir, n_jobs, compare):
+    """
+    Train the Pipeline across data shards in worker processes and save it.
+
+    The last shard is held out and the model is trained on the others, so
+    it is scored on rows it never saw; shards from `generate.py` are
+    independent draws, unlike the holdout split of the Iris data the
+    generator was fitted to. With a single shard there is no clean
+    holdout and no test accuracy is reported. With `compare`, the same
+    Pipeline is also fitted on the training shards in one process to
+    report the speedup and how closely the averaged model agrees.
+    """
+    import pandas as pd
+    from utils_fastpath import export_linear_weights, save_artifact
+    from utils_io import read_iris, shard_paths
+    from utils_model import build_pipeline
+    from utils_sharded import train_sharded
+
+    paths = shard_paths(shards)
+    train_paths, test_paths = (paths[:-1], paths[-1:]) if len(paths) > 1 else (paths, [])
+    print(f"Training on {len(train_paths)} shards in parallel...")
+    start = time.perf_counter()
+    with profile_step("sharded_fit") as step:
+        model, info = train_sharded(train_paths, n_jobs=n_jobs)
+        step["rows"] = info["n_rows"]
+    sharded_seconds = time.perf_counter() - start
+    print(
+        f"Sharded training wall-clock: {sharded_seconds:.2f}s "
+        f"(statistics {info['stats_seconds']:.2f}s, fits {info['fit_seconds']:.2f}s)"
+    )
+    if info["workers"] == 1:
+        print(
+            f"[NOTE] Only 1 worker process (n_jobs={n_jobs}, {os.cpu_count()} CPU(s), "
+            f"{info['n_shards']} shard(s)): shards were fitted one after another, "
+            "so expect no speedup over a single-process fit."
+        )
+
+    summary = {
+        "mode": "sharded",
+        "n_shards": info["n_shards"],
+        "n_rows": info["n_rows"],
+        "n_jobs": n_jobs,
+        "workers": info["workers"],
+        "wall_seconds": sharded_seconds,
+    }
+    if test_paths:
+        X_test, y_test = prepare_features_and_target(read_iris(test_paths[0]), target_col="species")
+        summary["test_accuracy"] = model.score(X_test, y_test)
+        print(f"Test accuracy on held-out shard {test_paths[0]}:", summary["test_accuracy"])
+    else:
+        print("[NOTE] Only one shard, so none is held out: no test accuracy is reported.")
+    rows = [summary]
+
+    if compare:
+        start = time.perf_counter()
+        with profile_step("single_fit", rows=info["n_rows"]):
+            train = pd.concat([read_iris(path) for path in train_paths], ignore_index=True)
+            X_all, y_all = prepare_features_and_target(train, target_col="species")
+            single = build_pipeline(X_all.columns.tolist()).fit(X_all, y_all.astype(str))
+        single_seconds = time.perf_counter() - start
+        agreement = float((single.predict(X_all) == model.predict(X_all)).mean())
+        del train, X_all, y_all
+        baseline = {
+            "mode": "single-process",
+            "n_shards": 1,
+            "n_rows": info["n_rows"],
+            "n_jobs": 1,
+            "workers": 1,
+            "wall_seconds": single_seconds,
+        }
+        if test_paths:
+            baseline["test_accuracy"] = single.score(X_test, y_test)
+        rows.append(baseline)
+        summary["speedup"] = single_seconds / sharded_seconds
+        summary["prediction_agreement"] = agreement
+        print(
+            f"Single-process wall-clock: {single_seconds:.2f}s "
+            f"(speedup {summary['speedup']:.2f}x, predictions agree on {agreement:.2%} of rows)"
+        )
+
+    timing_path = os.path.join(output_dir, "sharded_training.csv")
+    pd.DataFrame(rows).to_csv(timing_path, index=False)
+    print(f"Sharded training summary saved to: {timing_path}")
+
+    model_path = os.path.join(output_dir, "logreg_model.pickle")
+    with profile_step("pickle"), open(model_path, "wb") as f:
+        pickle.dump(model, f)
+    print(f"Trained model saved to: {model_path}")
+    export_linear_weights(model, os.path.join(output_dir, "logreg_weights.npz"))
+    safe_path = os.path.join(output_dir, "logreg_model.artifact")
+    metadata = {
+        "sklearn_version": version("scikit-learn"),
+        "training": "sharded",
+        "n_shards": info["n_shards"],
+        "n_train": info["n_rows"],
+    }
+    if test_paths:
+        metadata.update(n_test=len(X_test), test_accuracy=summary["test_accuracy"])
+    save_artifact(model, safe_path, metadata=metadata)
+    print(f"Model artifact saved to: {safe_path}")
+
+
+def search_summary(name, search, seconds, backend, n_jobs):
+    """One row of the tuning-time comparison table."""
+    return {
+        "strategy": name,
+        "backend": backend,
+        "n_jobs": n_jobs,
+        "n_candidates": len(search.cv_results_["params"]),
+        "wall_seconds": seconds,
+        "best_score": search.best_score_,
+        "best_params": search.best_params_,
+    }
 
 
 @click.command()
+@profiled("model")
 @click.option(
     "--input",
     default="data/processed/iris_clean.csv",
-    help="Path to cleaned dataset."
+    help="Path to cleaned dataset (.csv, .parquet or .arrow)."
 )
 @click.option(
     "--output-dir",
     default="results/metrics",
     help="Directory to save model artifacts (figures, metrics, model)."
 )
-def main(input, output_dir):
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar="IRIS_CACHE_DIR",
+    help="Directory for the content-addressed stage cache (disabled if unset)."
+)
+@click.option(
+    "--cache-max-mb",
+    default=1024.0,
+    show_default=True,
+    help="Size budget for the stage cache in megabytes."
+)
+@click.option(
+    "--fold-cache",
+    default=None,
+    envvar="IRIS_FOLD_CACHE",
+    help="Directory persisting the train/test split, CV folds and scaled fold matrices."
+)
+@click.option(
+    "--search",
+    type=click.Choice(SEARCH_STRATEGIES),
+    default="random",
+    show_default=True,
+    help="Hyperparameter search strategy."
+)
+@click.option(
+    "--n-iter",
+    default=50,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of hyperparameter candidates sampled."
+)
+@click.option(
+    "--n-jobs",
+    default=-1,
+    show_default=True,
+    help="Parallel workers for the search (-1 uses all cores)."
+)
+@click.option(
+    "--backend",
+    type=click.Choice(["loky", "multiprocessing", "threading"]),
+    default="loky",
+    show_default=True,
+    help="joblib backend; loky and multiprocessing are process pools."
+)
+@click.option(
+    "--tune-solver",
+    is_flag=True,
+    help="Also tune solver and penalty (lbfgs/newton-cg/saga, l1/l2/elasticnet)."
+)
+@click.option(
+    "--compare-baseline",
+    is_flag=True,
+    help=(
+        "Also time the original 50-candidate random search (or, with --train-shards, "
+        "a single-process fit) for comparison."
+    )
+)
+@click.option(
+    "--n-bootstrap",
+    default=10_000,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Bootstrap resamples of the test predictions for metric confidence intervals."
+)
+@click.option(
+    "--zoo",
+    "zoo_models",
+    default=None,
+    help=(
+        "Model-zoo mode: cross-validate these models (comma-separated, or 'all' for "
+        f"{', '.join(ZOO_MODELS)}) concurrently and save model_zoo.csv instead of training."
+    )
+)
+@click.option(
+    "--train-shards",
+    default=None,
+    help=(
+        "Sharded mode: fit the Pipeline across this directory of data shards in "
+        "--n-jobs processes (merged scaler statistics, averaged weights) instead of tuning; "
+        "the last shard is held out for testing."
+    )
+)
+def main(input, output_dir, cache_dir, cache_max_mb, fold_cache, search, n_iter,
+         n_jobs, backend, tune_solver, compare_baseline, n_bootstrap, zoo_models, train_shards):
     """Train baseline and logistic regression models and save artifacts."""
     os.makedirs(output_dir, exist_ok=True)
 
-    # Load processed data
-    df = pd.read_csv(input)
+    if zoo_models:
+        models = list(ZOO_MODELS) if zoo_models == "all" else zoo_models.split(",")
+        unknown = sorted(set(models) - set(ZOO_MODELS))
+        if unknown:
+            raise click.BadParameter(f"unknown models {unknown}", param_hint="--zoo")
+        run_model_zoo(input, output_dir, models, n_jobs, fold_cache)
+        return
+
+    if train_shards:
+        try:
+            run_sharded_training(train_shards, output_dir, n_jobs, compare_baseline)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        return
+
+    artifact_paths = {
+        name: os.path.join(output_dir, name)
+        for name in [
+            "dummy_cv_results.csv",
+            "cv_results.csv",
+            "confusion_matrix.png",
+            "logreg_model.pickle",
+            "logreg_model.artifact",
+            "logreg_weights.npz",
+            "search_timing.csv",
+            "bootstrap_metrics.csv",
+        ]
+    }
+    cache = StageCache(cache_dir, cache_max_mb) if cache_dir else None
+    if cache:
+        key = stage_key(
+            "model",
+            inputs=[input],
+            code=[
+                "model.py",
+                "utils_model.py",
+                "utils_folds.py",
+                "utils_search.py",
+                "utils_fastpath.py",
+                "utils_bootstrap.py",
+                "utils_io.py",
+            ],
+            params={
+                "sklearn": version("scikit-learn"),
+                "search": search,
+                "n_iter": n_iter,
+                "tune_solver": tune_solver,
+                "compare_baseline": compare_baseline,
+                "n_bootstrap": n_bootstrap,
+            },
+        )
+        if cache.restore(key, artifact_paths):
+            print(f"Cache hit: model artifacts restored to: {output_dir}")
+            return
+
+    # Deferred until training is certain: these imports take seconds, which
+    # --help and cache hits should not pay
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from sklearn.dummy import DummyClassifier
+    from sklearn.metrics import ConfusionMatrixDisplay
+    from sklearn.model_selection import cross_validate
+    from utils_bootstrap import bootstrap_metrics
+    from utils_fastpath import export_linear_weights, save_artifact
+    from utils_io import read_iris
+    from utils_model import build_pipeline
+    from utils_search import build_search
+
+    # Load processed data. Unlike process.py and eda.py this keeps float64
+    # features: fits on float32 values (5.1 stored as 5.0999999...) give
+    # different coefficients and probabilities
+    with profile_step("read") as step:
+        df = read_iris(input)
+        record_frame(step, df)
 
     # Use utility function to split features & target
     X, y = prepare_features_and_target(df, target_col="species")
 
-    # Use utility function to create train/test splits
-    X_train, X_test, y_train, y_test = create_train_test_split(
-        X, y, test_size=0.2, random_state=522
-    )
+    # Train/test split and CV folds, shared by every model below (and by
+    # later runs, through the fold cache)
+    X_train, X_test, y_train, y_test, folds = split_folds(X, y, fold_cache)
 
     # Dummy classifier baseline
     dummy = DummyClassifier(strategy="most_frequent")
-    cv_dummy = cross_validate(dummy, X_train, y_train, cv=5, return_train_score=True)
+    with profile_step("dummy_cv", rows=len(X_train)):
+        cv_dummy = cross_validate(
+            dummy, X_train, y_train, cv=folds.splits, return_train_score=True
+        )
+    record_cv_folds("dummy_cv", cv_dummy, X_train, y_train, cv=folds.splits)
     pd.DataFrame(cv_dummy).to_csv(
-        os.path.join(output_dir, "dummy_cv_results.csv"), index=False
+        artifact_paths["dummy_cv_results.csv"], index=False
     )
 
     # Pipeline with standard scaling and logistic regression
-    features = X_train.columns.tolist()
-    preprocessor = make_column_transformer(
-        (StandardScaler(), features)
-    )
-    pipeline = Pipeline(
-        [
-            ("preprocessor", preprocessor),
-            ("classifier", LogisticRegression()),
-        ]
-    )
+    pipeline = build_pipeline(X_train.columns.tolist())
 
     # Hyperparameter tuning
-    param_grid = {"classifier__C": loguniform(1e-6, 1e6)}
-    rand_search = RandomizedSearchCV(
+    rand_search = build_search(
         pipeline,
-        param_grid,
-        n_iter=50,
-        cv=5,
-        n_jobs=-1,
+        strategy=search,
+        n_iter=n_iter,
+        cv=folds.splits,
+        n_jobs=n_jobs,
         random_state=522,
+        tune_solver=tune_solver,
     )
-    rand_search.fit(X_train, y_train)
+    with profile_step(f"search_{search}", rows=len(X_train)) as step:
+        seconds = run_search(rand_search, X_train, y_train, backend)
+        step["n_candidates"] = len(rand_search.cv_results_["params"])
+    timings = [search_summary(search, rand_search, seconds, backend, n_jobs)]
+    print(f"Tuning wall-clock ({search}, {backend}, n_jobs={n_jobs}): {seconds:.2f}s")
+    if search == "path":
+        print(f"Solver iterations along the warm-started path: {rand_search.n_solver_iterations_}")
+
+    if compare_baseline:
+        baseline = build_search(
+            pipeline, strategy="random", n_iter=50, cv=folds.splits, n_jobs=-1
+        )
+        baseline_seconds = run_search(baseline, X_train, y_train, "loky")
+        timings.append(search_summary("baseline-random", baseline, baseline_seconds, "loky", -1))
+        print(
+            f"Baseline random search wall-clock: {baseline_seconds:.2f}s "
+            f"(speedup {baseline_seconds / seconds:.2f}x)"
+        )
+    pd.DataFrame(timings).to_csv(artifact_paths["search_timing.csv"], index=False)
 
     # Save CV results
     results = (
         pd.DataFrame(rand_search.cv_results_)
         .sort_values(by="mean_test_score", ascending=False)
     )
-    results.to_csv(os.path.join(output_dir, "cv_results.csv"), index=False)
+    results.to_csv(artifact_paths["cv_results.csv"], index=False)
 
     # Best model
     best_model = rand_search.best_estimator_
-    print("Train accuracy:", best_model.score(X_train, y_train))
-    print("Test accuracy:", best_model.score(X_test, y_test))
+    if profiling_active():
+        # The search runs its folds in worker processes; re-run the best
+        # candidate's folds here so per-fold times appear in the profile
+        with profile_step("best_candidate_cv", rows=len(X_train)):
+            cv_best = cross_validate(best_model, X_train, y_train, cv=folds.splits)
+        record_cv_folds("best_candidate_cv", cv_best, X_train, y_train, cv=folds.splits)
+    train_accuracy = best_model.score(X_train, y_train)
+    y_pred = best_model.predict(X_test)
+    test_accuracy = float((y_pred == y_test.to_numpy()).mean())
+    print("Train accuracy:", train_accuracy)
+    print("Test accuracy:", test_accuracy)
+
+    # Bootstrap confidence intervals of the test metrics
+    with profile_step("bootstrap", rows=len(X_test)) as step:
+        step["n_resamples"] = n_bootstrap
+        intervals = bootstrap_metrics(y_test, y_pred, n_resamples=n_bootstrap, random_state=522)
+    intervals.to_csv(artifact_paths["bootstrap_metrics.csv"], index=False)
+    accuracy_ci = intervals.loc[intervals["metric"] == "accuracy", ["lower", "upper"]].iloc[0]
+    print(
+        f"Test accuracy 95% CI ({n_bootstrap} bootstrap resamples): "
+        f"[{accuracy_ci['lower']:.3f}, {accuracy_ci['upper']:.3f}]"
+    )
+    print(f"Bootstrap metrics saved to: {artifact_paths['bootstrap_metrics.csv']}")
 
     # Save confusion matrix figure
-    disp = ConfusionMatrixDisplay.from_estimator(best_model, X_test, y_test)
-    plt.title("Confusion Matrix — Iris Logistic Regression")
-    cm_path = os.path.join(output_dir, "confusion_matrix.png")
-    plt.savefig(cm_path)
+    with profile_step("save_confusion_matrix", rows=len(X_test)):
+        disp = ConfusionMatrixDisplay.from_predictions(y_test, y_pred)
+        plt.title("Confusion Matrix — Iris Logistic Regression")
+        cm_path = artifact_paths["confusion_matrix.png"]
+        plt.savefig(cm_path)
     plt.close()
     print(f"Confusion matrix saved to: {cm_path}")
 
     # Save trained model as pickle
-    model_path = os.path.join(output_dir, "logreg_model.pickle")
-    with open(model_path, "wb") as f:
+    model_path = artifact_paths["logreg_model.pickle"]
+    with profile_step("pickle"), open(model_path, "wb") as f:
         pickle.dump(best_model, f)
     print(f"Trained model saved to: {model_path}")
 
+    # Export scaler + logistic regression weights for the NumPy fast path
+    weights_path = artifact_paths["logreg_weights.npz"]
+    with profile_step("export_weights"):
+        export_linear_weights(best_model, weights_path)
+    print(f"Model weights exported to: {weights_path}")
+
+    # Pickle-free artifact: versioned header plus memory-mappable weights
+    safe_path = artifact_paths["logreg_model.artifact"]
+    with profile_step("save_artifact"):
+        save_artifact(best_model, safe_path, metadata={
+            "sklearn_version": version("scikit-learn"),
+            "search": search,
+            "best_params": rand_search.best_params_,
+            "best_cv_score": rand_search.best_score_,
+            "train_accuracy": train_accuracy,
+            "test_accuracy": test_accuracy,
+            "test_accuracy_ci": [float(accuracy_ci["lower"]), float(accuracy_ci["upper"])],
+            "n_bootstrap": n_bootstrap,
+            "n_train": len(X_train),
+            "n_test": len(X_test),
+        })
+    print(f"Model artifact saved to: {safe_path}")
+
+    if cache:
+        cache.store(key, artifact_paths)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,58 @@
+# predict.py
+#
+# This script scores new Iris measurements with the trained model artifact.
+# The pickled Pipeline is loaded once and the input (CSV or Parquet) is scored
+# in fixed-size chunks, streaming predictions to disk so that large files run
+# in bounded memory. Reports scoring throughput in rows/sec.
+#
+# Usage:
+# python src/predict.py --model results/metrics/logreg_model.pickle \
+#     --input data/processed/iris_clean.csv --output results/predictions.csv
+
+
+import click
+
+
+@click.command()
+@click.option(
+    "--model",
+    "model_path",
+    default="results/metrics/logreg_model.pickle",
+    help="Path to the pickled model or exported .npz weights."
+)
+@click.option(
+    "--input",
+    default="data/processed/iris_clean.csv",
+    help="CSV or Parquet file of measurements to score."
+)
+@click.option(
+    "--output",
+    default="results/predictions.csv",
+    help="Path to save predictions (.csv or .parquet)."
+)
+@click.option(
+    "--chunksize",
+    default=100_000,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of rows scored per vectorized batch."
+)
+def main(model_path, input, output, chunksize):
+    """Score measurements in chunks with the trained model and save predictions."""
+    from utils_predict import load_model, stream_predictions
+
+    print(f"Loading model from: {model_path}")
+    model = load_model(model_path)
+
+    print(f"Scoring {input} in chunks of {chunksize} rows...")
+    stats = stream_predictions(model, input, output, chunksize=chunksize)
+
+    print(f"Predictions saved to: {output}")
+    print(
+        f"Scored {stats['rows']} rows in {stats['chunks']} chunks "
+        f"({stats['seconds']:.3f}s, {stats['rows_per_sec']:,.0f} rows/sec)"
+    )
+
+
+if __name__ == "__main__":
+    main()
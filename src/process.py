@@ -5,42 +5,181 @@
 # This script validates and preprocesses the raw Iris dataset.
 # Checks for missing values, duplicates, outliers, and ensures feature-target consistency.
 # Saves the cleaned dataset to the specified output path.
+# With --state, the input is treated as a newly appended batch: it is validated
+# incrementally against the saved running statistics and appended to the output.
+# With --chunksize, the input is streamed: each chunk is validated and written as
+# it is read, and dataset-wide checks run on accumulated statistics at the end.
 #
 # Usage:
 # python src/process.py --input data/raw/iris.csv --output data/processed/iris_clean.csv
+# python src/process.py --input new_batch.csv --output data/processed/iris_clean.csv \
+#     --state data/processed/validation_state.npz
+# python src/process.py --input big_raw.csv --output data/processed/iris_clean.csv \
+#     --chunksize 1000000
 
 
+import os
+
 import click
-import pandas as pd
 
-from data_validation_iris import validate_iris_dataframe
-from utils_data import strip_column_whitespace
+from utils_cache import StageCache, stage_key
+from utils_profile import profile_step, profiled, record_frame
 
 
 @click.command()
+@profiled("process")
 @click.option(
     "--input",
     default="data/raw/iris.csv",
-    help="Path to raw dataset."
+    help="Path to raw dataset (.csv, .parquet or .arrow)."
 )
 @click.option(
     "--output",
     default="data/processed/iris_clean.csv",
-    help="Path to save cleaned and validated dataset."
+    help="Path to save cleaned and validated dataset (.csv, .parquet or .arrow)."
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar="IRIS_CACHE_DIR",
+    help="Directory for the content-addressed stage cache (disabled if unset)."
+)
+@click.option(
+    "--cache-max-mb",
+    default=1024.0,
+    show_default=True,
+    help="Size budget for the stage cache in megabytes."
+)
+@click.option(
+    "--state",
+    default=None,
+    help="Running validation state (.npz); validate the input as an appended batch."
 )
-def main(input, output):
+@click.option(
+    "--chunksize",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Stream the input in chunks of this many rows (out-of-core mode)."
+)
+def main(input, output, cache_dir, cache_max_mb, state, chunksize):
     """Load raw Iris data, validate it, clean column names, and save."""
-    print("Loading raw data...")
-    df = pd.read_csv(input)
+    if state:
+        append_batch(input, output, state)
+        return
+
+    # pandas is needed from here on; pandera only once the data is validated
+    from utils_io import data_format
+
+    cache = StageCache(cache_dir, cache_max_mb) if cache_dir else None
+    if cache:
+        key = stage_key(
+            "process",
+            inputs=[input],
+            code=["process.py", "data_validation_iris.py", "utils_data.py", "utils_io.py"],
+            params={"format": data_format(output)},
+        )
+        if cache.restore(key, {"iris_clean": output}):
+            print(f"Cache hit: cleaned dataset restored to: {output}")
+            return
+
+    if chunksize:
+        process_in_chunks(input, output, chunksize)
+    else:
+        from data_validation_iris import validate_iris_fast
+        from utils_data import strip_column_whitespace
+        from utils_io import read_iris, write_iris
+
+        print("Loading raw data...")
+        with profile_step("read") as step:
+            df = read_iris(input, compact=True)
+            record_frame(step, df)
+
+        print("Running validation and cleaning...")
+        with profile_step("validate", rows=len(df)):
+            df_clean = validate_iris_fast(df, keep_dtypes=True)
+
+        # Use utility function to clean column names
+        df_clean = strip_column_whitespace(df_clean)
+
+        with profile_step("write", rows=len(df_clean)):
+            write_iris(df_clean, output)
+        print(f"Cleaned dataset saved to: {output}")
+
+    if cache:
+        cache.store(key, {"iris_clean": output})
+
+
+def append_batch(input, output, state_path):
+    """Validate `input` incrementally and append the accepted rows to `output`."""
+    from data_validation_iris import IrisValidationState, validate_iris_increment
+    from utils_data import strip_column_whitespace
+    from utils_io import data_format, read_iris
+
+    if data_format(output) != "csv":
+        raise click.UsageError("--state appends to the output, which must be a CSV file.")
+
+    state = (
+        IrisValidationState.load(state_path)
+        if os.path.exists(state_path)
+        else IrisValidationState()
+    )
+
+    print("Loading new batch...")
+    with profile_step("read") as step:
+        # Not compacted: the saved row hashes are of the float64 values
+        batch = read_iris(input)
+        step["rows"] = len(batch)
+
+    print("Running incremental validation and cleaning...")
+    with profile_step("validate_increment", rows=len(batch)):
+        batch_clean = strip_column_whitespace(validate_iris_increment(batch, state))
+
+    is_new = not os.path.exists(output)
+    batch_clean.to_csv(output, mode="w" if is_new else "a", header=is_new, index=False)
+    state.save(state_path)
+    print(f"Appended {len(batch_clean)} rows to: {output}")
+    print(f"Validation state saved to: {state_path}")
+
+
+def process_in_chunks(input, output, chunksize):
+    """
+    Validate and clean `input` chunk by chunk, streaming rows to `output`.
+
+    Row-level checks (duplicates, schema, unknown species) run per chunk;
+    the dataset-wide checks (outliers, species distribution, correlations)
+    run once on the accumulated statistics after the last chunk. Rows are
+    written to a temporary file that only replaces `output` if every check
+    passes.
+    """
+    from data_validation_iris import IrisValidationState, validate_iris_increment
+    from utils_data import strip_column_whitespace
+    from utils_io import ChunkWriter, data_format, iter_chunks
+
+    state = IrisValidationState()
+    tmp_output = output + ".partial"
 
-    print("Running validation and cleaning...")
-    df_clean = validate_iris_dataframe(df)
+    print(f"Streaming raw data in chunks of {chunksize} rows...")
+    try:
+        with profile_step("validate_chunks") as step, \
+                ChunkWriter(tmp_output, fmt=data_format(output)) as writer:
+            # Chunks stay float64, like the batches of --state, whose row
+            # hashes and pandera coercion depend on the float64 values
+            for chunk in iter_chunks(input, chunksize):
+                writer.write(strip_column_whitespace(
+                    validate_iris_increment(chunk, state, finalize=False, verbose=False)
+                ))
+            step["rows"] = writer.rows
 
-    # Use utility function to clean column names
-    df_clean = strip_column_whitespace(df_clean)
+        print("Running dataset-wide checks on accumulated statistics...")
+        with profile_step("dataset_checks", rows=state.stats.n):
+            state.stats.check()
+    except Exception:
+        if os.path.exists(tmp_output):
+            os.remove(tmp_output)
+        raise
 
-    df_clean.to_csv(output, index=False)
-    print(f"Cleaned dataset saved to: {output}")
+    os.replace(tmp_output, output)
+    print(f"Cleaned dataset ({writer.rows} rows) saved to: {output}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+# serve.py
+#
+# This script serves the trained Iris model over a local asyncio HTTP endpoint.
+# Concurrent single-row requests are merged into micro-batches so that one
+# predict_proba call over a NumPy matrix answers many callers.
+#
+# Endpoints:
+#   POST /predict  {"sepal_length": 5.1, "sepal_width": 3.5,
+#                   "petal_length": 1.4, "petal_width": 0.2}
+#   GET  /metrics  request count, p50/p99 latency and batch sizes
+#
+# Usage:
+# python src/serve.py --model results/metrics/logreg_model.pickle --port 8000
+
+
+import asyncio
+
+import click
+
+
+async def run_server(model, host, port, max_batch_size, max_wait_ms):
+    from utils_serve import MicroBatcher, make_handler, make_predict_fn
+
+    batcher = MicroBatcher(
+        make_predict_fn(model),
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms,
+    )
+    await batcher.start()
+
+    handler = make_handler(
+        batcher,
+        features=list(model.feature_names_in_),
+        classes=[str(cls) for cls in model.classes_],
+    )
+    server = await asyncio.start_server(handler, host, port)
+    print(f"Serving on http://{host}:{port} (POST /predict, GET /metrics)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+@click.command()
+@click.option(
+    "--model",
+    "model_path",
+    default="results/metrics/logreg_model.pickle",
+    help="Path to the pickled model or exported .npz weights."
+)
+@click.option("--host", default="127.0.0.1", help="Interface to bind.")
+@click.option("--port", default=8000, type=int, help="Port to listen on.")
+@click.option(
+    "--max-batch-size",
+    default=64,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum rows merged into one predict_proba call."
+)
+@click.option(
+    "--max-wait-ms",
+    default=2.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Longest a request waits for others to join its batch."
+)
+def main(model_path, host, port, max_batch_size, max_wait_ms):
+    """Serve the trained model over HTTP with micro-batched scoring."""
+    from utils_predict import load_model
+
+    print(f"Loading model from: {model_path}")
+    model = load_model(model_path)
+    try:
+        asyncio.run(run_server(model, host, port, max_batch_size, max_wait_ms))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+from typing import List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pipeline outputs the report reads, relative to the repository root
+ARTIFACT_PATHS = {
+    "processed_data": "data/processed/iris_clean.csv",
+    "dummy_cv_results": "results/metrics/dummy_cv_results.csv",
+    "cv_results": "results/metrics/cv_results.csv",
+    "bootstrap_metrics": "results/metrics/bootstrap_metrics.csv",
+    "model_artifact": "results/metrics/logreg_model.artifact",
+    "model_pickle": "results/metrics/logreg_model.pickle",
+    "confusion_matrix": "results/metrics/confusion_matrix.png",
+}
+
+
+class PipelineArtifacts:
+    """
+    Read-only access to the outputs of `process.py` and `model.py`.
+
+    Lets reports and notebooks use what the pipeline already produced
+    instead of downloading the data and refitting models. No network
+    access is needed, and summary numbers come from the model artifact's
+    header, so scikit-learn is only imported when the pickled Pipeline
+    itself is requested.
+
+    Parameters
+    ----------
+    root : str, optional
+        Directory the paths are relative to, by default the repository
+        root (independent of the working directory, e.g. reports/).
+    **paths
+        Overrides for entries of `ARTIFACT_PATHS`.
+    """
+
+    def __init__(self, root: str = REPO_ROOT, **paths):
+        unknown = set(paths) - set(ARTIFACT_PATHS)
+        if unknown:
+            raise KeyError(f"Unknown artifacts {sorted(unknown)}; expected some of {list(ARTIFACT_PATHS)}.")
+        self.root = root
+        self.paths = {**ARTIFACT_PATHS, **paths}
+
+    def path(self, name: str) -> str:
+        """Absolute path of artifact `name`; raises FileNotFoundError if it is missing."""
+        path = os.path.join(self.root, self.paths[name])
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Pipeline artifact '{name}' not found at {path}; "
+                "build it first with `make all` (or src/iris.py)."
+            )
+        return path
+
+    def missing(self) -> List[str]:
+        """Names of the artifacts that do not exist yet."""
+        return [
+            name for name, rel in self.paths.items()
+            if not os.path.exists(os.path.join(self.root, rel))
+        ]
+
+    def processed_data(self):
+        """The validated, cleaned dataset written by `process.py`."""
+        from utils_io import read_iris
+
+        return read_iris(self.path("processed_data"))
+
+    def dummy_cv_results(self):
+        """Per-fold cross-validation scores of the DummyClassifier baseline."""
+        import pandas as pd
+
+        return pd.read_csv(self.path("dummy_cv_results"))
+
+    def cv_results(self, top: Optional[int] = None):
+        """Hyperparameter search results, best mean test score first."""
+        import pandas as pd
+
+        results = pd.read_csv(self.path("cv_results")).sort_values(
+            "mean_test_score", ascending=False, kind="stable"
+        )
+        return results if top is None else results.head(top)
+
+    def bootstrap_metrics(self, metric: Optional[str] = None):
+        """Bootstrap confidence intervals of the test metrics, optionally of one metric only."""
+        import pandas as pd
+
+        intervals = pd.read_csv(self.path("bootstrap_metrics"))
+        return intervals if metric is None else intervals[intervals["metric"] == metric]
+
+    def model_metadata(self) -> dict:
+        """
+        Training summary stored in the model artifact header: scikit-learn
+        version, search strategy, best parameters, best CV score, train and
+        test accuracy and split sizes.
+        """
+        from utils_fastpath import read_artifact_metadata
+
+        return read_artifact_metadata(self.path("model_artifact"))["metadata"]
+
+    def model(self, pipeline: bool = False):
+        """
+        The trained model.
+
+        Parameters
+        ----------
+        pipeline : bool, optional
+            Return the pickled scikit-learn Pipeline instead of the
+            NumPy `LinearScorer` loaded from the artifact, by default False.
+        """
+        from utils_predict import load_model
+
+        return load_model(self.path("model_pickle" if pipeline else "model_artifact"))
@@ -0,0 +1,344 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+STAGES = (
+    "validate",
+    "validate_fast",
+    "strip_whitespace",
+    "correlation",
+    "model_fit",
+    "model_predict",
+)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in megabytes."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_stage(stage: str, n_rows: int, raw_path: str, random_state: int = 522) -> dict:
+    """
+    Generate `n_rows` synthetic rows and time one pipeline stage on them.
+
+    Measurements are clipped to 3.5 standard deviations (see
+    `utils_synthetic.clip_to_z`), and the validation stages scale the
+    allowed rows per species to `n_rows`, so the data passes every check
+    and the whole validation is timed. A stage that raises fails the case
+    instead of being recorded.
+
+    Parameters
+    ----------
+    stage : str
+        One of `STAGES`.
+    n_rows : int
+        Number of synthetic rows.
+    raw_path : str
+        Iris CSV whose class-conditional statistics seed the generator.
+    random_state : int, optional
+        Seed for the synthetic data, by default 522.
+
+    Returns
+    -------
+    dict
+        Stage, rows, wall time, rows/sec and peak RSS.
+    """
+    import pandas as pd
+
+    from utils_synthetic import clip_to_z, fit_class_gaussians, sample_iris
+
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage '{stage}'; expected one of {STAGES}.")
+
+    raw = pd.read_csv(raw_path)
+    params = fit_class_gaussians(raw)
+    df = sample_iris(params, n_rows, random_state)
+    clip_to_z(df, params, max_z=3.5)
+
+    if stage in ("validate", "validate_fast"):
+        from data_validation_iris import (
+            SPECIES_COUNT_RANGE,
+            validate_iris_dataframe,
+            validate_iris_fast,
+        )
+
+        validate = validate_iris_fast if stage == "validate_fast" else validate_iris_dataframe
+        # The default bounds are counts for the 150-row data; keep their proportions
+        scale = n_rows / len(raw)
+        species_count_range = tuple(bound * scale for bound in SPECIES_COUNT_RANGE)
+
+        def fn():
+            # The validation prints progress; keep benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                validate(df, species_count_range=species_count_range)
+    elif stage == "strip_whitespace":
+        from utils_data import strip_column_whitespace
+
+        def fn():
+            strip_column_whitespace(df)
+    elif stage == "correlation":
+        from utils_eda import compute_correlation_long
+
+        def fn():
+            compute_correlation_long(df, drop_col="species")
+    else:
+        from utils_model import build_pipeline, prepare_features_and_target
+
+        X, y = prepare_features_and_target(df, target_col="species")
+        pipeline = build_pipeline(X.columns.tolist())
+        if stage == "model_fit":
+            def fn():
+                pipeline.fit(X, y)
+        else:
+            pipeline.fit(X, y)
+
+            def fn():
+                pipeline.predict_proba(X)
+
+    start = time.perf_counter()
+    fn()
+    wall = time.perf_counter() - start
+
+    return {
+        "stage": stage,
+        "n_rows": n_rows,
+        "wall_seconds": wall,
+        "rows_per_sec": n_rows / wall if wall > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_isolated(stage: str, n_rows: int, raw_path: str, random_state: int = 522) -> dict:
+    """
+    Run `run_stage` in a fresh process so peak RSS is measured per case.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_stage, stage, n_rows, raw_path, random_state).result()
+
+
+# Runs in a fresh interpreter: time the loader's imports, the load itself
+# and the first prediction, as a worker cold start would pay them
+_COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+path = {path!r}
+if path.endswith(".artifact"):
+    from utils_fastpath import load_artifact as load
+elif path.endswith(".npz"):
+    from utils_fastpath import LinearScorer
+    load = LinearScorer.load
+else:
+    import pickle
+    def load(p):
+        with open(p, "rb") as f:
+            return pickle.load(f)
+imported = time.perf_counter()
+model = load(path)
+loaded = time.perf_counter()
+row = [[5.1, 3.5, 1.4, 0.2]]
+if type(model).__name__ == "LinearScorer":
+    model.predict_proba(row)
+else:
+    import pandas as pd
+    model.predict_proba(pd.DataFrame(row, columns=list(model.feature_names_in_)))
+done = time.perf_counter()
+print(json.dumps({{
+    "import_seconds": imported - start,
+    "load_seconds": loaded - imported,
+    "first_predict_seconds": done - loaded,
+    "cold_start_seconds": done - start,
+    "modules_loaded": len(sys.modules),
+}}))
+"""
+
+
+def artifact_cold_start(path: str, repeats: int = 5) -> dict:
+    """
+    Measure the cold start of scoring with a model artifact.
+
+    Each repeat runs a fresh Python process that imports the loader for the
+    artifact's format, loads it and scores one row. Medians over the repeats
+    are reported together with the file size.
+
+    Parameters
+    ----------
+    path : str
+        A pickled Pipeline, exported `.npz` weights or a `.artifact` file.
+    repeats : int, optional
+        Fresh processes to run, by default 5.
+
+    Returns
+    -------
+    dict
+        Artifact path and size, and median import/load/first-predict/total
+        seconds and number of modules imported.
+    """
+    import statistics
+
+    src = os.path.dirname(os.path.abspath(__file__))
+    script = _COLD_START_SCRIPT.format(src=src, path=os.path.abspath(path))
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    result = {"artifact": path, "size_bytes": os.path.getsize(path)}
+    for key in runs[0]:
+        result[key] = statistics.median(run[key] for run in runs)
+    return result
+
+
+def startup_report(argv: list, top: int = 10) -> dict:
+    """
+    Measure the startup of a command and the imports it pays for.
+
+    Runs `argv` with `python -X importtime` in a fresh process and parses
+    the per-module import times it writes to stderr.
+
+    Parameters
+    ----------
+    argv : list of str
+        Script and arguments, e.g. `["src/model.py", "--help"]`.
+    top : int, optional
+        Number of slowest top-level imports to list, by default 10; None
+        lists all of them.
+
+    Returns
+    -------
+    dict
+        Command, wall seconds, total import seconds, number of modules
+        imported, and the slowest top-level imports as `(module, seconds)`
+        pairs, each including the imports it triggered.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv], capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    modules = 0
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules += 1
+        # Nested imports are indented; top-level ones carry their children's time
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative) / 1e6))
+    imports.sort(key=lambda item: -item[1])
+    return {
+        "command": " ".join(argv),
+        "returncode": proc.returncode,
+        "wall_seconds": wall,
+        "import_seconds": sum(seconds for _, seconds in imports),
+        "modules": modules,
+        "top_imports": imports if top is None else imports[:top],
+    }
+
+
+def git_commit() -> str:
+    """Short hash of the current git commit, or 'unknown' outside a repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(path: str) -> list:
+    """Load the benchmark history (a list of run records); empty if missing."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(path: str, results: list) -> dict:
+    """
+    Append one benchmark run to the JSON history file.
+
+    Returns
+    -------
+    dict
+        The stored run record.
+    """
+    history = load_history(path)
+    record = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    history.append(record)
+
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+    return record
+
+
+def previous_run(history: list, commit: str):
+    """
+    The run to compare against: the latest one from a different commit,
+    or the latest run at all if every run is from `commit`.
+    """
+    earlier = history[:-1]
+    for record in reversed(earlier):
+        if record["commit"] != commit:
+            return record
+    return earlier[-1] if earlier else None
+
+
+def find_regressions(current: list, previous: list, threshold: float = 0.2) -> list:
+    """
+    Compare two sets of benchmark results and flag slowdowns.
+
+    Parameters
+    ----------
+    current, previous : list of dict
+        Results as returned by `run_stage`.
+    threshold : float, optional
+        Relative wall-time increase that counts as a regression,
+        by default 0.2 (20%).
+
+    Returns
+    -------
+    list of dict
+        One entry per (stage, n_rows) that got slower by more than
+        `threshold`, with both wall times and the ratio.
+    """
+    baseline = {(r["stage"], r["n_rows"]): r["wall_seconds"] for r in previous}
+    regressions = []
+    for result in current:
+        before = baseline.get((result["stage"], result["n_rows"]))
+        if not before:
+            continue
+        ratio = result["wall_seconds"] / before
+        if ratio > 1 + threshold:
+            regressions.append({
+                "stage": result["stage"],
+                "n_rows": result["n_rows"],
+                "previous_seconds": before,
+                "current_seconds": result["wall_seconds"],
+                "ratio": ratio,
+            })
+    return regressions
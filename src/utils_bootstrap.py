@@ -0,0 +1,156 @@
+from typing import Optional
+
+import numpy as np
+
+# Upper bound on the resample index matrix built at once (rows x resamples),
+# so memory stays bounded for large test sets
+MAX_BATCH_ELEMENTS = 20_000_000
+
+
+def _pair_codes(y_true, y_pred, classes=None):
+    """Class labels and one code per row, true class * n_classes + predicted class."""
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    if len(y_true) != len(y_pred):
+        raise ValueError(f"y_true has {len(y_true)} rows but y_pred has {len(y_pred)}.")
+    if len(y_true) == 0:
+        raise ValueError("Cannot bootstrap an empty test set.")
+    if classes is None:
+        classes = np.unique(np.concatenate([y_true, y_pred]))
+    classes = np.asarray(classes)
+    codes = np.searchsorted(classes, y_true) * len(classes) + np.searchsorted(classes, y_pred)
+    return classes, codes.astype(np.int64)
+
+
+def bootstrap_confusion(
+    y_true,
+    y_pred,
+    n_resamples: int = 10_000,
+    random_state: Optional[int] = 522,
+    classes=None,
+):
+    """
+    Confusion matrices of bootstrap resamples of the test predictions.
+
+    Each resample draws len(y_true) rows with replacement. The resamples
+    are built as one index matrix per batch and counted with a single
+    `np.bincount` over (resample, true class, predicted class) codes, so
+    no per-resample Python loop or scikit-learn metric call is made.
+
+    Parameters
+    ----------
+    y_true, y_pred : array-like
+        True and predicted labels of the test set.
+    n_resamples : int, optional
+        Number of bootstrap resamples, by default 10,000.
+    random_state : int, optional
+        Seed of the resampling, by default 522.
+    classes : array-like, optional
+        Class labels in matrix order; the sorted labels seen by default.
+
+    Returns
+    -------
+    classes : numpy.ndarray
+        Class labels.
+    counts : numpy.ndarray
+        Integer array of shape (n_resamples, n_classes, n_classes);
+        `counts[b, i, j]` is the number of rows of class `classes[i]`
+        predicted as `classes[j]` in resample `b`.
+    """
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be a positive integer.")
+    classes, pair_codes = _pair_codes(y_true, y_pred, classes)
+    k = len(classes)
+    n = len(pair_codes)
+    rng = np.random.default_rng(random_state)
+    batch = max(1, MAX_BATCH_ELEMENTS // n)
+    counts = np.empty((n_resamples, k, k), dtype=np.int64)
+    for start in range(0, n_resamples, batch):
+        b = min(batch, n_resamples - start)
+        idx = rng.integers(0, n, size=(b, n))
+        # Offset each resample's codes into its own block of k*k bins
+        codes = pair_codes[idx] + (np.arange(b) * k * k)[:, None]
+        counts[start:start + b] = np.bincount(codes.ravel(), minlength=b * k * k).reshape(b, k, k)
+    return classes, counts
+
+
+def _metrics_from_counts(counts: np.ndarray) -> dict:
+    """Accuracy and per-class precision/recall of stacked confusion matrices (nan where undefined)."""
+    diag = np.diagonal(counts, axis1=-2, axis2=-1).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "accuracy": diag.sum(axis=-1) / counts.sum(axis=(-2, -1)),
+            "precision": diag / counts.sum(axis=-2),
+            "recall": diag / counts.sum(axis=-1),
+        }
+
+
+def bootstrap_metrics(
+    y_true,
+    y_pred,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    random_state: Optional[int] = 522,
+):
+    """
+    Percentile bootstrap confidence intervals for test-set metrics.
+
+    Covers accuracy, per-class precision and recall, and every confusion
+    matrix cell, all computed from the resampled confusion matrices of
+    `bootstrap_confusion`.
+
+    Parameters
+    ----------
+    y_true, y_pred : array-like
+        True and predicted labels of the test set.
+    n_resamples : int, optional
+        Number of bootstrap resamples, by default 10,000.
+    confidence : float, optional
+        Interval coverage, by default 0.95.
+    random_state : int, optional
+        Seed of the resampling, by default 522.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per metric with columns metric, class, predicted (for
+        confusion cells), estimate (on the full test set), std, lower and
+        upper. Precision of a class is nan in resamples where it is never
+        predicted; those resamples are left out of its interval.
+    """
+    import pandas as pd
+
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+
+    classes, counts = bootstrap_confusion(y_true, y_pred, n_resamples, random_state)
+    k = len(classes)
+    _, pair_codes = _pair_codes(y_true, y_pred, classes)
+    observed = np.bincount(pair_codes, minlength=k * k).reshape(1, k, k)
+
+    tail = (1 - confidence) / 2 * 100
+    rows = []
+
+    def add(metric, values, estimate, cls=None, predicted=None):
+        values = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+        lower, upper = np.percentile(values, [tail, 100 - tail]) if len(values) else (np.nan, np.nan)
+        rows.append({
+            "metric": metric,
+            "class": cls,
+            "predicted": predicted,
+            "estimate": float(estimate),
+            "std": float(values.std(ddof=1)) if len(values) > 1 else np.nan,
+            "lower": float(lower),
+            "upper": float(upper),
+        })
+
+    resampled = _metrics_from_counts(counts)
+    point = _metrics_from_counts(observed)
+    add("accuracy", resampled["accuracy"], point["accuracy"][0])
+    for i, cls in enumerate(classes):
+        add("precision", resampled["precision"][:, i], point["precision"][0, i], cls)
+        add("recall", resampled["recall"][:, i], point["recall"][0, i], cls)
+    for i, true_cls in enumerate(classes):
+        for j, pred_cls in enumerate(classes):
+            add("confusion_count", counts[:, i, j], observed[0, i, j], true_cls, pred_cls)
+    return pd.DataFrame(rows)
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterable, Optional
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Return the SHA-256 hex digest of a file, read in fixed-size blocks.
+
+    Parameters
+    ----------
+    path : str
+        File to hash.
+    block_size : int, optional
+        Bytes read per step, by default 1 MiB.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_directory(path: str) -> str:
+    """SHA-256 over the relative names and contents of every file under `path`."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            digest.update(os.path.relpath(full, path).encode())
+            digest.update(hash_file(full).encode())
+    return digest.hexdigest()
+
+
+def stage_key(
+    stage: str,
+    inputs: Iterable[str] = (),
+    code: Iterable[str] = (),
+    params: Optional[dict] = None,
+) -> str:
+    """
+    Compute a content-addressed cache key for one pipeline stage.
+
+    The key depends only on file contents and parameters, not on paths or
+    modification times, so touching a script or re-downloading identical
+    data does not invalidate the cache.
+
+    Parameters
+    ----------
+    stage : str
+        Stage name, e.g. "process".
+    inputs : iterable of str
+        Data files (or directories of shards) read by the stage.
+    code : iterable of str
+        Source files whose logic determines the stage output. Bare file names
+        are resolved relative to src/.
+    params : dict, optional
+        JSON-serialisable parameters that affect the output.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest identifying the stage run.
+    """
+    manifest = {
+        "stage": stage,
+        "inputs": [
+            hash_directory(path) if os.path.isdir(path) else hash_file(path)
+            for path in inputs
+        ],
+        "code": [hash_file(os.path.join(SRC_DIR, path)) for path in code],
+        "params": params or {},
+    }
+    payload = json.dumps(manifest, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class StageCache:
+    """
+    On-disk cache of stage artifacts keyed by `stage_key`, with LRU eviction.
+
+    Each entry is a directory `<cache_dir>/<key>/` holding copies of the
+    stage outputs and a `meta.json` file whose modification time records
+    when the entry was last used. When the total cache size exceeds
+    `max_bytes`, least recently used entries are removed first.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding cache entries.
+    max_mb : float, optional
+        Size budget for the whole cache in megabytes, by default 1024.
+    """
+
+    def __init__(self, cache_dir: str, max_mb: float = 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key: str, outputs: Dict[str, str]) -> bool:
+        """
+        Copy a cached entry's artifacts to their output paths.
+
+        Parameters
+        ----------
+        key : str
+            Key from `stage_key`.
+        outputs : dict
+            Mapping of artifact name to destination path.
+
+        Returns
+        -------
+        bool
+            True on a cache hit (all artifacts restored), False otherwise.
+        """
+        entry = self._entry(key)
+        meta_path = os.path.join(entry, "meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        if not all(os.path.exists(os.path.join(entry, name)) for name in outputs):
+            return False
+
+        for name, dest in outputs.items():
+            dest_dir = os.path.dirname(dest)
+            if dest_dir:
+                os.makedirs(dest_dir, exist_ok=True)
+            shutil.copyfile(os.path.join(entry, name), dest)
+
+        # Mark as most recently used
+        os.utime(meta_path)
+        return True
+
+    def store(self, key: str, outputs: Dict[str, str]) -> None:
+        """
+        Copy freshly built artifacts into the cache, then enforce the size budget.
+
+        Parameters
+        ----------
+        key : str
+            Key from `stage_key`.
+        outputs : dict
+            Mapping of artifact name to the path it was written to.
+        """
+        size = sum(os.path.getsize(path) for path in outputs.values())
+        if size > self.max_bytes:
+            print(f"Stage artifacts ({size} bytes) exceed the cache budget; not cached.")
+            return
+
+        # Write into a temporary directory and rename, so a crash never
+        # leaves a half-written entry behind
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        for name, path in outputs.items():
+            shutil.copyfile(path, os.path.join(tmp_dir, name))
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"size": size, "created": time.time(), "artifacts": sorted(outputs)}, f)
+
+        entry = self._entry(key)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_dir, entry)
+        self.evict(keep=key)
+
+    def entries(self) -> list:
+        """Return (key, size_bytes, last_used) for every entry, oldest first."""
+        found = []
+        for key in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self._entry(key), "meta.json")
+            if key.startswith(".") or not os.path.exists(meta_path):
+                continue
+            with open(meta_path) as f:
+                size = json.load(f)["size"]
+            found.append((key, size, os.path.getmtime(meta_path)))
+        return sorted(found, key=lambda item: item[2])
+
+    def evict(self, keep: Optional[str] = None) -> list:
+        """
+        Remove least recently used entries until the cache fits `max_bytes`.
+
+        Parameters
+        ----------
+        keep : str, optional
+            Key that must not be evicted (the entry just stored).
+
+        Returns
+        -------
+        list
+            Keys that were removed.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+            removed.append(key)
+        return removed
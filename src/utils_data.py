@@ -3,16 +3,31 @@ import pandas as pd
 
 def strip_column_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Return a copy of `df` where leading and trailing whitespace
-    has been removed from all column names.
+    Return `df` with leading and trailing whitespace removed from all
+    column names.
 
     This is useful to ensure column names are clean and consistent
-    before downstream processing and modeling.
+    before downstream processing and modeling. The data is not copied:
+    `df` itself is returned when no name changes, otherwise a new frame
+    sharing its columns.
     """
-    df_copy = df.copy()
-    
     # Only strip if columns are string-like
-    if df_copy.columns.size > 0 and df_copy.columns.inferred_type in ("string", "unicode"):
-        df_copy.columns = df_copy.columns.str.strip()
-    
-    return df_copy
+    if df.columns.size == 0 or df.columns.inferred_type not in ("string", "unicode"):
+        return df
+
+    stripped = df.columns.str.strip()
+    if stripped.equals(df.columns):
+        return df
+    return df.set_axis(stripped, axis=1, copy=False)
+
+
+def select_columns(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    Frame of `columns` of `df` that shares its data instead of copying it.
+
+    `df[columns]` and `df.drop(...)` copy the selected values when they
+    live in one consolidated block; building the frame from the column
+    Series with `copy=False` keeps views of them. Do not modify the result
+    in place, as the changes would show through in `df`.
+    """
+    return pd.DataFrame({col: df[col] for col in columns}, index=df.index, copy=False)
@@ -1,3 +1,12 @@
+import functools
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
 import pandas as pd
 
 
@@ -21,11 +30,410 @@ def compute_correlation_long(df: pd.DataFrame, drop_col: str = "species") -> pd.
     pandas.DataFrame
         DataFrame with columns ['feature1', 'feature2', 'correlation'].
     """
-    if drop_col in df.columns:
-        features_df = df.drop(columns=drop_col)
-    else:
-        features_df = df.copy()
+    from utils_data import select_columns
 
+    # The features are only read, so select them without copying
+    features_df = select_columns(df, [col for col in df.columns if col != drop_col])
     corr = features_df.corr().stack().reset_index()
     corr.columns = ["feature1", "feature2", "correlation"]
     return corr
+
+
+class CorrelationState:
+    """
+    Mergeable running state for feature correlations.
+
+    Keeps the row count, feature means and the co-moment matrix
+    sum((x - mean)(x - mean)^T). Each chunk is reduced to its own state and
+    combined with the pairwise update of Chan et al. (the batched form of
+    Welford's algorithm), which stays numerically stable without holding
+    the rows. States built on different chunks, files or workers can be
+    merged in any order.
+
+    Parameters
+    ----------
+    features : list of str, optional
+        Feature columns; taken from the first chunk if omitted.
+    """
+
+    def __init__(self, features: Optional[List[str]] = None):
+        self.features = list(features) if features is not None else None
+        self.n = 0
+        self.mean = None
+        self.comoment = None
+
+    def update(self, chunk: pd.DataFrame, drop_col: str = "species") -> "CorrelationState":
+        """
+        Add the rows of one chunk, ignoring `drop_col`.
+
+        Rows with a missing value in any feature are skipped, so results
+        match `compute_correlation_long` on data without missing values.
+        """
+        if self.features is None:
+            self.features = [col for col in chunk.columns if col != drop_col]
+        X = chunk[self.features].to_numpy(dtype=float)
+        X = X[~np.isnan(X).any(axis=1)]
+        return self.merge_arrays(X)
+
+    def merge_arrays(self, X: np.ndarray) -> "CorrelationState":
+        """Add the rows of a float feature matrix."""
+        if len(X) == 0:
+            return self
+        other = CorrelationState(self.features)
+        other.n = len(X)
+        other.mean = X.mean(axis=0)
+        centred = X - other.mean
+        other.comoment = centred.T @ centred
+        merged = self.merge(other)
+        self.n, self.mean, self.comoment = merged.n, merged.mean, merged.comoment
+        return self
+
+    def merge(self, other: "CorrelationState") -> "CorrelationState":
+        """Return the state of both inputs combined."""
+        if other.n == 0:
+            return self._copy()
+        if self.n == 0:
+            return other._copy()
+        if self.features != other.features:
+            raise ValueError("Cannot merge correlation states over different features.")
+
+        merged = CorrelationState(self.features)
+        merged.n = self.n + other.n
+        delta = other.mean - self.mean
+        merged.mean = self.mean + delta * (other.n / merged.n)
+        merged.comoment = (
+            self.comoment + other.comoment
+            + np.outer(delta, delta) * (self.n * other.n / merged.n)
+        )
+        return merged
+
+    def _copy(self) -> "CorrelationState":
+        copy = CorrelationState(self.features)
+        copy.n, copy.mean, copy.comoment = self.n, self.mean, self.comoment
+        return copy
+
+    def to_long(self) -> pd.DataFrame:
+        """
+        Long-form correlation table, as returned by `compute_correlation_long`.
+
+        Pairs with an undefined correlation (fewer than two rows or a
+        constant feature) are left out, as pandas does when stacking.
+        """
+        features = self.features or []
+        if self.n < 2:
+            corr = np.full((len(features), len(features)), np.nan)
+        else:
+            sd = np.sqrt(np.diag(self.comoment))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr = np.clip(self.comoment / np.outer(sd, sd), -1.0, 1.0)
+            np.fill_diagonal(corr, np.where(sd > 0, 1.0, np.nan))
+        return pd.DataFrame({
+            "feature1": np.repeat(features, len(features)),
+            "feature2": np.tile(features, len(features)),
+            "correlation": corr.ravel(),
+        }).dropna(subset=["correlation"]).reset_index(drop=True)
+
+
+def correlation_state(
+    source: Union[str, os.PathLike, Iterable[pd.DataFrame]],
+    drop_col: str = "species",
+    chunksize: int = 100_000,
+) -> CorrelationState:
+    """
+    Accumulate a `CorrelationState` over a file or an iterable of chunks.
+
+    Parameters
+    ----------
+    source : str, path or iterable of pandas.DataFrame
+        A CSV, Parquet or Arrow IPC file (read `chunksize` rows at a time
+        with `utils_io.iter_chunks`), or DataFrame chunks.
+    drop_col : str, optional
+        Column to ignore, by default "species".
+    chunksize : int, optional
+        Rows per chunk when reading a file, by default 100000.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        from utils_io import iter_chunks
+
+        source = iter_chunks(os.fspath(source), chunksize)
+
+    state = CorrelationState()
+    for chunk in source:
+        state.update(chunk, drop_col=drop_col)
+    return state
+
+
+def compute_correlation_streaming(
+    source: Union[str, os.PathLike, Iterable[pd.DataFrame]],
+    drop_col: str = "species",
+    chunksize: int = 100_000,
+) -> pd.DataFrame:
+    """
+    Streaming variant of `compute_correlation_long` for chunked or on-disk data.
+
+    Only one chunk is held in memory at a time.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with columns ['feature1', 'feature2', 'correlation'].
+    """
+    return correlation_state(source, drop_col, chunksize).to_long()
+
+
+def compute_correlation_files(
+    paths: List[str], drop_col: str = "species", chunksize: int = 100_000, n_jobs: int = -1
+) -> pd.DataFrame:
+    """
+    Correlation table over several files, one worker process per file.
+
+    Each worker streams its file into a `CorrelationState`; the partial
+    states are merged in the parent.
+    """
+    workers = min(len(paths), os.cpu_count() or 1) if n_jobs == -1 else min(len(paths), n_jobs)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            states = list(pool.map(
+                correlation_state, paths, [drop_col] * len(paths), [chunksize] * len(paths)
+            ))
+    else:
+        states = [correlation_state(path, drop_col, chunksize) for path in paths]
+    return functools.reduce(CorrelationState.merge, states, CorrelationState()).to_long()
+
+
+def boxplot_summary(
+    df: pd.DataFrame, target_col: str = "species", max_outliers: int = 50
+) -> pd.DataFrame:
+    """
+    Per species/feature boxplot statistics, computed in NumPy.
+
+    Quartiles use linear interpolation and whiskers extend to the most
+    extreme values within 1.5 IQR of the box, as in Vega-Lite's boxplot.
+    Values beyond the whiskers are returned as outlier rows; at most
+    `max_outliers` distinct values are kept per group (evenly spaced over
+    the sorted outliers, always including the most extreme), so the table
+    size does not grow with the number of rows.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input data with numeric features and `target_col`.
+    target_col : str, optional
+        Grouping column, by default "species".
+    max_outliers : int, optional
+        Outliers kept per species/feature, by default 50.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns species, feature, kind ("box" or "outlier"), lower, q1,
+        median, q3, upper (box rows) and value (outlier rows).
+    """
+    features = [col for col in df.columns if col != target_col]
+    X = df[features].to_numpy(dtype=float)
+    codes, names = pd.factorize(df[target_col], sort=True)
+
+    boxes, outliers = [], []
+    for k, name in enumerate(names):
+        X_k = X[codes == k]
+        q1, median, q3 = np.quantile(X_k, [0.25, 0.5, 0.75], axis=0)
+        iqr = q3 - q1
+        inside = (X_k >= q1 - 1.5 * iqr) & (X_k <= q3 + 1.5 * iqr)
+        lower = np.where(inside, X_k, np.inf).min(axis=0)
+        upper = np.where(inside, X_k, -np.inf).max(axis=0)
+        for j, feature in enumerate(features):
+            boxes.append({
+                "species": name, "feature": feature, "kind": "box",
+                "lower": lower[j], "q1": q1[j], "median": median[j],
+                "q3": q3[j], "upper": upper[j],
+            })
+            values = np.unique(X_k[~inside[:, j], j])
+            if len(values) > max_outliers:
+                values = values[np.linspace(0, len(values) - 1, max_outliers).round().astype(int)]
+            outliers += [
+                {"species": name, "feature": feature, "kind": "outlier", "value": v}
+                for v in values
+            ]
+
+    columns = ["species", "feature", "kind", "lower", "q1", "median", "q3", "upper", "value"]
+    return pd.DataFrame(boxes + outliers, columns=columns)
+
+
+def density_2d(
+    df: pd.DataFrame, x: str, y: str, target_col: str = "species", bins: int = 40
+) -> pd.DataFrame:
+    """
+    Binned 2D counts of `x` against `y` per species, computed in NumPy.
+
+    All species share the same `bins` x `bins` grid over the data range and
+    are counted in one `bincount` pass; only non-empty cells are returned, so the table has at most
+    `bins * bins * n_species` rows regardless of the input size.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns species, `x`, `y` (cell centres) and count.
+    """
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    codes, names = pd.factorize(df[target_col], sort=True)
+    if len(xs) == 0:
+        return pd.DataFrame(columns=[target_col, x, y, "count"])
+
+    def bin_index(values):
+        lo, hi = values.min(), values.max()
+        width = (hi - lo) / bins or 1.0
+        # The maximum falls in the last bin, as in numpy.histogram
+        idx = np.minimum(((values - lo) / width).astype(np.int64), bins - 1)
+        return idx, lo + (np.arange(bins) + 0.5) * width
+
+    ix, x_centres = bin_index(xs)
+    iy, y_centres = bin_index(ys)
+
+    # One bincount over (species, x bin, y bin) cells for all species at once
+    cells = (codes.astype(np.int64) * bins + ix) * bins + iy
+    counts = np.bincount(cells, minlength=len(names) * bins * bins)
+    nonzero = np.flatnonzero(counts)
+    k, rest = np.divmod(nonzero, bins * bins)
+    i, j = np.divmod(rest, bins)
+    return pd.DataFrame({
+        target_col: np.asarray(names, dtype=object)[k],
+        x: x_centres[i],
+        y: y_centres[j],
+        "count": counts[nonzero],
+    })
+
+
+def aggregate_eda(
+    df: pd.DataFrame, target_col: str = "species", bins: int = 40
+) -> Dict[str, pd.DataFrame]:
+    """
+    Compact summaries for the EDA charts, independent of the number of rows.
+
+    Returns
+    -------
+    dict
+        "density": `density_2d` of petal length vs petal width,
+        "boxplot": `boxplot_summary`, and
+        "correlation": the long-form correlation table of the features.
+    """
+    features = [col for col in df.columns if col != target_col]
+    return {
+        "density": density_2d(df, "petal_length", "petal_width", target_col, bins),
+        "boxplot": boxplot_summary(df, target_col),
+        "correlation": CorrelationState(features).update(df).to_long(),
+    }
+
+
+SPEC_MANIFEST = ".figure_specs.json"
+
+
+def chart_spec(chart) -> dict:
+    """
+    Vega-Lite spec of an Altair chart, exactly as `chart.save` renders it.
+
+    Data is inlined without Altair's row limit, as in `save`.
+    """
+    import altair as alt
+
+    with alt.data_transformers.enable("default"), alt.data_transformers.disable_max_rows():
+        return chart.to_dict(context={"pre_transform": False})
+
+
+def spec_hash(spec: dict) -> str:
+    """
+    SHA-256 of a Vega-Lite spec plus the renderer versions.
+
+    Specs inline their data, so the hash changes whenever the data, the
+    encoding or the renderer changes.
+    """
+    import altair as alt
+    import vl_convert as vlc
+
+    payload = json.dumps(
+        {"spec": spec, "altair": alt.__version__, "vl_convert": vlc.__version__},
+        sort_keys=True,
+        default=str,
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def render_png(spec: dict, path: str) -> float:
+    """
+    Render a Vega-Lite spec to a PNG file and return the seconds it took.
+
+    Produces the same bytes as `chart.save(path)`; takes a plain dict so it
+    can run in a worker process.
+    """
+    import altair as alt
+    from altair.utils.mimebundle import spec_to_mimebundle
+
+    start = time.perf_counter()
+    bundle, _ = spec_to_mimebundle(
+        spec,
+        format="png",
+        mode="vega-lite",
+        vega_version=alt.VEGA_VERSION,
+        vegalite_version=alt.VEGALITE_VERSION,
+        vegaembed_version=alt.VEGAEMBED_VERSION,
+    )
+    with open(path, "wb") as f:
+        f.write(bundle["image/png"])
+    return time.perf_counter() - start
+
+
+def render_figures(specs: Dict[str, dict], output_dir: str, n_jobs: int = -1) -> Dict[str, Optional[float]]:
+    """
+    Render Vega-Lite specs to PNG files concurrently, skipping unchanged ones.
+
+    The hash of each rendered spec is kept in `<output_dir>/.figure_specs.json`;
+    a figure whose file exists and whose spec hash matches is not rendered
+    again. Changed figures are rendered in a process pool, since vl-convert
+    rendering is CPU bound.
+
+    Parameters
+    ----------
+    specs : dict
+        Mapping of output file name to Vega-Lite spec (see `chart_spec`).
+    output_dir : str
+        Directory for the PNG files and the spec manifest.
+    n_jobs : int, optional
+        Worker processes; -1 uses one per figure up to the CPU count,
+        1 renders in the current process. By default -1.
+
+    Returns
+    -------
+    dict
+        Mapping of file name to render seconds, or None if it was skipped.
+    """
+    manifest_path = os.path.join(output_dir, SPEC_MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    hashes = {name: spec_hash(spec) for name, spec in specs.items()}
+    todo = [
+        name for name in specs
+        if manifest.get(name) != hashes[name]
+        or not os.path.exists(os.path.join(output_dir, name))
+    ]
+
+    timings = {name: None for name in specs}
+    workers = min(len(todo), os.cpu_count() or 1) if n_jobs == -1 else min(len(todo), n_jobs)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                name: pool.submit(render_png, specs[name], os.path.join(output_dir, name))
+                for name in todo
+            }
+            for name, future in futures.items():
+                timings[name] = future.result()
+    else:
+        for name in todo:
+            timings[name] = render_png(specs[name], os.path.join(output_dir, name))
+
+    manifest.update({name: hashes[name] for name in todo})
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return timings
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import struct
+from typing import Optional
+
+import numpy as np
+
+ARTIFACT_MAGIC = b"IRISLIN\x00"
+ARTIFACT_FORMAT = "iris-linear-model"
+ARTIFACT_VERSION = 1
+# Array data starts on this boundary so memory-mapped arrays are aligned
+ARTIFACT_ALIGN = 64
+SCORING_ARRAYS = ("mean", "scale", "coef", "intercept")
+
+
+def export_linear_weights(model, path: str) -> dict:
+    """
+    Export the fitted StandardScaler + LogisticRegression Pipeline to `.npz`.
+
+    The archive holds everything scoring needs: the scaler mean/scale
+    vectors, the coefficient matrix and intercept, the class labels and the
+    feature order. The scaler is kept as separate vectors rather than being
+    folded into the coefficients, so that `LinearScorer` can replay the exact
+    floating-point operations of the Pipeline.
+
+    Parameters
+    ----------
+    model : sklearn.pipeline.Pipeline
+        Pipeline as built in src/model.py: a `preprocessor` ColumnTransformer
+        holding a single StandardScaler, followed by a `classifier`
+        LogisticRegression.
+    path : str
+        Destination `.npz` file.
+
+    Returns
+    -------
+    dict
+        The arrays written to `path`.
+    """
+    arrays = _linear_arrays(model)
+    np.savez(path, **arrays)
+    return arrays
+
+
+def _linear_arrays(model) -> dict:
+    """Extract the scaler and logistic regression arrays from the Pipeline."""
+    preprocessor = model.named_steps["preprocessor"]
+    classifier = model.named_steps["classifier"]
+
+    transformers = [
+        (name, trans, cols)
+        for name, trans, cols in preprocessor.transformers_
+        if trans != "drop"
+    ]
+    if len(transformers) != 1 or type(transformers[0][1]).__name__ != "StandardScaler":
+        raise ValueError("Expected a preprocessor holding a single StandardScaler.")
+    _, scaler, columns = transformers[0]
+
+    n_features = len(columns)
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+
+    arrays = {
+        "features": np.asarray(columns, dtype=str),
+        "classes": np.asarray(classifier.classes_, dtype=str),
+        "mean": np.asarray(mean, dtype=np.float64),
+        "scale": np.asarray(scale, dtype=np.float64),
+        "coef": np.asarray(classifier.coef_, dtype=np.float64),
+        "intercept": np.asarray(classifier.intercept_, dtype=np.float64),
+    }
+    if arrays["coef"].shape[0] != arrays["classes"].size:
+        raise ValueError("Only multinomial models with one coefficient row per class are supported.")
+    return arrays
+
+
+def save_artifact(model, path: str, metadata: Optional[dict] = None) -> dict:
+    """
+    Save the Pipeline as a single-file, pickle-free artifact.
+
+    Layout: an 8-byte magic number, the header length as a little-endian
+    uint64, a JSON header, then the raw float64 arrays, each starting on a
+    64-byte boundary. The header records the format name and version, the
+    feature and class names, free-form `metadata` (e.g. best parameters and
+    scores) and, for every array, its dtype, shape, offset and SHA-256.
+    Loading never unpickles anything, and the arrays can be memory-mapped
+    in place.
+
+    Parameters
+    ----------
+    model : sklearn.pipeline.Pipeline
+        Pipeline as accepted by `export_linear_weights`.
+    path : str
+        Destination file.
+    metadata : dict, optional
+        JSON-serialisable information stored alongside the weights.
+
+    Returns
+    -------
+    dict
+        The header written to the file.
+    """
+    arrays = _linear_arrays(model)
+    entries, offset = {}, 0
+    for name in SCORING_ARRAYS:
+        array = np.ascontiguousarray(arrays[name], dtype="<f8")
+        entries[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+            "sha256": hashlib.sha256(array.tobytes()).hexdigest(),
+        }
+        offset += -(-array.nbytes // ARTIFACT_ALIGN) * ARTIFACT_ALIGN
+
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "features": arrays["features"].tolist(),
+        "classes": arrays["classes"].tolist(),
+        "metadata": metadata or {},
+        "arrays": entries,
+    }
+    payload = json.dumps(header, sort_keys=True, default=str).encode()
+    prefix = len(ARTIFACT_MAGIC) + 8
+    # Pad the header so the data section starts aligned
+    payload += b" " * (-(prefix + len(payload)) % ARTIFACT_ALIGN)
+
+    with open(path, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(struct.pack("<Q", len(payload)))
+        f.write(payload)
+        data_start = f.tell()
+        for name in SCORING_ARRAYS:
+            f.seek(data_start + entries[name]["offset"])
+            f.write(np.ascontiguousarray(arrays[name], dtype="<f8").tobytes())
+    return header
+
+
+def _read_header(path: str):
+    with open(path, "rb") as f:
+        if f.read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+            raise ValueError(f"Not a {ARTIFACT_FORMAT} artifact: {path}")
+        (length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+        data_start = f.tell()
+    if header.get("format") != ARTIFACT_FORMAT or header.get("version", 0) > ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact {header.get('format')} v{header.get('version')}; "
+            f"this reader supports {ARTIFACT_FORMAT} up to v{ARTIFACT_VERSION}."
+        )
+    return header, data_start
+
+
+def read_artifact_metadata(path: str) -> dict:
+    """
+    Read an artifact's header (format, version, features, classes, metadata
+    and array descriptions) without touching the weights.
+    """
+    return _read_header(path)[0]
+
+
+def load_artifact(path: str, verify: bool = False) -> "LinearScorer":
+    """
+    Load a `LinearScorer` from an artifact written by `save_artifact`.
+
+    Reads the JSON header and memory-maps the four scoring arrays; nothing
+    else in the file is parsed and no sklearn or pandas import is needed.
+
+    Parameters
+    ----------
+    path : str
+        Artifact file.
+    verify : bool, optional
+        Check each array against its recorded SHA-256, by default False.
+
+    Returns
+    -------
+    LinearScorer
+        Scorer backed by read-only memory-mapped weights.
+    """
+    header, data_start = _read_header(path)
+    arrays = {}
+    for name in SCORING_ARRAYS:
+        entry = header["arrays"][name]
+        array = np.memmap(
+            path,
+            dtype=np.dtype(entry["dtype"]),
+            mode="r",
+            offset=data_start + entry["offset"],
+            shape=tuple(entry["shape"]),
+        )
+        if verify and hashlib.sha256(array.tobytes()).hexdigest() != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch for '{name}' in {path}.")
+        arrays[name] = array
+    return LinearScorer(header["features"], header["classes"], **arrays)
+
+
+class LinearScorer:
+    """
+    Pure-NumPy scorer for a StandardScaler + multinomial LogisticRegression.
+
+    Reproduces `Pipeline.predict_proba` bit for bit without importing
+    sklearn or pandas. Exposes `classes_` and `feature_names_in_` like the
+    Pipeline, so it can be used wherever the pickled model is.
+
+    Parameters
+    ----------
+    features, classes, mean, scale, coef, intercept : numpy.ndarray
+        Arrays as written by `export_linear_weights`.
+    """
+
+    def __init__(self, features, classes, mean, scale, coef, intercept):
+        self.feature_names_in_ = np.asarray(features, dtype=object)
+        self.classes_ = np.asarray(classes, dtype=object)
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = np.asarray(intercept, dtype=np.float64)
+
+    @classmethod
+    def load(cls, path: str) -> "LinearScorer":
+        """Load a scorer from an `.npz` file written by `export_linear_weights`."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["features"],
+                data["classes"],
+                data["mean"],
+                data["scale"],
+                data["coef"],
+                data["intercept"],
+            )
+
+    def _as_matrix(self, X) -> np.ndarray:
+        # Select DataFrame columns by name, as the ColumnTransformer does
+        if hasattr(X, "columns"):
+            X = X[list(self.feature_names_in_)].to_numpy()
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.coef_.shape[1]:
+            raise ValueError(
+                f"Expected a 2D input with {self.coef_.shape[1]} features, got shape {X.shape}."
+            )
+        # StandardScaler keeps float32 input as float32 and upcasts the rest
+        dtype = np.float32 if X.dtype == np.float32 else np.float64
+        return np.array(X, dtype=dtype)
+
+    def decision_function(self, X) -> np.ndarray:
+        """Return the (n_samples, n_classes) linear scores."""
+        X = self._as_matrix(X)
+        X -= self.mean_
+        X /= self.scale_
+        return X @ self.coef_.T + self.intercept_
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Return class probabilities, matching sklearn's softmax exactly."""
+        scores = self.decision_function(X)
+        scores -= scores.max(axis=1).reshape(-1, 1)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1).reshape(-1, 1)
+        return scores
+
+    def predict(self, X) -> np.ndarray:
+        """Return the predicted class label for each row."""
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from utils_cache import hash_file
+
+IRIS_URL = "https://raw.githubusercontent.com/mwaskom/seaborn-data/master/iris.csv"
+
+# SHA-256 of the seaborn-data iris.csv (the committed data/raw/iris.csv)
+IRIS_SHA256 = "9cc1c345c71bcc9b486b74cbf6063fa66f4bb5e0f603a4b3c3471ec2e5e8e355"
+
+# UCI copy of the dataset shipped with the repository, used when nothing else is reachable
+BUNDLED_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "iris.data"
+)
+BUNDLED_SHA256 = "6f608b71a7317216319b4d27b4d9bc84e6abd734eda7872b71a458569e2656c0"
+
+IRIS_HEADER = b"sepal_length,sepal_width,petal_length,petal_width,species\n"
+
+
+def uci_to_csv(data: bytes) -> bytes:
+    """
+    Convert the UCI `iris.data` layout to the seaborn CSV layout.
+
+    Adds the header row, drops blank lines and strips the "Iris-" prefix
+    from the species names. Note that the UCI file differs from Fisher's
+    data (and seaborn's copy) in two setosa rows.
+    """
+    lines = [line.strip() for line in data.splitlines()]
+    rows = [line.replace(b",Iris-", b",") for line in lines if line]
+    return IRIS_HEADER + b"".join(row + b"\n" for row in rows)
+
+
+def _check_sha256(actual: str, expected: Optional[str], source: str) -> None:
+    if expected and actual != expected:
+        raise ValueError(
+            f"SHA-256 mismatch for {source}: expected {expected}, got {actual}."
+        )
+
+
+def _install(src: str, output: str) -> bool:
+    """Copy `src` to `output` atomically unless the contents are identical; returns whether it changed."""
+    if os.path.exists(output) and hash_file(output) == hash_file(src):
+        return False
+    out_dir = os.path.dirname(os.path.abspath(output))
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".tmp-")
+    os.close(fd)
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, output)
+    return True
+
+
+def fetch_url(
+    url: str,
+    dest: str,
+    sha256: Optional[str] = None,
+    timeout: float = 10.0,
+) -> bool:
+    """
+    Download `url` to `dest` with a conditional GET.
+
+    The response's ETag and Last-Modified headers are stored next to
+    `dest` in `<dest>.meta.json`; later calls send them as If-None-Match
+    and If-Modified-Since, and a 304 response leaves `dest` untouched.
+    The body is streamed to a temporary file and hashed on the way, and
+    only replaces `dest` if it matches `sha256`.
+
+    Parameters
+    ----------
+    url : str
+        Remote file.
+    dest : str
+        Local copy, e.g. in the download cache.
+    sha256 : str, optional
+        Expected SHA-256 hex digest; not checked if None.
+    timeout : float, optional
+        Socket timeout in seconds, by default 10.
+
+    Returns
+    -------
+    bool
+        True if a new body was downloaded, False on 304 Not Modified.
+
+    Raises
+    ------
+    urllib.error.URLError, OSError
+        When the remote cannot be reached.
+    ValueError
+        When the downloaded bytes do not match `sha256`.
+    """
+    import urllib.error
+    import urllib.request
+
+    meta_path = dest + ".meta.json"
+    headers = {}
+    if os.path.exists(dest) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("url") == url:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return False
+        raise
+
+    dest_dir = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".tmp-")
+    digest = hashlib.sha256()
+    try:
+        with response, os.fdopen(fd, "wb") as f:
+            for block in iter(lambda: response.read(1 << 20), b""):
+                digest.update(block)
+                f.write(block)
+        _check_sha256(digest.hexdigest(), sha256, url)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, dest)
+    with open(meta_path, "w") as f:
+        json.dump({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest.hexdigest(),
+        }, f, indent=2)
+    return True
+
+
+def fetch_iris(
+    output: str,
+    url: Optional[str] = IRIS_URL,
+    mirror: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    sha256: Optional[str] = IRIS_SHA256,
+    timeout: float = 10.0,
+) -> dict:
+    """
+    Put the raw Iris CSV at `output` from the first source that works.
+
+    Sources, in order:
+
+    1. `mirror`: a local file, or a directory containing `iris.csv`;
+    2. `url`, via `fetch_url` into `cache_dir` (conditional GET), skipped
+       when `url` is None or the remote is unreachable;
+    3. the copy left in `cache_dir` by an earlier download;
+    4. the bundled UCI file `data/iris.data`, converted to the CSV layout.
+
+    Raw bytes are copied (no pandas parsing), checked against `sha256`,
+    and `output` is only rewritten if its contents change.
+
+    Parameters
+    ----------
+    output : str
+        Destination CSV.
+    url : str, optional
+        Remote CSV; None works offline.
+    mirror : str, optional
+        Local mirror file or directory, tried first.
+    cache_dir : str, optional
+        Download cache holding the remote copy and its validators. Without
+        it the remote is downloaded unconditionally to a temporary file.
+    sha256 : str, optional
+        Expected SHA-256 of the CSV from the mirror, remote or cache; None
+        skips the check. The bundled file is checked against its own digest.
+    timeout : float, optional
+        Remote socket timeout in seconds, by default 10.
+
+    Returns
+    -------
+    dict
+        'source' (mirror, remote, not-modified, cache or bundled), 'sha256'
+        of `output`, 'changed' (whether `output` was rewritten) and a
+        'skipped' list of sources that were unavailable and why.
+
+    Raises
+    ------
+    ValueError
+        When a mirror or remote copy fails the checksum.
+    """
+    skipped = []
+
+    if mirror:
+        path = os.path.join(mirror, "iris.csv") if os.path.isdir(mirror) else mirror
+        if os.path.exists(path):
+            _check_sha256(hash_file(path), sha256, path)
+            return _result("mirror", path, output, skipped)
+        skipped.append(f"mirror: {path} not found")
+
+    cached = os.path.join(cache_dir, "iris.csv") if cache_dir else None
+    if url:
+        import urllib.error
+
+        try:
+            if cached:
+                downloaded = fetch_url(url, cached, sha256, timeout)
+                return _result("remote" if downloaded else "not-modified", cached, output, skipped)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "iris.csv")
+                fetch_url(url, path, sha256, timeout)
+                return _result("remote", path, output, skipped)
+        except (urllib.error.URLError, OSError) as e:
+            skipped.append(f"remote: {url} unreachable ({e})")
+
+    if cached and os.path.exists(cached):
+        if not sha256 or hash_file(cached) == sha256:
+            return _result("cache", cached, output, skipped)
+        skipped.append(f"cache: {cached} fails the checksum")
+
+    _check_sha256(hash_file(BUNDLED_PATH), BUNDLED_SHA256, BUNDLED_PATH)
+    with open(BUNDLED_PATH, "rb") as f:
+        data = uci_to_csv(f.read())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "iris.csv")
+        with open(path, "wb") as f:
+            f.write(data)
+        return _result("bundled", path, output, skipped)
+
+
+def _result(source: str, path: str, output: str, skipped: list) -> dict:
+    changed = _install(path, output)
+    return {"source": source, "sha256": hash_file(output), "changed": changed, "skipped": skipped}
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Bump when the stored arrays change meaning, so old cache entries are ignored
+FOLDS_VERSION = 1
+
+
+def fold_key(X, y, test_size: float = 0.2, random_state: int = 522, cv: int = 5) -> str:
+    """
+    Content hash identifying the folds of one dataset and split configuration.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        Features.
+    y : pandas.Series
+        Labels.
+    test_size, random_state, cv
+        As for `CVFolds.build`.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest of the data values, column names and parameters.
+    """
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "version": FOLDS_VERSION,
+        "columns": [str(col) for col in X.columns],
+        "test_size": test_size,
+        "random_state": random_state,
+        "cv": cv,
+    }).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class CVFolds:
+    """
+    Train/test split, CV fold indices and standardized fold matrices.
+
+    `train_idx`/`test_idx` are the row positions of the holdout split, the
+    same rows `create_train_test_split` selects for the same
+    `test_size` and `random_state`. `splits` are the stratified CV folds of
+    the training rows (positions within `X.iloc[train_idx]`), as
+    `cross_validate` and the search classes would draw them with `cv=5`, and
+    can be passed as their `cv` argument. `scaled(k)` returns fold `k`'s
+    training and test matrices standardized on the fold's training rows.
+
+    Instances are built with `build` or loaded with `load`; loaded arrays
+    are read-only memory maps, so every consumer shares the same pages.
+
+    Parameters
+    ----------
+    arrays : dict
+        Named arrays as written by `save`.
+    key : str, optional
+        `fold_key` of the data the folds were built from.
+    """
+
+    def __init__(self, arrays: dict, key: Optional[str] = None):
+        self.arrays = arrays
+        self.key = key
+        self.n_folds = sum(name.startswith("fold_train_") for name in arrays)
+
+    @property
+    def train_idx(self) -> np.ndarray:
+        return self.arrays["train_idx"]
+
+    @property
+    def test_idx(self) -> np.ndarray:
+        return self.arrays["test_idx"]
+
+    @property
+    def splits(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        return [
+            (self.arrays[f"fold_train_{k}"], self.arrays[f"fold_test_{k}"])
+            for k in range(self.n_folds)
+        ]
+
+    def scaled(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Standardized training and test matrices of fold `k`."""
+        return self.arrays[f"X_train_{k}"], self.arrays[f"X_test_{k}"]
+
+    @classmethod
+    def build(cls, X, y, test_size: float = 0.2, random_state: int = 522, cv: int = 5) -> "CVFolds":
+        """
+        Compute the holdout split, the CV folds and the scaled fold matrices.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Features (numeric columns only).
+        y : pandas.Series
+            Labels.
+        test_size : float, optional
+            Holdout proportion, by default 0.2.
+        random_state : int, optional
+            Seed of the holdout split, by default 522.
+        cv : int, optional
+            Number of stratified folds, by default 5.
+        """
+        from sklearn.model_selection import check_cv, train_test_split
+        from sklearn.preprocessing import StandardScaler
+
+        train_idx, test_idx = train_test_split(
+            np.arange(len(X)), test_size=test_size, random_state=random_state
+        )
+        X_train = np.asarray(X, dtype=float)[train_idx]
+        y_train = np.asarray(y)[train_idx]
+
+        arrays = {"train_idx": train_idx, "test_idx": test_idx}
+        splits = check_cv(cv, y_train, classifier=True).split(X_train, y_train)
+        for k, (train, test) in enumerate(splits):
+            scaler = StandardScaler().fit(X_train[train])
+            arrays[f"fold_train_{k}"] = train
+            arrays[f"fold_test_{k}"] = test
+            arrays[f"X_train_{k}"] = scaler.transform(X_train[train])
+            arrays[f"X_test_{k}"] = scaler.transform(X_train[test])
+        return cls(arrays, key=fold_key(X, y, test_size, random_state, cv))
+
+    def save(self, directory: str) -> None:
+        """
+        Write one `.npy` file per array plus `meta.json` into `directory`.
+
+        The entry is written to a temporary directory first and renamed into
+        place, so concurrent runs never see a partial entry.
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+        try:
+            for name, array in self.arrays.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+                json.dump({"version": FOLDS_VERSION, "key": self.key, "arrays": list(self.arrays)}, f)
+            os.rename(tmp_dir, directory)
+        except OSError:
+            # Another run stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(os.path.join(directory, "meta.json")):
+                raise
+
+    @classmethod
+    def load(cls, directory: str) -> "CVFolds":
+        """Memory-map the arrays of a saved entry."""
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in meta["arrays"]
+        }
+        return cls(arrays, key=meta["key"])
+
+
+def load_folds(
+    X,
+    y,
+    cache_dir: Optional[str] = None,
+    test_size: float = 0.2,
+    random_state: int = 522,
+    cv: int = 5,
+) -> CVFolds:
+    """
+    Load the folds of `X`, `y` from the fold cache, building them on a miss.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        Features.
+    y : pandas.Series
+        Labels.
+    cache_dir : str, optional
+        Fold cache directory, one `<fold_key>/` entry per dataset and
+        configuration. When None the folds are built in memory only.
+    test_size, random_state, cv
+        As for `CVFolds.build`.
+
+    Returns
+    -------
+    CVFolds
+        Memory-mapped folds on a cache hit, freshly built ones otherwise.
+    """
+    if cache_dir is None:
+        return CVFolds.build(X, y, test_size, random_state, cv)
+
+    entry = os.path.join(cache_dir, fold_key(X, y, test_size, random_state, cv))
+    if os.path.exists(os.path.join(entry, "meta.json")):
+        return CVFolds.load(entry)
+    CVFolds.build(X, y, test_size, random_state, cv).save(entry)
+    return CVFolds.load(entry)
@@ -0,0 +1,310 @@
+import os
+from typing import Iterator, Optional
+
+import pandas as pd
+
+FEATURE_COLS = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+TARGET_COL = "species"
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+
+def data_format(path: str) -> str:
+    """
+    Infer the storage format of `path` from its extension.
+
+    Returns
+    -------
+    str
+        "parquet", "arrow" (Arrow IPC / Feather v2) or "csv".
+    """
+    lower = path.lower()
+    if lower.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    if lower.endswith(ARROW_EXTENSIONS):
+        return "arrow"
+    return "csv"
+
+
+def shard_paths(path: str) -> list:
+    """
+    Data files making up `path`: the file itself, or for a directory of
+    shards (e.g. from `generate.py`) its CSV/Parquet/Arrow files in name order.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    extensions = (".csv",) + PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+    return sorted(
+        os.path.join(path, name)
+        for name in os.listdir(path)
+        if name.lower().endswith(extensions)
+    )
+
+
+# Dtype policy of in-memory and columnar Iris frames: float32 features (the
+# measurements have one decimal) and a categorical species column
+IRIS_DTYPES = {**{col: "float32" for col in FEATURE_COLS}, TARGET_COL: "category"}
+
+
+def to_columnar_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the `IRIS_DTYPES` policy: float32 features, categorical species.
+
+    Only columns whose dtype differs are converted; the others are shared
+    with `df` rather than copied, and `df` itself is returned when it
+    already follows the policy. Columns that are not Iris features or the
+    target are left unchanged.
+    """
+    casts = {
+        col: dtype for col, dtype in IRIS_DTYPES.items()
+        if col in df.columns and df[col].dtype != dtype
+    }
+    return df.astype(casts, copy=False) if casts else df
+
+
+def widen_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert float32 columns to float64 through their shortest decimal form.
+
+    A plain cast turns float32 5.1 into 5.099999904632568; going through
+    the decimal string gives 5.1 again, the value as it was recorded. Meant
+    for small frames handed to code that is sensitive to the exact values
+    (e.g. chart data and quantiles), as it formats every value.
+    """
+    import numpy as np
+
+    casts = {
+        col: df[col].to_numpy().astype(str).astype(np.float64)
+        for col in df.columns if df[col].dtype == np.float32
+    }
+    return df.assign(**casts) if casts else df
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """`to_columnar_dtypes`, leaving non-numeric measurements unconverted for validation to report."""
+    if all(
+        pd.api.types.is_numeric_dtype(df[col].dtype)
+        for col in FEATURE_COLS if col in df.columns
+    ):
+        return to_columnar_dtypes(df)
+    return df.astype({TARGET_COL: "category"}, copy=False) if TARGET_COL in df.columns else df
+
+
+def read_iris(path: str, compact: bool = False) -> pd.DataFrame:
+    """
+    Read an Iris dataset from CSV, Parquet or Arrow IPC.
+
+    Arrow IPC files are memory-mapped, so fixed-width feature columns of a
+    file written by `write_iris` (a single record batch) are exposed to
+    pandas without copying or parsing. Parquet is decoded from a memory map.
+    CSV is parsed with `pandas.read_csv`.
+
+    Parameters
+    ----------
+    path : str
+        Input file; the format is inferred from the extension. A directory
+        of shards is read shard by shard and concatenated.
+    compact : bool, optional
+        Enforce the `IRIS_DTYPES` policy (float32 features, categorical
+        species), by default False. CSV columns are parsed straight into
+        these dtypes, so no float64/object frame is built first; a file
+        with non-numeric measurements is read unconverted so that
+        validation can report them.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The dataset.
+    """
+    if os.path.isdir(path):
+        shards = [read_iris(shard, compact) for shard in shard_paths(path)]
+        df = pd.concat(shards, ignore_index=True)
+        # Shards may have different category sets, which concat turns into object
+        return _compact(df) if compact else df
+
+    fmt = data_format(path)
+    if fmt == "csv":
+        if compact:
+            try:
+                return pd.read_csv(path, dtype=IRIS_DTYPES)
+            except ValueError:
+                # Non-numeric measurements: read as-is so validation can report them
+                pass
+        return pd.read_csv(path)
+
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, memory_map=True)
+    else:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+
+    # split_blocks keeps each column in its own block, so columns backed by
+    # the memory map are wrapped instead of being consolidated into a copy
+    df = table.to_pandas(split_blocks=True)
+    return _compact(df) if compact else df
+
+
+def write_iris(df: pd.DataFrame, path: str) -> None:
+    """
+    Write an Iris dataset as CSV, Parquet or Arrow IPC.
+
+    Parquet and Arrow outputs store features as float32 and species as a
+    categorical (dictionary-encoded) column. Arrow IPC is written
+    uncompressed so that it can be memory-mapped by `read_iris`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset to write.
+    path : str
+        Output file; the format is inferred from the extension.
+    """
+    fmt = data_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(to_columnar_dtypes(df), preserve_index=False)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def iter_chunks(path: str, chunksize: int, compact: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Yield a CSV, Parquet or Arrow IPC file as DataFrames of at most `chunksize` rows.
+
+    Only one chunk is materialised at a time. A directory of shards is
+    read shard by shard; chunks do not span shards. With `compact`, chunks
+    follow the `IRIS_DTYPES` policy, as in `read_iris`.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    if os.path.isdir(path):
+        for shard in shard_paths(path):
+            yield from iter_chunks(shard, chunksize, compact)
+        return
+
+    fmt = data_format(path)
+    if fmt == "csv":
+        with pd.read_csv(path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield _compact(chunk) if compact else chunk
+        return
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        batches = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunksize))
+    else:
+        import pyarrow as pa
+
+        # Reading a memory-mapped IPC file only maps it; rows are paged in
+        # as each slice is converted
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        batches = (
+            table.slice(start, chunksize).to_pandas()
+            for start in range(0, table.num_rows, chunksize)
+        )
+    for chunk in batches:
+        yield _compact(chunk) if compact else chunk
+
+
+class ChunkWriter:
+    """
+    Append DataFrame chunks to a CSV, Parquet or Arrow IPC file.
+
+    Used as a context manager; the schema (or CSV header) is taken from the
+    first chunk written.
+
+    Parameters
+    ----------
+    path : str
+        Output file.
+    fmt : str, optional
+        "csv", "parquet" or "arrow"; inferred from `path` if omitted.
+    columnar_dtypes : bool, optional
+        Apply `to_columnar_dtypes` before writing Parquet/Arrow chunks, by
+        default True.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, columnar_dtypes: bool = True):
+        self.path = path
+        self.fmt = fmt or data_format(path)
+        self.columnar_dtypes = columnar_dtypes
+        self.rows = 0
+        self._writer = None
+        self._sink = None
+        self._started = False
+        self._categories = []
+        self._schema = None
+
+    def __enter__(self) -> "ChunkWriter":
+        out_dir = os.path.dirname(self.path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        return self
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append one chunk."""
+        if self.fmt == "csv":
+            df.to_csv(
+                self.path,
+                mode="a" if self._started else "w",
+                header=not self._started,
+                index=False,
+            )
+        else:
+            import pyarrow as pa
+
+            if self.columnar_dtypes:
+                df = to_columnar_dtypes(df)
+            if TARGET_COL in df.columns and isinstance(df[TARGET_COL].dtype, pd.CategoricalDtype):
+                # Grow one shared category list so each chunk's dictionary
+                # extends the previous one; Arrow IPC files accept such
+                # dictionary deltas but not replacements
+                seen = set(self._categories)
+                self._categories += [
+                    cat for cat in df[TARGET_COL].cat.categories if cat not in seen
+                ]
+                df = df.assign(**{TARGET_COL: df[TARGET_COL].cat.set_categories(self._categories)})
+
+            if self._writer is not None:
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            else:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._schema = table.schema
+                if self.fmt == "parquet":
+                    import pyarrow.parquet as pq
+
+                    self._writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    self._sink = pa.OSFile(self.path, "wb")
+                    self._writer = pa.ipc.new_file(
+                        self._sink,
+                        table.schema,
+                        options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True),
+                    )
+            self._writer.write_table(table)
+        self._started = True
+        self.rows += len(df)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        return False
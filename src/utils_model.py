@@ -1,12 +1,16 @@
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
-import pandas as pd
-from sklearn.model_selection import train_test_split
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Search strategies implemented in utils_search; kept here so command-line
+# choices can be listed without importing scikit-learn
+SEARCH_STRATEGIES = ("random", "halving", "early-stop", "path")
 
 
 def prepare_features_and_target(
-    df: pd.DataFrame, target_col: str = "species"
-) -> Tuple[pd.DataFrame, pd.Series]:
+    df: "pd.DataFrame", target_col: str = "species"
+) -> Tuple["pd.DataFrame", "pd.Series"]:
     """
     Split a DataFrame into feature matrix X and target vector y.
 
@@ -20,14 +24,16 @@ def prepare_features_and_target(
     Returns
     -------
     X : pandas.DataFrame
-        Features with the target column removed.
+        Features with the target column removed; shares its data with `df`.
     y : pandas.Series
         Target variable.
     """
+    from utils_data import select_columns
+
     if target_col not in df.columns:
         raise KeyError(f"Target column '{target_col}' not found in DataFrame.")
 
-    X = df.drop(columns=[target_col])
+    X = select_columns(df, [col for col in df.columns if col != target_col])
     y = df[target_col]
     return X, y
 
@@ -54,4 +60,36 @@ def create_train_test_split(
     -------
     X_train, X_test, y_train, y_test
     """
+    from sklearn.model_selection import train_test_split
+
     return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def build_pipeline(features: list):
+    """
+    Build the standard-scaling + logistic regression Pipeline used in src/model.py.
+
+    Parameters
+    ----------
+    features : list of str
+        Feature columns to scale.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        Unfitted pipeline with `preprocessor` and `classifier` steps.
+    """
+    from sklearn.compose import make_column_transformer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    preprocessor = make_column_transformer(
+        (StandardScaler(), features)
+    )
+    return Pipeline(
+        [
+            ("preprocessor", preprocessor),
+            ("classifier", LogisticRegression()),
+        ]
+    )
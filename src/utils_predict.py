@@ -0,0 +1,161 @@
+import os
+import pickle
+import time
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from utils_io import ChunkWriter, iter_chunks
+
+
+def load_model(model_path: str):
+    """
+    Load a model artifact written by src/model.py.
+
+    Parameters
+    ----------
+    model_path : str
+        Path to the pickled Pipeline (e.g. results/metrics/logreg_model.pickle),
+        to the exported weights (e.g. results/metrics/logreg_weights.npz) or
+        to the pickle-free artifact (e.g. results/metrics/logreg_model.artifact).
+        The last two load as a sklearn-free `LinearScorer`.
+
+    Returns
+    -------
+    object
+        The loaded estimator, ready to call `predict_proba` on.
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model artifact not found: {model_path}")
+
+    if model_path.endswith(".npz"):
+        from utils_fastpath import LinearScorer
+
+        return LinearScorer.load(model_path)
+
+    if model_path.endswith(".artifact"):
+        from utils_fastpath import load_artifact
+
+        return load_artifact(model_path)
+
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
+def iter_feature_chunks(path: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over a CSV, Parquet or Arrow IPC file as DataFrames of at most `chunksize` rows.
+
+    Returns the iterator of `utils_io.iter_chunks`; an invalid `chunksize`
+    raises ValueError once iteration starts.
+
+    Only one chunk is held in memory at a time, so arbitrarily large
+    measurement files can be scored in bounded memory.
+
+    Parameters
+    ----------
+    path : str
+        Input file; the format is inferred from the extension
+        (see `utils_io.data_format`).
+    chunksize : int, optional
+        Maximum number of rows per chunk, by default 100_000.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Consecutive row chunks of the input file.
+    """
+    return iter_chunks(path, chunksize)
+
+
+def score_chunk(model, chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score one chunk with a single vectorized `predict_proba` call.
+
+    Parameters
+    ----------
+    model : estimator
+        Fitted classifier exposing `predict_proba` and `classes_`.
+    chunk : pandas.DataFrame
+        Rows to score; must contain the features the model was trained on.
+        Extra columns (e.g. a `species` label) are ignored for scoring.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The input chunk with a `predicted_species` column and one
+        `prob_<class>` column per class appended.
+    """
+    features = list(getattr(model, "feature_names_in_", chunk.columns))
+    missing = [col for col in features if col not in chunk.columns]
+    if missing:
+        raise KeyError(f"Input is missing feature columns: {missing}")
+
+    classes = np.asarray(model.classes_)
+    # Estimators reject zero-row input; an empty chunk still gets the columns
+    proba = (
+        model.predict_proba(chunk[features]) if len(chunk) else np.empty((0, len(classes)))
+    )
+
+    scored = chunk.reset_index(drop=True)
+    scored["predicted_species"] = classes[proba.argmax(axis=1)]
+    for i, cls in enumerate(classes):
+        scored[f"prob_{cls}"] = proba[:, i]
+    return scored
+
+
+def stream_predictions(
+    model, input_path: str, output_path: str, chunksize: int = 100_000
+) -> dict:
+    """
+    Score `input_path` chunk by chunk and append the results to `output_path`.
+
+    The output format follows the output extension (CSV, Parquet or Arrow IPC).
+    Results are written as each chunk is scored, so memory use depends on
+    `chunksize` and not on the size of the input file. An input without
+    rows gives an output with the columns only.
+
+    Parameters
+    ----------
+    model : estimator
+        Fitted classifier, typically from `load_model`.
+    input_path : str
+        CSV, Parquet or Arrow IPC file of measurements to score.
+    output_path : str
+        Destination for the scored rows.
+    chunksize : int, optional
+        Rows scored per `predict_proba` call, by default 100_000.
+
+    Returns
+    -------
+    dict
+        Throughput summary with keys 'rows', 'chunks', 'seconds' and
+        'rows_per_sec'.
+    """
+    n_chunks = 0
+    empty = None
+    start = time.perf_counter()
+
+    # Keep the scored columns' dtypes as they are; no float32 storage cast
+    with ChunkWriter(output_path, columnar_dtypes=False) as writer:
+        for chunk in iter_feature_chunks(input_path, chunksize=chunksize):
+            if chunk.empty:
+                empty = chunk
+                continue
+            writer.write(score_chunk(model, chunk))
+            n_chunks += 1
+        if not n_chunks:
+            # Still write the header, so the output exists for an empty input
+            if empty is None:
+                empty = pd.DataFrame(columns=list(getattr(model, "feature_names_in_", [])))
+            writer.write(score_chunk(model, empty))
+    n_rows = writer.rows
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": n_rows,
+        "chunks": n_chunks,
+        "seconds": elapsed,
+        "rows_per_sec": n_rows / elapsed if elapsed > 0 else float("inf"),
+    }
@@ -0,0 +1,252 @@
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+import click
+
+MB = 1024 * 1024
+
+# Profiler of the running stage; steps recorded while none is active are no-ops
+_ACTIVE = None
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in megabytes."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+class StageProfiler:
+    """
+    Record per-step timings for one pipeline stage and write them as JSON.
+
+    Used as a context manager around the stage. While active, `profile_step`
+    blocks anywhere in the code record wall time, CPU time, peak traced
+    memory and row counts; nested steps keep a reference to their parent.
+    On exit the report is written to `<profile_dir>/<stage>.json`, even if
+    the stage raised.
+
+    Parameters
+    ----------
+    stage : str
+        Stage name, e.g. "process".
+    profile_dir : str, optional
+        Output directory. When None the profiler is disabled and adds no
+        overhead.
+    cprofile : bool, optional
+        Also run cProfile over the whole stage, saving `<stage>.prof` and
+        the top functions by cumulative time in the report, by default False.
+    """
+
+    def __init__(self, stage: str, profile_dir: Optional[str] = None, cprofile: bool = False):
+        self.stage = stage
+        self.profile_dir = profile_dir
+        self.enabled = profile_dir is not None
+        self.cprofile = cprofile and self.enabled
+        self.steps = []
+        self._stack = []
+        self._profile = None
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "StageProfiler":
+        global _ACTIVE
+        if not self.enabled:
+            return self
+        _ACTIVE = self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._stage_frame = self._open("total")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _ACTIVE
+        if not self.enabled:
+            return False
+        if self._profile is not None:
+            self._profile.disable()
+        total = self._close(self._stage_frame)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        _ACTIVE = None
+        self.write(total, error=None if exc is None else f"{exc_type.__name__}: {exc}")
+        return False
+
+    def _open(self, name: str, rows: Optional[int] = None) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Keep the parent's peak before resetting it for this step
+            parent = self._stack[-1]
+            parent["_peak"] = max(parent["_peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {
+            "name": name,
+            "parent": self._stack[-1]["name"] if self._stack else None,
+            "rows": rows,
+            "_start_wall": time.perf_counter(),
+            "_start_cpu": time.process_time(),
+            "_start_mem": current,
+            "_peak": current,
+        }
+        self._stack.append(frame)
+        return frame
+
+    def _close(self, frame: dict) -> dict:
+        wall = time.perf_counter() - frame["_start_wall"]
+        cpu = time.process_time() - frame["_start_cpu"]
+        peak = max(frame["_peak"], tracemalloc.get_traced_memory()[1])
+        self._stack.remove(frame)
+        if self._stack:
+            self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+
+        record = {k: v for k, v in frame.items() if not k.startswith("_")}
+        record.update({
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "peak_mb": (peak - frame["_start_mem"]) / MB,
+        })
+        return record
+
+    @contextlib.contextmanager
+    def step(self, name: str, rows: Optional[int] = None):
+        """
+        Time a block as one step; yields the record so `rows` can be set inside.
+        """
+        if not self.enabled:
+            yield {}
+            return
+        frame = self._open(name, rows)
+        try:
+            yield frame
+        finally:
+            self.steps.append(self._close(frame))
+
+    def record(self, name: str, **fields):
+        """Add a step measured elsewhere (e.g. per-fold times from a CV run)."""
+        if self.enabled:
+            parent = self._stack[-1]["name"] if self._stack else None
+            self.steps.append({"name": name, "parent": parent, **fields})
+
+    def write(self, total: dict, error: Optional[str] = None) -> Optional[str]:
+        """Write the JSON report (and cProfile dump); returns the report path."""
+        if not self.enabled:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        report = {
+            "stage": self.stage,
+            "argv": sys.argv,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_seconds": total["wall_seconds"],
+            "cpu_seconds": total["cpu_seconds"],
+            "peak_traced_mb": total["peak_mb"],
+            "peak_rss_mb": _peak_rss_mb(),
+            "error": error,
+            "steps": self.steps,
+        }
+        if self._profile is not None:
+            prof_path = os.path.join(self.profile_dir, f"{self.stage}.prof")
+            self._profile.dump_stats(prof_path)
+            report["cprofile"] = {"path": prof_path, "top": _top_functions(self._profile)}
+
+        path = os.path.join(self.profile_dir, f"{self.stage}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(
+            f"[{self.stage}] {report['wall_seconds']:.2f}s wall, peak traced memory "
+            f"{report['peak_traced_mb']:.1f} MB, peak RSS {report['peak_rss_mb']:.1f} MB "
+            f"(profile: {path})"
+        )
+        return path
+
+
+def _top_functions(profile: cProfile.Profile, limit: int = 20) -> list:
+    """The `limit` functions with the highest cumulative time."""
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (cc, nc, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({func})",
+            "calls": nc,
+            "tottime": tottime,
+            "cumtime": cumtime,
+        })
+    return sorted(rows, key=lambda r: -r["cumtime"])[:limit]
+
+
+def profile_step(name: str, rows: Optional[int] = None):
+    """
+    Time a block as a step of the active `StageProfiler`.
+
+    A no-op when no profiler is active, so library code can be instrumented
+    unconditionally.
+    """
+    if _ACTIVE is None:
+        return contextlib.nullcontext({})
+    return _ACTIVE.step(name, rows)
+
+
+def profiling_active() -> bool:
+    """Whether a `StageProfiler` is recording, to skip profiling-only work otherwise."""
+    return _ACTIVE is not None
+
+
+def profile_record(name: str, **fields):
+    """Add a pre-measured step to the active `StageProfiler`, if any."""
+    if _ACTIVE is not None:
+        _ACTIVE.record(name, **fields)
+
+
+def record_frame(step: dict, df) -> None:
+    """
+    Store the row count and in-memory size (MB, `memory_usage(deep=True)`)
+    of DataFrame `df` on a `profile_step` record; skipped when not profiling,
+    as measuring object columns visits every value.
+    """
+    if _ACTIVE is not None:
+        step["rows"] = len(df)
+        step["frame_mb"] = float(df.memory_usage(deep=True).sum()) / MB
+
+
+def profiled(stage: str):
+    """
+    Add `--profile-dir` and `--cprofile` to a click command and run it
+    under a `StageProfiler`.
+
+    Place directly below `@click.command()`. Both options can also be set
+    with the IRIS_PROFILE_DIR and IRIS_CPROFILE environment variables, so a
+    whole `make` run can be profiled without editing the Makefile.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, profile_dir=None, cprofile=False, **kwargs):
+            with StageProfiler(stage, profile_dir, cprofile):
+                return func(*args, **kwargs)
+
+        wrapper = click.option(
+            "--cprofile",
+            is_flag=True,
+            envvar="IRIS_CPROFILE",
+            help="Also capture cProfile output (requires --profile-dir)."
+        )(wrapper)
+        wrapper = click.option(
+            "--profile-dir",
+            default=None,
+            envvar="IRIS_PROFILE_DIR",
+            help="Write per-step timing/memory JSON for this stage to this directory."
+        )(wrapper)
+        return wrapper
+    return decorator
@@ -0,0 +1,425 @@
+import time
+from numbers import Integral, Real
+
+import numpy as np
+from sklearn.model_selection import ParameterSampler, RandomizedSearchCV
+from sklearn.model_selection._search import BaseSearchCV
+
+from utils_model import SEARCH_STRATEGIES
+
+
+def make_param_distributions(tune_solver: bool = False):
+    """
+    Hyperparameter distributions for the logistic regression Pipeline.
+
+    Parameters
+    ----------
+    tune_solver : bool, optional
+        Also search over solver/penalty combinations, by default False
+        (only `classifier__C`, as in the original search).
+
+    Returns
+    -------
+    dict or list of dict
+        Distributions accepted by the sklearn search classes.
+    """
+    from scipy.stats import loguniform, uniform
+
+    C = loguniform(1e-6, 1e6)
+    if not tune_solver:
+        return {"classifier__C": C}
+
+    # Only valid solver/penalty pairs are sampled; l1_ratio only applies to
+    # the elastic-net penalty
+    return [
+        {
+            "classifier__C": C,
+            "classifier__solver": ["lbfgs", "newton-cg"],
+            "classifier__penalty": ["l2"],
+        },
+        {
+            "classifier__C": C,
+            "classifier__solver": ["saga"],
+            "classifier__penalty": ["l1", "l2"],
+        },
+        {
+            "classifier__C": C,
+            "classifier__solver": ["saga"],
+            "classifier__penalty": ["elasticnet"],
+            "classifier__l1_ratio": uniform(0, 1),
+        },
+    ]
+
+
+class EarlyStoppingRandomSearchCV(BaseSearchCV):
+    """
+    Randomized search that stops once the best score stops improving.
+
+    Candidates are drawn exactly as in `RandomizedSearchCV` with the same
+    `random_state`, but evaluated in batches of `batch_size`. The search
+    stops after `patience` consecutive batches fail to raise the best mean
+    test score by more than `tol`. `cv_results_`, `best_estimator_` etc.
+    behave as for the other sklearn search classes.
+
+    Parameters
+    ----------
+    estimator : estimator object
+        Estimator to tune.
+    param_distributions : dict or list of dict
+        As for `RandomizedSearchCV`.
+    n_iter : int, optional
+        Maximum number of candidates, by default 50.
+    batch_size : int, optional
+        Candidates evaluated (in parallel) per round, by default 10.
+    patience : int, optional
+        Rounds without improvement before stopping, by default 1.
+    tol : float, optional
+        Minimum score gain counted as an improvement, by default 0.0.
+    random_state : int, optional
+        Seed for candidate sampling.
+    scoring, n_jobs, refit, cv, verbose, pre_dispatch, error_score, return_train_score
+        As for `RandomizedSearchCV`.
+    """
+
+    _parameter_constraints = {
+        **BaseSearchCV._parameter_constraints,
+        "param_distributions": [dict, list],
+        "n_iter": [Integral],
+        "batch_size": [Integral],
+        "patience": [Integral],
+        "tol": [Real],
+        "random_state": ["random_state"],
+    }
+
+    def __init__(
+        self,
+        estimator,
+        param_distributions,
+        *,
+        n_iter=50,
+        batch_size=10,
+        patience=1,
+        tol=0.0,
+        random_state=None,
+        scoring=None,
+        n_jobs=None,
+        refit=True,
+        cv=None,
+        verbose=0,
+        pre_dispatch="2*n_jobs",
+        error_score=np.nan,
+        return_train_score=False,
+    ):
+        super().__init__(
+            estimator=estimator,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            refit=refit,
+            cv=cv,
+            verbose=verbose,
+            pre_dispatch=pre_dispatch,
+            error_score=error_score,
+            return_train_score=return_train_score,
+        )
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.batch_size = batch_size
+        self.patience = patience
+        self.tol = tol
+        self.random_state = random_state
+
+    def _run_search(self, evaluate_candidates):
+        candidates = list(
+            ParameterSampler(
+                self.param_distributions, self.n_iter, random_state=self.random_state
+            )
+        )
+        best_score = -np.inf
+        stale_rounds = 0
+        for start in range(0, len(candidates), self.batch_size):
+            results = evaluate_candidates(candidates[start:start + self.batch_size])
+            scores = np.asarray(results["mean_test_score"], dtype=float)
+            round_best = np.nanmax(scores) if np.isfinite(scores).any() else -np.inf
+            if round_best > best_score + self.tol:
+                best_score = round_best
+                stale_rounds = 0
+            else:
+                stale_rounds += 1
+            if stale_rounds >= self.patience:
+                break
+
+
+def build_search(
+    pipeline,
+    strategy: str = "random",
+    n_iter: int = 50,
+    cv: int = 5,
+    n_jobs: int = -1,
+    random_state: int = 522,
+    tune_solver: bool = False,
+):
+    """
+    Create the hyperparameter search for the logistic regression Pipeline.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        Pipeline to tune.
+    strategy : str, optional
+        "random" (`RandomizedSearchCV`, the original behaviour),
+        "halving" (`HalvingRandomSearchCV`: many candidates on small data
+        subsets, only the best promoted to more data) or "early-stop"
+        (`EarlyStoppingRandomSearchCV`) or "path" (`RegularizationPathSearchCV`,
+        warm-started fits along sorted C values). By default "random".
+    n_iter : int, optional
+        Number of candidates sampled, by default 50.
+    cv : int, optional
+        Number of cross-validation folds, by default 5.
+    n_jobs : int, optional
+        Parallel workers for candidate/fold fits, by default -1 (all cores).
+    random_state : int, optional
+        Seed for candidate sampling, by default 522.
+    tune_solver : bool, optional
+        Also tune solver and penalty, by default False.
+
+    Returns
+    -------
+    sklearn search estimator
+        Unfitted search object.
+    """
+    params = make_param_distributions(tune_solver)
+
+    if strategy == "random":
+        return RandomizedSearchCV(
+            pipeline, params, n_iter=n_iter, cv=cv, n_jobs=n_jobs, random_state=random_state
+        )
+    if strategy == "halving":
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingRandomSearchCV
+
+        return HalvingRandomSearchCV(
+            pipeline,
+            params,
+            n_candidates=n_iter,
+            factor=3,
+            cv=cv,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+    if strategy == "early-stop":
+        return EarlyStoppingRandomSearchCV(
+            pipeline, params, n_iter=n_iter, cv=cv, n_jobs=n_jobs, random_state=random_state
+        )
+    if strategy == "path":
+        if tune_solver:
+            raise ValueError("The 'path' strategy only tunes C; it cannot tune the solver.")
+        return RegularizationPathSearchCV(
+            pipeline, params, n_iter=n_iter, cv=cv, n_jobs=n_jobs, random_state=random_state
+        )
+    raise ValueError(
+        f"Unknown search strategy '{strategy}'; expected one of {SEARCH_STRATEGIES}."
+    )
+
+
+def _scale_fold(preprocessor, X, y, train, test):
+    """Scaled train/test matrices and targets of one CV fold."""
+    from sklearn.base import clone
+
+    X_train, X_test = X.iloc[train], X.iloc[test]
+    scaler = clone(preprocessor).fit(X_train)
+    return (
+        scaler.transform(X_train), scaler.transform(X_test), y.iloc[train], y.iloc[test]
+    )
+
+
+def _fit_fold_path(preprocessor, classifier, X, y, train, test, C_order, C_values):
+    """Fit one CV fold along the C path, scaling the fold only once."""
+    from sklearn.base import clone
+
+    Z_train, Z_test, y_train, y_test = _scale_fold(preprocessor, X, y, train, test)
+
+    clf = clone(classifier).set_params(warm_start=True)
+    n = len(C_values)
+    scores, fit_times, score_times, n_iters = (np.empty(n) for _ in range(4))
+    for i in C_order:
+        clf.set_params(C=C_values[i])
+        start = time.perf_counter()
+        clf.fit(Z_train, y_train)
+        iterations = np.max(clf.n_iter_)
+        if iterations >= clf.max_iter:
+            # Unconverged coefficients depend on where the fit started; refit
+            # cold so the score matches an independent fit, and continue the
+            # path from there
+            clf = clone(classifier).set_params(C=C_values[i]).fit(Z_train, y_train)
+            clf.set_params(warm_start=True)
+            iterations += np.max(clf.n_iter_)
+        fit_times[i] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores[i] = clf.score(Z_test, y_test)
+        score_times[i] = time.perf_counter() - start
+        n_iters[i] = iterations
+    return scores, fit_times, score_times, n_iters
+
+
+def _fit_fold_cold(preprocessor, classifier, X, y, train, test, C_values):
+    """Score one CV fold with an independent (cold) fit per C value."""
+    from sklearn.base import clone
+
+    Z_train, Z_test, y_train, y_test = _scale_fold(preprocessor, X, y, train, test)
+
+    n = len(C_values)
+    scores, fit_times, n_iters = (np.empty(n) for _ in range(3))
+    for i, C in enumerate(C_values):
+        start = time.perf_counter()
+        clf = clone(classifier).set_params(C=C).fit(Z_train, y_train)
+        fit_times[i] = time.perf_counter() - start
+        scores[i] = clf.score(Z_test, y_test)
+        n_iters[i] = np.max(clf.n_iter_)
+    return scores, fit_times, n_iters
+
+
+class RegularizationPathSearchCV:
+    """
+    Tune `classifier__C` by fitting a warm-started regularization path per fold.
+
+    Samples the same C candidates as `RandomizedSearchCV` with the same
+    `random_state`, but instead of fitting the whole Pipeline independently
+    for every (candidate, fold) pair, each fold is scaled once and the C
+    values are visited in increasing order, each fit starting from the
+    previous coefficients, with the classifier's own solver settings.
+    `cv_results_` has the same columns as `RandomizedSearchCV`, and the
+    best estimator is refit on all data.
+
+    lbfgs stops once the gradient is below the classifier's `tol`, and at
+    large C a warm-started fit can pass that test at once, still at the
+    previous C's optimum. The path scores are therefore only used to find
+    the best candidates: the `refine_top` best are re-solved cold at the
+    tight `tol`, and this repeats until the best candidates are all
+    re-solved ones. The best estimator is refit with the same tight solver
+    settings, so it is the model its score was measured on. A path fit
+    that reaches `max_iter` is redone from scratch.
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        Pipeline with a `preprocessor` step and a LogisticRegression
+        `classifier` step.
+    param_distributions : dict
+        Must contain only `classifier__C`.
+    n_iter : int, optional
+        Number of C values sampled, by default 50.
+    cv : int or cross-validation generator, optional
+        As for `RandomizedSearchCV`, by default 5.
+    n_jobs : int, optional
+        Folds fitted in parallel, by default None.
+    random_state : int, optional
+        Seed for candidate sampling.
+    refine_top : int, optional
+        Number of best candidates re-solved cold, by default 3.
+    tol : float, optional
+        Solver tolerance of the re-solved candidates and of the refit (the
+        classifier's own if tighter), by default 1e-8.
+    max_iter : int, optional
+        Solver iteration limit of the re-solved candidates and of the refit
+        (the classifier's own if higher), by default 10,000.
+    """
+
+    def __init__(
+        self,
+        estimator,
+        param_distributions,
+        n_iter=50,
+        cv=5,
+        n_jobs=None,
+        random_state=None,
+        refine_top=3,
+        tol=1e-8,
+        max_iter=10_000,
+    ):
+        if set(param_distributions) != {"classifier__C"}:
+            raise ValueError("The regularization path only tunes 'classifier__C'.")
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.refine_top = refine_top
+        self.tol = tol
+        self.max_iter = max_iter
+
+    def fit(self, X, y):
+        """Run the path search and refit the best Pipeline on `X`, `y`."""
+        from joblib import Parallel, delayed
+        from scipy.stats import rankdata
+        from sklearn.base import clone, is_classifier
+        from sklearn.model_selection import check_cv
+
+        candidates = list(
+            ParameterSampler(
+                self.param_distributions, self.n_iter, random_state=self.random_state
+            )
+        )
+        C_values = np.array([params["classifier__C"] for params in candidates], dtype=float)
+        C_order = np.argsort(C_values, kind="stable")
+
+        cv = check_cv(self.cv, y, classifier=is_classifier(self.estimator))
+        splits = list(cv.split(X, y))
+        preprocessor = self.estimator.named_steps["preprocessor"]
+        classifier = self.estimator.named_steps["classifier"]
+        folds = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_fold_path)(preprocessor, classifier, X, y, train, test, C_order, C_values)
+            for train, test in splits
+        )
+        scores, fit_times, score_times, n_iters = (
+            np.vstack([fold[k] for fold in folds]) for k in range(4)
+        )
+
+        # Re-solve the best candidates cold at the tight tolerance until the
+        # top `refine_top` are all re-solved; the best one always is
+        tight = clone(classifier).set_params(
+            tol=min(classifier.tol, self.tol), max_iter=max(classifier.max_iter, self.max_iter)
+        )
+        refined = np.zeros(len(candidates), dtype=bool)
+        while True:
+            top = np.argsort(-scores.mean(axis=0), kind="stable")[:self.refine_top]
+            todo = top[~refined[top]]
+            if not len(todo):
+                break
+            cold = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_fold_cold)(preprocessor, tight, X, y, train, test, C_values[todo])
+                for train, test in splits
+            )
+            scores[:, todo] = np.vstack([fold[0] for fold in cold])
+            fit_times[:, todo] += np.vstack([fold[1] for fold in cold])
+            n_iters[:, todo] += np.vstack([fold[2] for fold in cold])
+            refined[todo] = True
+
+        mean_scores = scores.mean(axis=0)
+        results = {
+            "mean_fit_time": fit_times.mean(axis=0),
+            "std_fit_time": fit_times.std(axis=0),
+            "mean_score_time": score_times.mean(axis=0),
+            "std_score_time": score_times.std(axis=0),
+            "param_classifier__C": C_values,
+            "params": candidates,
+        }
+        for k, fold_scores in enumerate(scores):
+            results[f"split{k}_test_score"] = fold_scores
+        results["mean_test_score"] = mean_scores
+        results["std_test_score"] = scores.std(axis=0)
+        results["rank_test_score"] = rankdata(-mean_scores, method="min").astype(np.int32)
+        self.cv_results_ = results
+        self.refined_ = refined
+        self.n_solver_iterations_ = int(n_iters.sum())
+
+        self.best_index_ = int(results["rank_test_score"].argmin())
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(mean_scores[self.best_index_])
+        self.best_estimator_ = clone(self.estimator).set_params(
+            **self.best_params_,
+            classifier__tol=tight.tol,
+            classifier__max_iter=tight.max_iter,
+        ).fit(X, y)
+        return self
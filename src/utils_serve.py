@@ -0,0 +1,317 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+
+class LatencyTracker:
+    """
+    Keep the most recent request latencies and report percentiles.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of most recent latencies kept, by default 10_000.
+    """
+
+    def __init__(self, window: int = 10_000):
+        self._latencies = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        """Record one request latency in seconds."""
+        self._latencies.append(seconds)
+        self.count += 1
+
+    def summary(self) -> dict:
+        """
+        Return request count and p50/p99/max latency in milliseconds.
+
+        Percentiles are computed over the recent window; they are None
+        until the first request has been recorded.
+        """
+        if not self._latencies:
+            return {"requests": self.count, "p50_ms": None, "p99_ms": None, "max_ms": None}
+
+        ms = np.fromiter(self._latencies, dtype=float) * 1000.0
+        p50, p99 = np.percentile(ms, [50, 99])
+        return {
+            "requests": self.count,
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+            "max_ms": float(ms.max()),
+        }
+
+
+class MicroBatcher:
+    """
+    Merge concurrent single-row scoring requests into micro-batches.
+
+    Callers `await submit(row)`; a background task collects queued rows
+    until either `max_batch_size` rows are waiting or `max_wait_ms` has
+    passed since the first row of the batch arrived, then scores the whole
+    batch with one call to `predict_fn` and hands each caller its row.
+
+    Parameters
+    ----------
+    predict_fn : callable
+        Function mapping an (n_rows, n_features) float array to an
+        (n_rows, n_classes) probability array, e.g. a wrapped `predict_proba`.
+    max_batch_size : int, optional
+        Maximum rows scored per `predict_fn` call, by default 64.
+    max_wait_ms : float, optional
+        Longest time the first row of a batch waits for more rows,
+        by default 2.0.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative.")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.latency = LatencyTracker()
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._worker = None
+
+    async def start(self) -> None:
+        """Start the background batching task on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background batching task."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, row) -> np.ndarray:
+        """
+        Queue one row for scoring and wait for its probability vector.
+
+        Parameters
+        ----------
+        row : array-like of shape (n_features,)
+            Feature values in the order expected by `predict_fn`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Probabilities for this row, shape (n_classes,).
+        """
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher.start() must be awaited before submit().")
+
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((np.asarray(row, dtype=float), future))
+        try:
+            return await future
+        finally:
+            self.latency.record(time.perf_counter() - start)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                # Drain whatever is already queued before waiting on the clock
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            rows = np.vstack([row for row, _ in batch])
+            try:
+                proba = self.predict_fn(rows)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(proba[i])
+
+    def stats(self) -> dict:
+        """Return latency percentiles plus batch counters."""
+        stats = self.latency.summary()
+        stats["batches"] = self.batches
+        stats["mean_batch_size"] = self.rows / self.batches if self.batches else None
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000.0
+        return stats
+
+
+def make_predict_fn(model) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Wrap a fitted Pipeline so it can score a plain NumPy matrix.
+
+    The Pipeline from src/model.py selects its columns by name, so the
+    matrix is wrapped in a DataFrame with the training feature names
+    before the single `predict_proba` call. A `LinearScorer` takes the
+    matrix directly.
+    """
+    from utils_fastpath import LinearScorer
+
+    if isinstance(model, LinearScorer):
+        return model.predict_proba
+
+    import pandas as pd
+
+    features = list(model.feature_names_in_)
+
+    def predict_fn(rows: np.ndarray) -> np.ndarray:
+        return model.predict_proba(pd.DataFrame(rows, columns=features))
+
+    return predict_fn
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """
+    Read one HTTP/1.1 request; None at end of stream.
+
+    Raises ValueError for a malformed request line or Content-Length.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    parts = request_line.decode("latin-1").split(" ", 2)
+    if len(parts) != 3:
+        raise ValueError(f"Malformed request line: {request_line[:100]!r}")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ValueError(f"Invalid Content-Length: {headers['content-length']!r}") from None
+    if length < 0:
+        raise ValueError(f"Invalid Content-Length: {length}")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _write_response(writer: asyncio.StreamWriter, status: str, payload: dict, keep_alive: bool):
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+
+
+def make_handler(batcher: MicroBatcher, features: list, classes: list):
+    """
+    Build an asyncio connection handler serving the scoring endpoints.
+
+    Endpoints
+    ---------
+    POST /predict
+        JSON object with one value per feature; returns the predicted
+        species and per-class probabilities.
+    GET /metrics
+        Latency percentiles and batching counters from `batcher`.
+
+    Malformed requests and invalid input get a 400 response (closing the
+    connection when the request itself cannot be parsed), and a failure
+    while scoring gets a 500; neither stops the server.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    # The rest of the stream cannot be framed, so close it
+                    _write_response(writer, "400 Bad Request", {"error": str(e)}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                if method == "POST" and path == "/predict":
+                    try:
+                        record = json.loads(body)
+                        row = [float(record[name]) for name in features]
+                        if not np.isfinite(row).all():
+                            # Rejected here so one request cannot fail its whole batch
+                            raise ValueError("feature values must be finite")
+                    except (ValueError, KeyError, TypeError) as e:
+                        _write_response(
+                            writer, "400 Bad Request", {"error": f"Invalid input: {e}"}, keep_alive
+                        )
+                    else:
+                        try:
+                            proba = await batcher.submit(row)
+                        except Exception as e:
+                            _write_response(
+                                writer,
+                                "500 Internal Server Error",
+                                {"error": f"Scoring failed: {e}"},
+                                keep_alive,
+                            )
+                        else:
+                            _write_response(
+                                writer,
+                                "200 OK",
+                                {
+                                    "species": classes[int(np.argmax(proba))],
+                                    "probabilities": dict(zip(classes, proba.tolist())),
+                                },
+                                keep_alive,
+                            )
+                elif method == "GET" and path == "/metrics":
+                    _write_response(writer, "200 OK", batcher.stats(), keep_alive)
+                else:
+                    _write_response(writer, "404 Not Found", {"error": "Not found"}, keep_alive)
+
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
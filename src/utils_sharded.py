@@ -0,0 +1,258 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+
+from utils_io import FEATURE_COLS, TARGET_COL
+
+
+def shard_moments(path: str, features: List[str] = FEATURE_COLS, target_col: str = TARGET_COL,
+                  chunksize: int = 1_000_000) -> dict:
+    """
+    Mergeable scaler statistics of one data shard.
+
+    The shard is read in chunks of at most `chunksize` rows, so only one
+    chunk is in memory at a time.
+
+    Returns
+    -------
+    dict
+        'n' rows, per-feature 'mean' and 'm2' (sum of squared deviations
+        from the mean) and per-class row counts 'class_counts'.
+    """
+    from utils_io import iter_chunks
+
+    moments = {"n": 0, "mean": np.zeros(len(features)), "m2": np.zeros(len(features)), "class_counts": {}}
+    for chunk in iter_chunks(path, chunksize):
+        X = chunk[features].to_numpy(dtype=np.float64)
+        mean = X.mean(axis=0)
+        counts = chunk[target_col].astype(str).value_counts()
+        moments = merge_moments(moments, {
+            "n": len(X),
+            "mean": mean,
+            "m2": ((X - mean) ** 2).sum(axis=0),
+            "class_counts": {str(k): int(v) for k, v in counts.items()},
+        })
+    return moments
+
+
+def merge_moments(a: dict, b: dict) -> dict:
+    """
+    Combine the statistics of two disjoint row sets (Chan et al.'s pairwise update).
+
+    Parameters
+    ----------
+    a, b : dict
+        Outputs of `shard_moments` or of earlier merges.
+
+    Returns
+    -------
+    dict
+        Statistics of the union, as if computed in one pass.
+    """
+    n = a["n"] + b["n"]
+    if n == 0:
+        return {**a, "class_counts": dict(a["class_counts"])}
+    delta = b["mean"] - a["mean"]
+    class_counts = dict(a["class_counts"])
+    for label, count in b["class_counts"].items():
+        class_counts[label] = class_counts.get(label, 0) + count
+    return {
+        "n": n,
+        "mean": a["mean"] + delta * b["n"] / n,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * a["n"] * b["n"] / n,
+        "class_counts": class_counts,
+    }
+
+
+def moments_scale(moments: dict) -> np.ndarray:
+    """Standard deviations of merged moments, with constant features scaled by 1 (as StandardScaler)."""
+    scale = np.sqrt(moments["m2"] / moments["n"])
+    scale[scale == 0] = 1.0
+    return scale
+
+
+def fit_shard(path: str, features: List[str], target_col: str, mean: np.ndarray,
+              scale: np.ndarray, classes: List[str], C: float, n_total: int,
+              max_iter: int = 1000) -> dict:
+    """
+    Fit a logistic regression on one shard, standardized with the global statistics.
+
+    The shard's objective is its share of the full-data objective: the data
+    term is scaled by `n_total / n_shard` (through `C`) so the L2 penalty
+    weighs the same as in a single fit on all rows, and the weighted
+    average of the shard solutions approximates that fit.
+
+    Returns
+    -------
+    dict
+        'n' rows, 'coef' and 'intercept' in `classes` order, 'fit_seconds'
+        and 'n_iter'.
+
+    Raises
+    ------
+    ValueError
+        If the shard does not contain every class.
+    """
+    from sklearn.linear_model import LogisticRegression
+    from utils_io import read_iris
+
+    df = read_iris(path)
+    X = (df[features].to_numpy(dtype=np.float64) - mean) / scale
+    y = df[target_col].astype(str).to_numpy()
+    present = sorted(set(y))
+    if present != list(classes):
+        raise ValueError(
+            f"Shard {path} has classes {present} but the data has {list(classes)}; "
+            "every shard needs every class, use larger or shuffled shards."
+        )
+
+    start = time.perf_counter()
+    clf = LogisticRegression(C=C * n_total / len(y), max_iter=max_iter).fit(X, y)
+    return {
+        "n": len(y),
+        "coef": clf.coef_,
+        "intercept": clf.intercept_,
+        "fit_seconds": time.perf_counter() - start,
+        "n_iter": int(np.max(clf.n_iter_)),
+    }
+
+
+def assemble_pipeline(features: List[str], classes: List[str], moments: dict,
+                      coef: np.ndarray, intercept: np.ndarray, C: float = 1.0):
+    """
+    Build the fitted `build_pipeline` Pipeline from merged statistics and averaged weights.
+
+    The result is interchangeable with a Pipeline fitted by `model.py`:
+    it can be pickled, exported with `export_linear_weights` and saved
+    with `save_artifact`.
+
+    Parameters
+    ----------
+    features : list of str
+        Feature columns.
+    classes : list of str
+        Class labels, in `coef` row order.
+    moments : dict
+        Merged `shard_moments` of all training rows.
+    coef, intercept : numpy.ndarray
+        Logistic regression weights on the standardized features.
+    C : float, optional
+        Regularization strength recorded on the classifier, by default 1.0.
+    """
+    import pandas as pd
+    from utils_model import build_pipeline
+
+    # Fit on one row per class to get fitted ColumnTransformer and
+    # LogisticRegression objects, then replace their learned attributes
+    # with the merged statistics and averaged weights
+    stub = pd.DataFrame(np.tile(moments["mean"], (len(classes), 1)), columns=features)
+    pipeline = build_pipeline(features).set_params(classifier__C=C)
+    pipeline.fit(stub, np.asarray(classes))
+
+    scaler = pipeline.named_steps["preprocessor"].named_transformers_["standardscaler"]
+    scaler.mean_ = moments["mean"]
+    scaler.var_ = moments["m2"] / moments["n"]
+    scaler.scale_ = moments_scale(moments)
+    scaler.n_samples_seen_ = moments["n"]
+
+    classifier = pipeline.named_steps["classifier"]
+    classifier.coef_ = np.asarray(coef, dtype=np.float64)
+    classifier.intercept_ = np.asarray(intercept, dtype=np.float64)
+    classifier.classes_ = np.asarray(classes, dtype=object)
+    return pipeline
+
+
+def train_sharded(
+    paths: List[str],
+    features: List[str] = FEATURE_COLS,
+    target_col: str = TARGET_COL,
+    C: float = 1.0,
+    max_iter: int = 1000,
+    n_jobs: int = -1,
+    chunksize: int = 1_000_000,
+):
+    """
+    Train the scaling + logistic regression Pipeline across data shards.
+
+    Two passes run over the shards in worker processes. The first computes
+    per-shard feature moments, which are merged into the global
+    StandardScaler statistics. The second fits a logistic regression on
+    each standardized shard; the shard weights are averaged, weighted by
+    row count (one-shot parameter averaging). No process holds more than
+    one shard.
+
+    Parameters
+    ----------
+    paths : list of str
+        Shard files (CSV, Parquet or Arrow IPC), e.g. `shard_paths(dir)`.
+    features : list of str, optional
+        Feature columns, by default the Iris measurements.
+    target_col : str, optional
+        Label column, by default "species".
+    C : float, optional
+        Inverse regularization strength of the full-data objective, by default 1.0.
+    max_iter : int, optional
+        Solver iterations per shard, by default 1000.
+    n_jobs : int, optional
+        Worker processes; -1 uses all cores, 1 runs in this process.
+    chunksize : int, optional
+        Rows per chunk in the statistics pass, by default 1,000,000.
+
+    Returns
+    -------
+    pipeline : sklearn.pipeline.Pipeline
+        Fitted Pipeline with `preprocessor` and `classifier` steps.
+    info : dict
+        'n_shards', 'n_rows', 'classes', 'workers' (processes used; 1 runs
+        the shards one after another), 'stats_seconds', 'fit_seconds' (wall
+        time of each pass) and the per-shard 'shards' results.
+    """
+    if not paths:
+        raise ValueError("No shards to train on.")
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    workers = min(workers, len(paths))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    run = pool.map if pool else map
+    try:
+        start = time.perf_counter()
+        moments = {"n": 0, "mean": np.zeros(len(features)), "m2": np.zeros(len(features)), "class_counts": {}}
+        for shard in run(shard_moments, paths, [features] * len(paths),
+                         [target_col] * len(paths), [chunksize] * len(paths)):
+            moments = merge_moments(moments, shard)
+        stats_seconds = time.perf_counter() - start
+
+        classes = sorted(moments["class_counts"])
+        scale = moments_scale(moments)
+
+        start = time.perf_counter()
+        n = len(paths)
+        shards = list(run(
+            fit_shard, paths, [features] * n, [target_col] * n, [moments["mean"]] * n,
+            [scale] * n, [classes] * n, [C] * n, [moments["n"]] * n, [max_iter] * n,
+        ))
+        fit_seconds = time.perf_counter() - start
+    finally:
+        if pool:
+            pool.shutdown()
+
+    weights = np.array([shard["n"] for shard in shards], dtype=np.float64) / moments["n"]
+    coef = sum(w * shard["coef"] for w, shard in zip(weights, shards))
+    intercept = sum(w * shard["intercept"] for w, shard in zip(weights, shards))
+    pipeline = assemble_pipeline(features, classes, moments, coef, intercept, C=C)
+
+    info = {
+        "n_shards": len(paths),
+        "n_rows": moments["n"],
+        "classes": classes,
+        "workers": workers,
+        "stats_seconds": stats_seconds,
+        "fit_seconds": fit_seconds,
+        "shards": [
+            {"path": path, "n": shard["n"], "fit_seconds": shard["fit_seconds"], "n_iter": shard["n_iter"]}
+            for path, shard in zip(paths, shards)
+        ],
+    }
+    return pipeline, info
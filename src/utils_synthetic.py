@@ -0,0 +1,369 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLS = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+
+# Label given to rows injected with an unknown species
+UNKNOWN_SPECIES = "unknown"
+
+SHARD_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def fit_class_gaussians(df: pd.DataFrame, target_col: str = "species") -> dict:
+    """
+    Fit one multivariate Gaussian per species to the Iris measurements.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Iris data, e.g. data/raw/iris.csv.
+    target_col : str, optional
+        Name of the species column, by default "species".
+
+    Returns
+    -------
+    dict
+        Mapping of species to a dict with 'mean' (n_features,),
+        'cov' (n_features, n_features) and 'weight' (class proportion).
+    """
+    if target_col not in df.columns:
+        raise KeyError(f"Target column '{target_col}' not found in DataFrame.")
+
+    n = len(df)
+    params = {}
+    for species, group in df.groupby(target_col, sort=True):
+        X = group[FEATURE_COLS].to_numpy(dtype=float)
+        params[species] = {
+            "mean": X.mean(axis=0),
+            "cov": np.cov(X, rowvar=False),
+            "weight": len(X) / n,
+        }
+    return params
+
+
+def fit_class_kde(
+    df: pd.DataFrame, target_col: str = "species", bandwidth: Optional[float] = None
+) -> dict:
+    """
+    Fit one Gaussian kernel density estimate per species.
+
+    Samples are a random observed row of the species plus Gaussian noise
+    whose covariance is the species covariance scaled by `bandwidth**2`,
+    so non-Gaussian shapes in the real data (e.g. skew) are kept.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Iris data, e.g. data/raw/iris.csv.
+    target_col : str, optional
+        Name of the species column, by default "species".
+    bandwidth : float, optional
+        Kernel bandwidth factor; Scott's rule, n ** (-1 / (d + 4)), by default.
+
+    Returns
+    -------
+    dict
+        As `fit_class_gaussians`, plus 'points' (the observed rows) and
+        'data_cov' (the species covariance); 'cov' is the kernel covariance.
+    """
+    params = fit_class_gaussians(df, target_col)
+    for species, group in df.groupby(target_col, sort=True):
+        X = group[FEATURE_COLS].to_numpy(dtype=float)
+        factor = bandwidth if bandwidth is not None else len(X) ** (-1 / (X.shape[1] + 4))
+        params[species]["points"] = X
+        params[species]["data_cov"] = params[species]["cov"]
+        params[species]["cov"] = params[species]["cov"] * factor ** 2
+    return params
+
+
+def sample_iris(
+    params: dict, n_rows: int, random_state: int = 522, min_value: float = 0.1
+) -> pd.DataFrame:
+    """
+    Draw a synthetic Iris-shaped dataset from class-conditional Gaussians.
+
+    Species counts follow the class weights (multinomially), and each row
+    is sampled from its species' Gaussian. Measurements are clipped at
+    `min_value` so that they stay positive, as the schema requires.
+
+    Parameters
+    ----------
+    params : dict
+        Output of `fit_class_gaussians` or `fit_class_kde`.
+    n_rows : int
+        Number of rows to generate.
+    random_state : int, optional
+        Seed for reproducibility, by default 522.
+    min_value : float, optional
+        Lower bound applied to every measurement, by default 0.1.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns sepal_length, sepal_width, petal_length, petal_width, species.
+    """
+    if n_rows < 0:
+        raise ValueError("n_rows must be non-negative.")
+
+    rng = np.random.default_rng(random_state)
+    species = list(params)
+    weights = np.array([params[s]["weight"] for s in species])
+    counts = rng.multinomial(n_rows, weights / weights.sum())
+
+    X = np.empty((n_rows, len(FEATURE_COLS)))
+    labels = np.empty(n_rows, dtype=object)
+    start = 0
+    for name, count in zip(species, counts):
+        p = params[name]
+        if "points" in p:
+            centers = p["points"][rng.integers(len(p["points"]), size=count)]
+            X[start:start + count] = centers + rng.multivariate_normal(
+                np.zeros(len(FEATURE_COLS)), p["cov"], size=count
+            )
+        else:
+            X[start:start + count] = rng.multivariate_normal(p["mean"], p["cov"], size=count)
+        labels[start:start + count] = name
+        start += count
+
+    # Shuffle so species are interleaved, as in real measurement files
+    order = rng.permutation(n_rows)
+    df = pd.DataFrame(np.maximum(X[order], min_value), columns=FEATURE_COLS)
+    df["species"] = labels[order]
+    return df
+
+
+def _feature_moments(params: dict):
+    """
+    Mean and standard deviation of each feature over the species mixture.
+
+    For KDE params a species' variance is that of its data plus that of
+    the kernel, which is the spread `sample_iris` actually draws from.
+    """
+    weights = np.array([p["weight"] for p in params.values()])
+    weights = weights / weights.sum()
+    means = np.array([p["mean"] for p in params.values()])
+    variances = np.array([
+        np.diag(p["cov"]) + (np.diag(p["data_cov"]) if "data_cov" in p else 0.0)
+        for p in params.values()
+    ])
+    mean = weights @ means
+    second = weights @ (variances + means ** 2)
+    return mean, np.sqrt(second - mean ** 2)
+
+
+def clip_to_z(df: pd.DataFrame, params: dict, max_z: float) -> None:
+    """
+    Clip the measurements of `df` in place to within `max_z` standard
+    deviations of the feature means of the mixture `params` was fitted to
+    (and at 0.1 from below), so the validation's |z| > 4 check passes.
+    """
+    mean, std = _feature_moments(params)
+    df[FEATURE_COLS] = np.clip(
+        df[FEATURE_COLS].to_numpy(), np.maximum(mean - max_z * std, 0.1), mean + max_z * std
+    )
+
+
+def inject_anomalies(
+    df: pd.DataFrame,
+    params: dict,
+    duplicate_rate: float = 0.0,
+    outlier_rate: float = 0.0,
+    unknown_rate: float = 0.0,
+    random_state=522,
+) -> dict:
+    """
+    Corrupt a fraction of the rows of a synthetic dataset in place.
+
+    Each kind of corruption hits its own disjoint set of rows, so the
+    returned counts are exact:
+
+    - duplicates: a row is overwritten with a copy of another, clean row;
+    - outliers: one measurement is set 6 to 10 standard deviations above
+      the feature mean (the validation flags |z| > 4);
+    - unknown species: the label is set to `UNKNOWN_SPECIES`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Output of `sample_iris`; modified in place.
+    params : dict
+        The parameters `df` was sampled from.
+    duplicate_rate, outlier_rate, unknown_rate : float, optional
+        Fraction of rows to corrupt, by default 0.0. Duplicates also use
+        an equal number of clean source rows, so
+        `2 * duplicate_rate + outlier_rate + unknown_rate` must be at most 1.
+    random_state : int or numpy.random.SeedSequence, optional
+        Seed, by default 522.
+
+    Returns
+    -------
+    dict
+        Number of rows given each kind of corruption.
+    """
+    rates = [duplicate_rate, outlier_rate, unknown_rate]
+    if any(rate < 0 or rate > 1 for rate in rates):
+        raise ValueError("Injection rates must be between 0 and 1.")
+    if 2 * duplicate_rate + outlier_rate + unknown_rate > 1:
+        raise ValueError("Injection rates leave too few clean rows (2 * duplicate + outlier + unknown > 1).")
+
+    n = len(df)
+    rng = np.random.default_rng(random_state)
+    n_dup, n_out, n_unknown = (int(round(rate * n)) for rate in rates)
+    rows = rng.permutation(n)
+    dup_targets, dup_sources, outliers, unknown = np.split(
+        rows[:2 * n_dup + n_out + n_unknown],
+        np.cumsum([n_dup, n_dup, n_out]),
+    )
+
+    if n_dup:
+        for col in df.columns:
+            values = df[col].to_numpy(copy=True)
+            values[dup_targets] = values[dup_sources]
+            df[col] = values
+    if n_out:
+        mean, std = _feature_moments(params)
+        features = rng.integers(len(FEATURE_COLS), size=n_out)
+        values = mean[features] + rng.uniform(6, 10, size=n_out) * std[features]
+        X = df[FEATURE_COLS].to_numpy()
+        X[outliers, features] = values
+        df[FEATURE_COLS] = X
+    if n_unknown:
+        df.iloc[unknown, df.columns.get_loc("species")] = UNKNOWN_SPECIES
+
+    return {"duplicates": n_dup, "outliers": n_out, "unknown_species": n_unknown}
+
+
+def write_shard(
+    params: dict,
+    n_rows: int,
+    path: str,
+    seed,
+    rates: Optional[dict] = None,
+    max_z: Optional[float] = None,
+) -> dict:
+    """
+    Sample one shard, inject anomalies and write it with `utils_io.write_iris`.
+
+    With `max_z`, sampled measurements are first clipped to within `max_z`
+    standard deviations of the feature means, so that only injected
+    outliers trip the validation's |z| > 4 check.
+
+    Returns
+    -------
+    dict
+        Shard path, row count and injected anomaly counts.
+    """
+    from utils_io import data_format, write_iris
+
+    sample_seed, inject_seed = seed.spawn(2)
+    df = sample_iris(params, n_rows, random_state=sample_seed)
+    if max_z:
+        clip_to_z(df, params, max_z)
+    counts = inject_anomalies(df, params, random_state=inject_seed, **(rates or {}))
+    if data_format(path) == "csv":
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        # Arrow's CSV writer is about 10x faster than DataFrame.to_csv on
+        # full-precision floats; species names never need quoting
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pa_csv.write_csv(table, path, pa_csv.WriteOptions(quoting_style="none"))
+    else:
+        write_iris(df, path)
+    return {"path": path, "rows": n_rows, **counts}
+
+
+def generate_shards(
+    params: dict,
+    n_rows: int,
+    output_dir: str,
+    shard_rows: int = 1_000_000,
+    fmt: str = "csv",
+    n_jobs: int = -1,
+    random_state: int = 522,
+    duplicate_rate: float = 0.0,
+    outlier_rate: float = 0.0,
+    unknown_rate: float = 0.0,
+    max_z: Optional[float] = None,
+) -> dict:
+    """
+    Write an `n_rows` synthetic Iris dataset as shards, in parallel.
+
+    Shard `i` is named `part-<i>.<ext>` and seeded with the `i`-th child
+    of `numpy.random.SeedSequence(random_state)`, so the output depends
+    only on the arguments, not on `n_jobs`. A `manifest.json` records the
+    arguments and every shard's row and anomaly counts. Duplicates are
+    copied within a shard.
+
+    Parameters
+    ----------
+    params : dict
+        Output of `fit_class_gaussians` or `fit_class_kde`.
+    n_rows : int
+        Total rows.
+    output_dir : str
+        Directory for the shards and manifest.
+    shard_rows : int, optional
+        Rows per shard (the last one may be smaller), by default 1,000,000.
+        Bounds each worker's memory.
+    fmt : str, optional
+        "csv", "parquet" or "arrow", by default "csv".
+    n_jobs : int, optional
+        Worker processes; -1 uses all cores, 1 writes in this process.
+    random_state : int, optional
+        Root seed, by default 522.
+    duplicate_rate, outlier_rate, unknown_rate : float, optional
+        As for `inject_anomalies`.
+    max_z : float, optional
+        Clip sampled measurements to this many standard deviations from the
+        feature means (see `write_shard`); no clipping by default.
+
+    Returns
+    -------
+    dict
+        The manifest.
+    """
+    if n_rows < 0 or shard_rows < 1:
+        raise ValueError("n_rows must be non-negative and shard_rows positive.")
+    if fmt not in SHARD_EXTENSIONS:
+        raise ValueError(f"Unknown format '{fmt}'; expected one of {list(SHARD_EXTENSIONS)}.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    sizes = [min(shard_rows, n_rows - start) for start in range(0, n_rows, shard_rows)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    rates = {
+        "duplicate_rate": duplicate_rate,
+        "outlier_rate": outlier_rate,
+        "unknown_rate": unknown_rate,
+    }
+    tasks = [
+        (params, size, os.path.join(output_dir, f"part-{i:05d}{SHARD_EXTENSIONS[fmt]}"), seed, rates, max_z)
+        for i, (size, seed) in enumerate(zip(sizes, seeds))
+    ]
+
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    workers = min(workers, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(write_shard, *zip(*tasks)))
+    else:
+        shards = [write_shard(*task) for task in tasks]
+
+    manifest = {
+        "rows": n_rows,
+        "shard_rows": shard_rows,
+        "format": fmt,
+        "random_state": random_state,
+        "method": "kde" if any("points" in p for p in params.values()) else "gaussian",
+        "max_z": max_z,
+        **rates,
+        "shards": [{**shard, "path": os.path.basename(shard["path"])} for shard in shards],
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
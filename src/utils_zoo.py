@@ -0,0 +1,243 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+# Classifier names accepted by `run_zoo`, in `_zoo_factories` order; listed
+# here so the command line can offer them without importing scikit-learn
+ZOO_MODELS = (
+    "dummy",
+    "logreg",
+    "knn",
+    "svm_rbf",
+    "lda",
+    "random_forest",
+    "extra_trees",
+    "hist_gradient_boosting",
+)
+
+
+def _zoo_factories(random_state: int) -> dict:
+    from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+    from sklearn.dummy import DummyClassifier
+    from sklearn.ensemble import (
+        ExtraTreesClassifier,
+        HistGradientBoostingClassifier,
+        RandomForestClassifier,
+    )
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+
+    return {
+        "dummy": lambda: DummyClassifier(strategy="most_frequent"),
+        "logreg": lambda: LogisticRegression(max_iter=1000),
+        "knn": lambda: KNeighborsClassifier(n_neighbors=5),
+        "svm_rbf": lambda: SVC(kernel="rbf", random_state=random_state),
+        "lda": lambda: LinearDiscriminantAnalysis(),
+        "random_forest": lambda: RandomForestClassifier(n_estimators=200, random_state=random_state),
+        "extra_trees": lambda: ExtraTreesClassifier(n_estimators=200, random_state=random_state),
+        "hist_gradient_boosting": lambda: HistGradientBoostingClassifier(random_state=random_state),
+    }
+
+
+class SharedFolds:
+    """
+    Scaled CV fold matrices packed into one shared memory block.
+
+    For every fold a StandardScaler is fitted on the training rows once, and
+    the scaled train/test matrices and their label codes are written into a
+    single `multiprocessing.shared_memory` block. Workers attach to the
+    block by name and get zero-copy NumPy views, so tasks only pickle the
+    small `layout` description instead of the data.
+
+    Used as a context manager; the block is unlinked on exit.
+
+    Parameters
+    ----------
+    X : array-like
+        Feature matrix.
+    y : array-like
+        Labels.
+    cv : int, optional
+        Number of stratified folds, by default 5 (as in src/model.py).
+    folds : utils_folds.CVFolds, optional
+        Precomputed folds of these rows (e.g. from the fold cache); their
+        split indices and scaled matrices are copied instead of recomputed.
+    """
+
+    def __init__(self, X, y, cv: int = 5, folds=None):
+        import numpy as np
+        import pandas as pd
+        from sklearn.model_selection import check_cv
+        from sklearn.preprocessing import StandardScaler
+
+        X = np.asarray(X, dtype=float)
+        codes, self.classes = pd.factorize(pd.Series(np.asarray(y)), sort=True)
+
+        arrays = {}
+        splits = folds.splits if folds is not None else check_cv(cv, y, classifier=True).split(X, y)
+        for k, (train, test) in enumerate(splits):
+            if folds is not None:
+                arrays[f"X_train_{k}"], arrays[f"X_test_{k}"] = folds.scaled(k)
+            else:
+                scaler = StandardScaler().fit(X[train])
+                arrays[f"X_train_{k}"] = scaler.transform(X[train])
+                arrays[f"X_test_{k}"] = scaler.transform(X[test])
+            arrays[f"y_train_{k}"] = codes[train].astype(np.int64)
+            arrays[f"y_test_{k}"] = codes[test].astype(np.int64)
+        self.n_folds = k + 1
+
+        size = sum(a.nbytes for a in arrays.values())
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.layout = {"name": self._shm.name, "arrays": {}}
+        offset = 0
+        for key, array in arrays.items():
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset)
+            view[...] = array
+            self.layout["arrays"][key] = (offset, array.shape, array.dtype.str)
+            offset += array.nbytes
+
+    def __enter__(self) -> "SharedFolds":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._shm.close()
+        self._shm.unlink()
+        return False
+
+
+# Shared memory blocks already attached in this worker process, by name
+_ATTACHED = {}
+
+
+def attach_folds(layout: dict) -> dict:
+    """Zero-copy views of the fold arrays described by `SharedFolds.layout`."""
+    import numpy as np
+
+    name = layout["name"]
+    if name not in _ATTACHED:
+        shm = shared_memory.SharedMemory(name=name)
+        arrays = {
+            key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for key, (offset, shape, dtype) in layout["arrays"].items()
+        }
+        _ATTACHED.clear()
+        _ATTACHED[name] = (shm, arrays)
+    return _ATTACHED[name][1]
+
+
+def fit_fold(layout: dict, model: str, fold: int, random_state: int = 522) -> dict:
+    """
+    Fit one zoo model on one shared fold and time fit and prediction.
+
+    Returns
+    -------
+    dict
+        Model, fold, accuracy, fit seconds, batch predict seconds for the
+        fold's test rows, and the median seconds to predict a single row.
+    """
+    import numpy as np
+
+    arrays = attach_folds(layout)
+    X_train, y_train = arrays[f"X_train_{fold}"], arrays[f"y_train_{fold}"]
+    X_test, y_test = arrays[f"X_test_{fold}"], arrays[f"y_test_{fold}"]
+
+    estimator = _zoo_factories(random_state)[model]()
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pred = estimator.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    # Single-row latency is what an online scorer pays per request
+    single = []
+    for i in range(min(len(X_test), 20)):
+        start = time.perf_counter()
+        estimator.predict(X_test[i:i + 1])
+        single.append(time.perf_counter() - start)
+
+    return {
+        "model": model,
+        "fold": fold,
+        "accuracy": float((pred == y_test).mean()),
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "n_test": len(X_test),
+        "predict_1row_seconds": float(np.median(single)) if single else float("nan"),
+    }
+
+
+def run_zoo(
+    X,
+    y,
+    models: Optional[List[str]] = None,
+    cv: int = 5,
+    n_jobs: int = -1,
+    random_state: int = 522,
+    folds=None,
+):
+    """
+    Cross-validate several classifiers concurrently on shared, pre-scaled folds.
+
+    Parameters
+    ----------
+    X, y : array-like
+        Training features and labels.
+    models : list of str, optional
+        Names from `ZOO_MODELS`; all by default.
+    cv : int, optional
+        Number of stratified folds, by default 5.
+    n_jobs : int, optional
+        Worker processes; -1 uses all cores, 1 runs in this process.
+    random_state : int, optional
+        Seed for the stochastic models, by default 522.
+    folds : utils_folds.CVFolds, optional
+        Precomputed folds of `X`, `y` to reuse instead of `cv`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per model, sorted by mean accuracy: mean/std accuracy,
+        mean fit time (ms), mean batch predict time per row (us) and
+        median single-row predict latency (ms).
+    """
+    import pandas as pd
+
+    models = list(models or ZOO_MODELS)
+    unknown = set(models) - set(ZOO_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown zoo models {sorted(unknown)}; expected some of {ZOO_MODELS}.")
+
+    with SharedFolds(X, y, cv, folds=folds) as shared:
+        tasks = [(model, k) for model in models for k in range(shared.n_folds)]
+        workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        workers = min(workers, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(fit_fold, shared.layout, model, k, random_state)
+                    for model, k in tasks
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = [fit_fold(shared.layout, model, k, random_state) for model, k in tasks]
+            # Drop this process's views before the block is unlinked
+            _ATTACHED.pop(shared.layout["name"], None)
+
+    per_fold = pd.DataFrame(results)
+    per_fold["predict_us_per_row"] = per_fold["predict_seconds"] / per_fold["n_test"] * 1e6
+    table = per_fold.groupby("model", sort=False).agg(
+        mean_accuracy=("accuracy", "mean"),
+        std_accuracy=("accuracy", "std"),
+        fit_ms=("fit_seconds", lambda s: s.mean() * 1e3),
+        predict_us_per_row=("predict_us_per_row", "mean"),
+        predict_1row_ms=("predict_1row_seconds", lambda s: s.median() * 1e3),
+    )
+    return (
+        table.sort_values(["mean_accuracy", "fit_ms"], ascending=[False, True])
+        .reset_index()
+    )
@@ -0,0 +1,163 @@
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from data_validation_iris import (
+    IrisValidationState,
+    validate_iris_dataframe,
+    validate_iris_fast,
+    validate_iris_increment,
+)
+
+RAW_PATH = Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv"
+
+
+def _batches():
+    df = pd.read_csv(RAW_PATH).sample(frac=1, random_state=522).reset_index(drop=True)
+    b1, b2, b3 = df.iloc[:50].copy(), df.iloc[50:100].copy(), df.iloc[100:].copy()
+    # Duplicates within and across batches, and an unknown species
+    b2 = pd.concat([b2, b1.iloc[:3], b2.iloc[:2]], ignore_index=True)
+    b3.loc[len(df)] = [5.0, 3.0, 1.5, 0.3, "unknown"]
+    return [b1, b2, b3]
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_validate_iris_increment_matches_full_run(tmp_path):
+    """Test validate_iris_increment with normal and edge cases."""
+    batches = _batches()
+
+    # Normal case: chunks accumulate without final checks, the last one finalizes
+    state = IrisValidationState()
+    parts = [validate_iris_increment(b, state, finalize=False) for b in batches[:2]]
+    parts.append(validate_iris_increment(batches[2], state))
+    full = validate_iris_dataframe(pd.concat(batches, ignore_index=True))
+    incremental = pd.concat(parts, ignore_index=True)
+    assert len(incremental) == len(full)
+    pd.testing.assert_frame_equal(_sorted(incremental), _sorted(full))
+
+    # Normal case: a saved state still recognizes earlier rows as duplicates
+    state.save(tmp_path / "state.npz")
+    restored = IrisValidationState.load(tmp_path / "state.npz")
+    assert restored.stats.species_counts == state.stats.species_counts
+    assert validate_iris_increment(batches[0].iloc[:5], restored).empty
+
+    # Edge case: an outlier batch is rejected exactly like the full run, and
+    # the state is left unchanged
+    outlier = batches[0].iloc[:1].copy()
+    outlier["petal_length"] = 100.0
+    with pytest.raises(ValueError, match="Outlier"):
+        validate_iris_dataframe(pd.concat(batches + [outlier], ignore_index=True))
+    n_before = state.stats.n
+    with pytest.raises(ValueError, match="Outlier"):
+        validate_iris_increment(outlier, state)
+    assert state.stats.n == n_before
+
+
+def test_validate_iris_increment_verdicts_on_prefixes():
+    """Each prefix of the batches gets the same verdict as a full run."""
+    batches = _batches()
+    state = IrisValidationState()
+    for i, batch in enumerate(batches, start=1):
+        try:
+            validate_iris_dataframe(pd.concat(batches[:i], ignore_index=True))
+            expected = None
+        except ValueError as e:
+            expected = str(e)
+
+        try:
+            validate_iris_increment(batch, state)
+            actual = None
+        except ValueError as e:
+            actual = str(e)
+            # Accept the batch without final checks to build the next prefix
+            validate_iris_increment(batch, state, finalize=False)
+
+        assert actual == expected
+
+    # Edge case: schema violations are still caught per batch
+    bad = batches[0].iloc[:2].copy()
+    bad["sepal_width"] = -1.0
+    with pytest.raises(ValueError, match="schema"):
+        validate_iris_increment(bad, IrisValidationState())
+
+
+def _validation_cases():
+    df = pd.read_csv(RAW_PATH)
+    dup_unknown = pd.concat([df, df.iloc[:5]], ignore_index=True)
+    dup_unknown.loc[len(dup_unknown)] = [5.0, 3.0, 1.5, 0.3, "unknown"]
+    negative = df.copy()
+    negative.loc[3, "sepal_width"] = -1.0
+    outlier = df.copy()
+    outlier.loc[3, "petal_length"] = 100.0
+    extra_column = df.assign(extra=1)
+    columnar = df.astype({"species": "category", "sepal_length": "float32"})
+    return {
+        "raw": df,
+        "dup_unknown": dup_unknown,
+        "negative": negative,
+        "outlier": outlier,
+        "extra_column": extra_column,
+        "columnar": columnar,
+        "empty": df.iloc[:0],
+        "single_row": df.iloc[:1],
+    }
+
+
+@pytest.mark.parametrize("case", list(_validation_cases()))
+def test_validate_iris_fast_matches_reference(case, capsys):
+    """validate_iris_fast returns, raises and prints the same as the reference."""
+    df = _validation_cases()[case]
+
+    def run(validate):
+        try:
+            result, error = validate(df), None
+        except ValueError as e:
+            result, error = None, str(e)
+        return result, error, capsys.readouterr().out
+
+    expected, expected_error, expected_out = run(validate_iris_dataframe)
+    actual, actual_error, actual_out = run(validate_iris_fast)
+
+    assert actual_error == expected_error
+    assert actual_out == expected_out
+    if expected is None:
+        assert actual is None
+    else:
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_validate_iris_fast_type_error():
+    """Edge case: non-DataFrame input."""
+    with pytest.raises(TypeError):
+        validate_iris_fast([[5.1, 3.5, 1.4, 0.2, "setosa"]])
+
+
+def test_validate_iris_fast_keep_dtypes(capsys):
+    """validate_iris_fast with keep_dtypes keeps the compact dtypes and drops the same rows."""
+    cases = _validation_cases()
+    for case in ("raw", "dup_unknown"):
+        df = cases[case]
+        compact = df.astype({col: "float32" for col in df.columns[:4]}).astype({"species": "category"})
+        expected = validate_iris_fast(df)
+        actual = validate_iris_fast(compact, keep_dtypes=True)
+        capsys.readouterr()
+
+        assert (actual.dtypes.iloc[:4] == "float32").all()
+        assert set(actual["species"].cat.categories) == set(expected["species"])
+        pd.testing.assert_frame_equal(
+            actual.astype({col: "float64" for col in df.columns[:4]}).astype({"species": object}).reset_index(drop=True),
+            expected.astype({col: "float64" for col in df.columns[:4]}).reset_index(drop=True),
+            check_exact=False,
+            rtol=1e-6,
+        )
+
+    # Edge case: when no row is dropped the input frame itself is returned
+    clean = validate_iris_fast(cases["raw"]).astype({"species": "category"})
+    assert validate_iris_fast(clean, keep_dtypes=True) is clean
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from process import main, process_in_chunks
+
+RAW_PATH = Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv"
+
+
+def run_process(*args):
+    """Run process.py's command line and return the click result."""
+    return CliRunner().invoke(main, list(args), catch_exceptions=False)
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 40, 1000])
+def test_chunked_output_matches_in_memory(tmp_path, chunksize):
+    """Test --chunksize against the in-memory path, across chunk boundaries."""
+    df = pd.read_csv(RAW_PATH)
+    # Duplicates (also across chunks) and an unknown species
+    dirty = pd.concat(
+        [df, df.iloc[[3, 3, 120]], df.iloc[[0]].assign(species="unknown")], ignore_index=True
+    )
+    raw = tmp_path / "raw.csv"
+    dirty.to_csv(raw, index=False)
+
+    in_memory, chunked = tmp_path / "in_memory.csv", tmp_path / "chunked.csv"
+    run_process("--input", str(raw), "--output", str(in_memory))
+    run_process("--input", str(raw), "--output", str(chunked), "--chunksize", str(chunksize))
+
+    assert chunked.read_bytes() == in_memory.read_bytes()
+    assert len(pd.read_csv(chunked)) == len(df.drop_duplicates())
+
+
+def test_chunked_failure_leaves_no_output(tmp_path):
+    """Edge case: a failing dataset-wide check removes the partial file."""
+    df = pd.read_csv(RAW_PATH)
+    # Passes every per-chunk check, but breaks the species distribution
+    skewed = pd.concat([df, df.assign(sepal_width=df["sepal_width"] + 0.05)], ignore_index=True)
+    raw = tmp_path / "raw.csv"
+    skewed.to_csv(raw, index=False)
+    output = tmp_path / "clean.csv"
+
+    with pytest.raises(ValueError, match="Species distribution"):
+        process_in_chunks(str(raw), str(output), chunksize=50)
+
+    assert not output.exists()
+    assert not Path(str(output) + ".partial").exists()
+
+
+def test_chunked_header_only_input(tmp_path):
+    """Edge case: a header-only input gives a header-only output."""
+    raw = tmp_path / "raw.csv"
+    raw.write_text(RAW_PATH.read_text().splitlines()[0] + "\n")
+    output = tmp_path / "clean.csv"
+
+    process_in_chunks(str(raw), str(output), chunksize=10)
+
+    assert output.read_text() == raw.read_text()
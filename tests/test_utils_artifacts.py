@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_artifacts import ARTIFACT_PATHS, PipelineArtifacts
+
+
+def test_pipeline_artifacts():
+    """Test PipelineArtifacts on the committed pipeline outputs."""
+    artifacts = PipelineArtifacts()
+    assert artifacts.missing() == []
+
+    # Normal case: data, CV results and the model summary match each other
+    df = artifacts.processed_data()
+    assert "species" in df.columns
+    results = artifacts.cv_results(top=10)
+    assert len(results) == 10
+    assert results["mean_test_score"].is_monotonic_decreasing
+
+    summary = artifacts.model_metadata()
+    assert summary["best_cv_score"] == pytest.approx(results["mean_test_score"].iloc[0])
+    assert summary["n_train"] + summary["n_test"] == len(df)
+    assert len(artifacts.dummy_cv_results()) == 5
+    accuracy = artifacts.bootstrap_metrics("accuracy").iloc[0]
+    assert accuracy["estimate"] == pytest.approx(summary["test_accuracy"])
+    assert accuracy["lower"] <= accuracy["estimate"] <= accuracy["upper"]
+
+    # The artifact scorer and the pickled Pipeline agree
+    X = df.drop(columns="species")
+    np.testing.assert_array_equal(
+        artifacts.model().predict_proba(X), artifacts.model(pipeline=True).predict_proba(X)
+    )
+
+
+def test_pipeline_artifacts_missing(tmp_path):
+    """Edge cases: missing outputs and unknown artifact names."""
+    artifacts = PipelineArtifacts(root=str(tmp_path))
+    assert artifacts.missing() == list(ARTIFACT_PATHS)
+    with pytest.raises(FileNotFoundError, match="make all"):
+        artifacts.cv_results()
+
+    with pytest.raises(KeyError):
+        PipelineArtifacts(figures="results/figures")
+
+    # Overridden paths are resolved against the root
+    pd.DataFrame({"test_score": [0.3]}).to_csv(tmp_path / "dummy.csv", index=False)
+    custom = PipelineArtifacts(root=str(tmp_path), dummy_cv_results="dummy.csv")
+    assert custom.dummy_cv_results()["test_score"].tolist() == [0.3]
@@ -0,0 +1,104 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_benchmark import (
+    STAGES,
+    append_history,
+    artifact_cold_start,
+    find_regressions,
+    load_history,
+    previous_run,
+    run_stage,
+    startup_report,
+)
+
+RAW_PATH = str(Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv")
+
+
+@pytest.mark.parametrize("stage", STAGES)
+def test_run_stage(stage):
+    """Test run_stage on every stage with a small synthetic dataset."""
+    result = run_stage(stage, 500, RAW_PATH)
+
+    assert result["stage"] == stage
+    assert result["n_rows"] == 500
+    assert result["wall_seconds"] > 0
+    assert result["peak_rss_mb"] > 0
+
+
+@pytest.mark.parametrize("stage", ["validate", "validate_fast"])
+def test_run_stage_validation_passes(stage, monkeypatch):
+    """Test that the validation stages time a run that passes every check."""
+    import data_validation_iris
+
+    # Normal case: at 2,000 rows the data passes with scaled species bounds
+    assert "error" not in run_stage(stage, 2000, RAW_PATH)
+
+    # Edge case: a failing check fails the stage instead of being timed
+    monkeypatch.setattr(data_validation_iris, "SPECIES_COUNT_RANGE", (0, 1))
+    with pytest.raises(ValueError, match="Species distribution"):
+        run_stage(stage, 2000, RAW_PATH)
+
+
+def test_run_stage_unknown_stage():
+    """Edge case: unknown stage names are rejected."""
+    with pytest.raises(ValueError):
+        run_stage("train", 10, RAW_PATH)
+
+
+def test_history_and_regressions(tmp_path):
+    """Test history round trip and regression detection."""
+    path = str(tmp_path / "bench" / "history.json")
+    assert load_history(path) == []
+
+    before = [{"stage": "model_fit", "n_rows": 1000, "wall_seconds": 1.0}]
+    after = [
+        {"stage": "model_fit", "n_rows": 1000, "wall_seconds": 1.5},
+        {"stage": "model_fit", "n_rows": 5000, "wall_seconds": 9.0},
+    ]
+    append_history(path, before)
+    record = append_history(path, after)
+
+    history = load_history(path)
+    assert len(history) == 2
+    assert previous_run(history, record["commit"])["results"] == before
+
+    # Normal case: 50% slower is flagged at the default 20% threshold
+    regressions = find_regressions(after, before)
+    assert len(regressions) == 1
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
+
+    # Edge cases: a looser threshold, and sizes without a baseline
+    assert find_regressions(after, before, threshold=0.6) == []
+    assert previous_run(history[:1], record["commit"]) is None
+
+
+def test_artifact_cold_start():
+    """Test artifact_cold_start on the committed artifact."""
+    path = str(Path(RAW_PATH).parents[2] / "results" / "metrics" / "logreg_model.artifact")
+    result = artifact_cold_start(path, repeats=1)
+
+    assert result["size_bytes"] > 0
+    assert result["cold_start_seconds"] >= result["load_seconds"] > 0
+    # The artifact loader never imports scikit-learn
+    assert result["modules_loaded"] < 500
+
+
+def test_startup_report():
+    """Test startup_report with normal and edge cases."""
+    src = Path(RAW_PATH).parents[2] / "src"
+
+    # Normal case: listing the commands imports none of the heavy libraries
+    report = startup_report([str(src / "iris.py"), "--help"], top=None)
+    assert report["returncode"] == 0
+    assert report["modules"] > 0 and report["wall_seconds"] > 0
+    imported = {module.split(".")[0] for module, _ in report["top_imports"]}
+    assert "click" in imported
+    assert not imported & {"pandas", "sklearn", "altair", "pandera", "matplotlib"}
+
+    # Edge case: a failing command is reported, not raised
+    assert startup_report([str(src / "iris.py"), "no-such-command"])["returncode"] != 0
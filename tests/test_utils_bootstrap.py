@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_bootstrap import bootstrap_confusion, bootstrap_metrics
+
+
+def test_bootstrap_confusion_matches_loop():
+    """Test bootstrap_confusion against per-resample sklearn confusion matrices."""
+    from sklearn.metrics import confusion_matrix
+
+    rng = np.random.default_rng(0)
+    y_true = rng.choice(["setosa", "versicolor", "virginica"], 40)
+    y_pred = y_true.copy()
+    y_pred[:6] = "virginica"
+
+    classes, counts = bootstrap_confusion(y_true, y_pred, n_resamples=200, random_state=3)
+    assert counts.shape == (200, 3, 3)
+    assert (counts.sum(axis=(1, 2)) == 40).all()
+
+    # Same index matrix as the vectorized version draws
+    idx = np.random.default_rng(3).integers(0, 40, size=(200, 40))
+    for b in range(200):
+        expected = confusion_matrix(y_true[idx[b]], y_pred[idx[b]], labels=classes)
+        np.testing.assert_array_equal(counts[b], expected)
+
+
+def test_bootstrap_metrics():
+    """Test bootstrap_metrics with normal and edge cases."""
+    y_true = np.array(["a"] * 10 + ["b"] * 10 + ["c"] * 10)
+    y_pred = y_true.copy()
+    y_pred[[0, 10]] = "c"
+
+    table = bootstrap_metrics(y_true, y_pred, n_resamples=2000)
+    accuracy = table[table["metric"] == "accuracy"].iloc[0]
+    assert accuracy["estimate"] == pytest.approx(28 / 30)
+    assert accuracy["lower"] < accuracy["estimate"] <= accuracy["upper"] <= 1
+    assert len(table) == 1 + 2 * 3 + 3 * 3
+
+    recall_a = table[(table["metric"] == "recall") & (table["class"] == "a")].iloc[0]
+    assert recall_a["estimate"] == pytest.approx(0.9)
+    cell = table[(table["metric"] == "confusion_count") & (table["class"] == "a") & (table["predicted"] == "c")]
+    assert cell["estimate"].iloc[0] == 1
+
+    # Results do not depend on the batch size
+    import utils_bootstrap
+    limit = utils_bootstrap.MAX_BATCH_ELEMENTS
+    try:
+        utils_bootstrap.MAX_BATCH_ELEMENTS = 7 * 30
+        batched = bootstrap_metrics(y_true, y_pred, n_resamples=2000)
+    finally:
+        utils_bootstrap.MAX_BATCH_ELEMENTS = limit
+    np.testing.assert_allclose(batched[["lower", "upper"]], table[["lower", "upper"]])
+
+    # Edge cases: perfect predictions, mismatched lengths, empty input
+    perfect = bootstrap_metrics(y_true, y_true, n_resamples=100)
+    assert (perfect.loc[perfect["metric"] != "confusion_count", "lower"] == 1).all()
+    with pytest.raises(ValueError):
+        bootstrap_metrics(y_true, y_pred[:-1])
+    with pytest.raises(ValueError):
+        bootstrap_metrics([], [])
@@ -0,0 +1,68 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_cache import StageCache, stage_key
+
+
+def test_stage_key_depends_on_content_not_mtime(tmp_path):
+    """Test stage_key with normal and edge cases."""
+    data = tmp_path / "data.csv"
+    data.write_text("a,b\n1,2\n")
+    key = stage_key("process", inputs=[str(data)], code=["utils_cache.py"])
+
+    # Normal case: touching the file keeps the key
+    os.utime(data, (0, 0))
+    assert stage_key("process", inputs=[str(data)], code=["utils_cache.py"]) == key
+
+    # Normal case: identical bytes at another path keep the key
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(data.read_bytes())
+    assert stage_key("process", inputs=[str(copy)], code=["utils_cache.py"]) == key
+
+    # Normal case: changed content, params or stage change the key
+    data.write_text("a,b\n1,3\n")
+    assert stage_key("process", inputs=[str(data)], code=["utils_cache.py"]) != key
+    assert stage_key("process", inputs=[str(copy)], code=["utils_cache.py"], params={"x": 1}) != key
+    assert stage_key("eda", inputs=[str(copy)], code=["utils_cache.py"]) != key
+
+    # Directories of shards are keyed on their files' names and contents
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    (shards / "part-00000.csv").write_bytes(copy.read_bytes())
+    shard_key = stage_key("process", inputs=[str(shards)], code=["utils_cache.py"])
+    (shards / "part-00001.csv").write_text("a,b\n5,6\n")
+    assert stage_key("process", inputs=[str(shards)], code=["utils_cache.py"]) != shard_key
+
+
+def test_stage_cache_restore_and_lru_eviction(tmp_path):
+    """Test StageCache with normal and edge cases."""
+    cache = StageCache(str(tmp_path / "cache"), max_mb=2.5 / 1024)  # 2.5 KB budget
+    out = tmp_path / "out.bin"
+
+    # Edge case: miss on an empty cache
+    assert not cache.restore("k0", {"out.bin": str(out)})
+
+    # Normal case: stored artifacts are restored byte for byte
+    for i in range(3):
+        out.write_bytes(bytes([i]) * 1024)
+        cache.store(f"k{i}", {"out.bin": str(out)})
+        os.utime(tmp_path / "cache" / f"k{i}" / "meta.json", (i, i))
+
+    # Budget holds two 1 KB entries: the oldest (k0) was evicted
+    assert [key for key, _, _ in cache.entries()] == ["k1", "k2"]
+    assert cache.restore("k1", {"out.bin": str(out)})
+    assert out.read_bytes() == bytes([1]) * 1024
+
+    # Normal case: restoring k1 made it most recent, so k2 goes next
+    out.write_bytes(b"x" * 1024)
+    cache.store("k3", {"out.bin": str(out)})
+    assert sorted(key for key, _, _ in cache.entries()) == ["k1", "k3"]
+
+    # Edge case: artifacts larger than the whole budget are not cached
+    out.write_bytes(b"y" * 4096)
+    cache.store("big", {"out.bin": str(out)})
+    assert not cache.restore("big", {"out.bin": str(out)})
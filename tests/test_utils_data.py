@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import sys
 from pathlib import Path
@@ -5,7 +6,7 @@ from pathlib import Path
 # Ensure we can import from src/
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from utils_data import strip_column_whitespace
+from utils_data import select_columns, strip_column_whitespace
 
 def test_strip_column_whitespace_trims_spaces():
     """Test strip_column_whitespace with normal and edge cases."""
@@ -29,4 +30,21 @@ def test_strip_column_whitespace_trims_spaces():
     df_range = pd.DataFrame([[1,2],[3,4]])
     cleaned4 = strip_column_whitespace(df_range)
     # Columns should remain as RangeIndex
-    assert list(cleaned4.columns) == [0, 1]
\ No newline at end of file
+    assert list(cleaned4.columns) == [0, 1]
+
+
+def test_select_columns_shares_data():
+    """Test select_columns with normal and edge cases."""
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0], "c": ["x", "y"]})
+
+    # Normal case: selected columns in order, backed by df's data
+    selected = select_columns(df, ["b", "a"])
+    assert list(selected.columns) == ["b", "a"]
+    assert np.shares_memory(selected["a"].to_numpy(), df["a"].to_numpy())
+    pd.testing.assert_frame_equal(selected, df[["b", "a"]])
+
+    # Edge case: no columns keeps the index
+    assert select_columns(df, []).shape == (2, 0)
+
+    # strip_column_whitespace does not copy clean frames
+    assert strip_column_whitespace(df) is df
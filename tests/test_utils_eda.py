@@ -5,7 +5,17 @@ from pathlib import Path
 # Ensure we can import from src/
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from utils_eda import compute_correlation_long
+from utils_eda import (
+    CorrelationState,
+    aggregate_eda,
+    boxplot_summary,
+    chart_spec,
+    compute_correlation_files,
+    compute_correlation_long,
+    compute_correlation_streaming,
+    render_figures,
+    spec_hash,
+)
 
 def test_compute_correlation_long_returns_expected_columns_and_shape():
     """Test compute_correlation_long with normal and edge cases."""
@@ -34,3 +44,99 @@ def test_compute_correlation_long_returns_expected_columns_and_shape():
     df_empty = pd.DataFrame()
     corr_empty = compute_correlation_long(df_empty)
     assert corr_empty.empty
+
+
+def test_render_figures_skips_unchanged_specs(tmp_path):
+    """Test spec_hash/render_figures with normal and edge cases."""
+    import altair as alt
+
+    df = pd.DataFrame({"x": [1, 2, 3], "y": [3, 1, 2]})
+    bar = chart_spec(alt.Chart(df).mark_bar().encode(x="x:O", y="y:Q"))
+    line = chart_spec(alt.Chart(df).mark_line().encode(x="x:Q", y="y:Q"))
+    assert spec_hash(bar) == spec_hash(chart_spec(alt.Chart(df).mark_bar().encode(x="x:O", y="y:Q")))
+    assert spec_hash(bar) != spec_hash(line)
+
+    # Normal case: first run renders every figure, in worker processes
+    timings = render_figures({"bar.png": bar, "line.png": line}, str(tmp_path), n_jobs=2)
+    assert all(seconds is not None for seconds in timings.values())
+    assert (tmp_path / "bar.png").read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+
+    # Normal case: only the figure whose data changed is rendered again
+    line_changed = chart_spec(
+        alt.Chart(df.assign(y=[1, 2, 3])).mark_line().encode(x="x:Q", y="y:Q")
+    )
+    timings = render_figures({"bar.png": bar, "line.png": line_changed}, str(tmp_path), n_jobs=1)
+    assert timings["bar.png"] is None
+    assert timings["line.png"] is not None
+
+    # Edge case: a deleted output is rendered again even if its spec is unchanged
+    (tmp_path / "bar.png").unlink()
+    timings = render_figures({"bar.png": bar}, str(tmp_path), n_jobs=1)
+    assert timings["bar.png"] is not None
+
+
+def test_aggregate_eda_summaries():
+    """Test aggregate_eda/boxplot_summary/density_2d with normal and edge cases."""
+    import numpy as np
+
+    df = pd.read_csv(Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv")
+    summaries = aggregate_eda(df)
+
+    # Normal case: quartiles and whiskers match pandas on each group
+    box = summaries["boxplot"]
+    row = box[(box.kind == "box") & (box.species == "setosa") & (box.feature == "sepal_width")].iloc[0]
+    values = df.loc[df.species == "setosa", "sepal_width"]
+    q1, q3 = values.quantile([0.25, 0.75])
+    assert np.allclose([row["q1"], row["median"], row["q3"]], [q1, values.median(), q3])
+    assert row.upper == values[values <= q3 + 1.5 * (q3 - q1)].max()
+    outliers = box[(box.kind == "outlier") & (box.species == "setosa") & (box.feature == "sepal_width")]
+    assert set(outliers.value) == set(values[(values < row.lower) | (values > row.upper)])
+
+    # Normal case: density counts every row once; correlations match pandas
+    density = summaries["density"]
+    assert density["count"].sum() == len(df)
+    assert density.groupby("species")["count"].sum().to_dict() == df.species.value_counts().to_dict()
+    expected = compute_correlation_long(df)
+    assert np.allclose(summaries["correlation"]["correlation"], expected["correlation"])
+
+    # Edge case: summary sizes do not grow with the number of rows
+    big = pd.concat([df] * 20, ignore_index=True)
+    big_summaries = aggregate_eda(big, bins=10)
+    assert len(big_summaries["density"]) <= 10 * 10 * 3
+    assert (big_summaries["boxplot"].kind == "box").sum() == 3 * 4
+    assert len(boxplot_summary(df, max_outliers=1).query("kind == 'outlier'")) <= 12
+
+
+def test_compute_correlation_streaming(tmp_path):
+    """Test compute_correlation_streaming/CorrelationState with normal and edge cases."""
+    import numpy as np
+
+    df = pd.read_csv(Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv")
+    expected = compute_correlation_long(df)
+
+    # Normal case: uneven chunks give the pandas table
+    chunks = [df.iloc[start:start + 7] for start in range(0, len(df), 7)]
+    streamed = compute_correlation_streaming(chunks)
+    assert list(streamed.columns) == ["feature1", "feature2", "correlation"]
+    assert list(streamed["feature1"]) == list(expected["feature1"])
+    assert list(streamed["feature2"]) == list(expected["feature2"])
+    assert np.allclose(streamed["correlation"], expected["correlation"])
+
+    # Normal case: a file path is streamed, and partial states merge in any order
+    path = tmp_path / "iris.parquet"
+    df.to_parquet(path)
+    assert np.allclose(compute_correlation_streaming(path, chunksize=16)["correlation"],
+                       expected["correlation"])
+    first = CorrelationState().update(df.iloc[:60])
+    second = CorrelationState().update(df.iloc[60:])
+    assert np.allclose(second.merge(first).to_long()["correlation"], expected["correlation"])
+    assert np.allclose(
+        compute_correlation_files([str(path), str(path)], n_jobs=1)["correlation"],
+        expected["correlation"],
+    )
+
+    # Edge cases: no chunks, a single row, and a constant feature
+    assert compute_correlation_streaming([]).empty
+    assert compute_correlation_streaming([df.iloc[:1]]).empty
+    constant = compute_correlation_streaming([df.assign(sepal_width=3.0)])
+    assert "sepal_width" not in set(constant["feature1"])
@@ -0,0 +1,109 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from sklearn.compose import make_column_transformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from utils_fastpath import (
+    LinearScorer,
+    export_linear_weights,
+    load_artifact,
+    read_artifact_metadata,
+    save_artifact,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+MODEL_PATH = ROOT / "results" / "metrics" / "logreg_model.pickle"
+DATA_PATH = ROOT / "data" / "processed" / "iris_clean.csv"
+
+
+def test_linear_scorer_matches_pickled_pipeline(tmp_path):
+    """Parity test: the NumPy scorer reproduces the pickled Pipeline bit for bit."""
+    with open(MODEL_PATH, "rb") as f:
+        pipeline = pickle.load(f)
+    weights_path = tmp_path / "weights.npz"
+    export_linear_weights(pipeline, str(weights_path))
+    scorer = LinearScorer.load(str(weights_path))
+
+    # Normal case: the training data
+    X = pd.read_csv(DATA_PATH).drop(columns=["species"])
+    assert np.array_equal(scorer.predict_proba(X), pipeline.predict_proba(X))
+    assert np.array_equal(scorer.predict(X), pipeline.predict(X))
+
+    # Normal case: wide-ranging synthetic rows, as float64 and float32
+    rng = np.random.default_rng(522)
+    X_big = pd.DataFrame(rng.normal(4, 3, size=(5000, 4)), columns=X.columns)
+    assert np.array_equal(scorer.predict_proba(X_big), pipeline.predict_proba(X_big))
+    X_32 = X_big.astype(np.float32)
+    assert np.array_equal(scorer.predict_proba(X_32), pipeline.predict_proba(X_32))
+
+    # Normal case: plain NumPy input in feature order
+    assert np.array_equal(scorer.predict_proba(X.to_numpy()), pipeline.predict_proba(X))
+
+    # Edge case: wrong number of features
+    with pytest.raises(ValueError):
+        scorer.predict_proba(np.ones((2, 3)))
+
+
+def test_export_linear_weights_rejects_other_pipelines(tmp_path):
+    """Test export_linear_weights with an unsupported preprocessor."""
+    df = pd.read_csv(DATA_PATH)
+    X, y = df.drop(columns=["species"]), df["species"]
+    features = X.columns.tolist()
+
+    # Edge case: two transformers in the preprocessor
+    pipeline = Pipeline([
+        ("preprocessor", make_column_transformer(
+            (StandardScaler(), features[:2]), (StandardScaler(), features[2:])
+        )),
+        ("classifier", LogisticRegression()),
+    ]).fit(X, y)
+    with pytest.raises(ValueError):
+        export_linear_weights(pipeline, str(tmp_path / "weights.npz"))
+
+
+def test_artifact_round_trip_and_safety(tmp_path):
+    """Test save_artifact/load_artifact with normal and edge cases."""
+    with open(MODEL_PATH, "rb") as f:
+        pipeline = pickle.load(f)
+    path = tmp_path / "model.artifact"
+    save_artifact(pipeline, str(path), metadata={"best_cv_score": 0.98})
+
+    # Normal case: memory-mapped weights score exactly like the pickle
+    scorer = load_artifact(str(path), verify=True)
+    X = pd.read_csv(DATA_PATH).drop(columns=["species"])
+    assert np.array_equal(scorer.predict_proba(X), pipeline.predict_proba(X))
+    assert list(scorer.classes_) == list(pipeline.classes_)
+
+    # Normal case: metadata is readable without loading the weights
+    header = read_artifact_metadata(str(path))
+    assert header["version"] == 1
+    assert header["features"] == X.columns.tolist()
+    assert header["metadata"] == {"best_cv_score": 0.98}
+
+    # Edge case: corrupted weights are caught when verifying
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    corrupted = tmp_path / "corrupted.artifact"
+    corrupted.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="Checksum"):
+        load_artifact(str(corrupted), verify=True)
+
+    # Edge case: other files and newer format versions are rejected
+    with pytest.raises(ValueError):
+        load_artifact(str(MODEL_PATH))
+    newer = bytearray(path.read_bytes())
+    newer[newer.index(b'"version": 1')+len(b'"version": ')] = ord("9")
+    future = tmp_path / "future.artifact"
+    future.write_bytes(bytes(newer))
+    with pytest.raises(ValueError, match="Unsupported"):
+        read_artifact_metadata(str(future))
@@ -0,0 +1,124 @@
+import hashlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_fetch import BUNDLED_PATH, IRIS_HEADER, fetch_iris, fetch_url, uci_to_csv
+
+RAW_PATH = Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv"
+RAW_BYTES = RAW_PATH.read_bytes()
+RAW_SHA256 = hashlib.sha256(RAW_BYTES).hexdigest()
+
+ETAG = '"iris-v1"'
+LAST_MODIFIED = "Wed, 10 Dec 2025 00:00:00 GMT"
+
+
+class _IrisHandler(BaseHTTPRequestHandler):
+    """Serves RAW_BYTES with an ETag and Last-Modified, honouring conditional requests."""
+
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.path != "/iris.csv":
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(RAW_BYTES)))
+        self.end_headers()
+        self.wfile.write(RAW_BYTES)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _IrisHandler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _IrisHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_url_conditional_get(server, tmp_path):
+    """Test fetch_url with normal and edge cases."""
+    dest = str(tmp_path / "cache" / "iris.csv")
+
+    # Normal case: first request downloads and stores the validators
+    assert fetch_url(f"{server}/iris.csv", dest, sha256=RAW_SHA256)
+    assert Path(dest).read_bytes() == RAW_BYTES
+    assert "If-None-Match" not in _IrisHandler.requests[0]
+
+    # Second request is conditional and answered with 304
+    assert not fetch_url(f"{server}/iris.csv", dest, sha256=RAW_SHA256)
+    assert _IrisHandler.requests[1]["If-None-Match"] == ETAG
+    assert _IrisHandler.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+    # Edge case: a checksum mismatch leaves no partial or replaced file
+    other = str(tmp_path / "other.csv")
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        fetch_url(f"{server}/iris.csv", other, sha256="0" * 64)
+    assert not Path(other).exists()
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_fetch_iris_sources(server, tmp_path):
+    """Test fetch_iris source order with normal and edge cases."""
+    output = tmp_path / "raw" / "iris.csv"
+    cache_dir = str(tmp_path / "cache")
+    url = f"{server}/iris.csv"
+
+    # Remote first, then a 304 which leaves the output untouched
+    result = fetch_iris(str(output), url=url, cache_dir=cache_dir, sha256=RAW_SHA256)
+    assert (result["source"], result["changed"]) == ("remote", True)
+    assert output.read_bytes() == RAW_BYTES
+    result = fetch_iris(str(output), url=url, cache_dir=cache_dir, sha256=RAW_SHA256)
+    assert (result["source"], result["changed"]) == ("not-modified", False)
+
+    # A local mirror wins over the remote
+    n_requests = len(_IrisHandler.requests)
+    result = fetch_iris(str(output), url=url, mirror=str(RAW_PATH.parent), sha256=RAW_SHA256)
+    assert result["source"] == "mirror"
+    assert len(_IrisHandler.requests) == n_requests
+
+    # Unreachable remote falls back to the cached copy, offline with no cache to the bundled file
+    result = fetch_iris(str(output), url=f"{server}/missing.csv", cache_dir=cache_dir, sha256=RAW_SHA256)
+    assert result["source"] == "cache"
+    assert "remote" in result["skipped"][0]
+    bundled = tmp_path / "bundled.csv"
+    result = fetch_iris(str(bundled), url=None, mirror=str(tmp_path / "nowhere"))
+    assert result["source"] == "bundled"
+    assert result["skipped"] == [f"mirror: {tmp_path / 'nowhere'} not found"]
+
+    # Edge case: a mirror with the wrong contents is rejected
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        fetch_iris(str(output), url=None, mirror=BUNDLED_PATH, sha256=RAW_SHA256)
+
+
+def test_uci_to_csv():
+    """Test uci_to_csv converts the bundled UCI file to the raw CSV layout."""
+    with open(BUNDLED_PATH, "rb") as f:
+        converted = uci_to_csv(f.read())
+    lines = converted.splitlines()
+    assert converted.startswith(IRIS_HEADER)
+    assert len(lines) == 151
+    assert lines[0] == RAW_BYTES.splitlines()[0]
+    assert {line.rsplit(b",", 1)[1] for line in lines[1:]} == {b"setosa", b"versicolor", b"virginica"}
+
+    # Edge case: blank lines and CRLF endings are dropped
+    assert uci_to_csv(b"5.1,3.5,1.4,0.2,Iris-setosa\r\n\r\n") == IRIS_HEADER + b"5.1,3.5,1.4,0.2,setosa\n"
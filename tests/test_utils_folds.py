@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_folds import CVFolds, fold_key, load_folds
+from utils_model import create_train_test_split, prepare_features_and_target
+from utils_zoo import SharedFolds, attach_folds, _ATTACHED
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "processed" / "iris_clean.csv"
+
+
+def _iris():
+    return prepare_features_and_target(pd.read_csv(DATA_PATH), target_col="species")
+
+
+def test_build_matches_sklearn_splits():
+    """Test CVFolds.build against train_test_split and cross_validate's cv=5."""
+    from sklearn.dummy import DummyClassifier
+    from sklearn.model_selection import cross_validate
+
+    X, y = _iris()
+    folds = CVFolds.build(X, y, test_size=0.2, random_state=522, cv=5)
+
+    # Same holdout rows as create_train_test_split
+    X_train, X_test, y_train, _ = create_train_test_split(X, y, test_size=0.2, random_state=522)
+    pd.testing.assert_frame_equal(X.iloc[folds.train_idx], X_train)
+    pd.testing.assert_frame_equal(X.iloc[folds.test_idx], X_test)
+
+    # Same CV folds as cv=5, so scores are unchanged
+    dummy = DummyClassifier(strategy="most_frequent")
+    expected = cross_validate(dummy, X_train, y_train, cv=5)["test_score"]
+    cached = cross_validate(dummy, X_train, y_train, cv=folds.splits)["test_score"]
+    np.testing.assert_array_equal(cached, expected)
+
+    # Scaled matrices are standardized on each fold's training rows
+    assert folds.n_folds == 5
+    Z_train, Z_test = folds.scaled(0)
+    assert np.allclose(Z_train.mean(axis=0), 0.0)
+    assert len(Z_train) + len(Z_test) == len(X_train)
+
+
+def test_load_folds_cache(tmp_path):
+    """Test load_folds with normal and edge cases."""
+    X, y = _iris()
+    cache_dir = str(tmp_path / "folds")
+
+    # Normal case: a miss builds and stores, a hit memory-maps the same arrays
+    first = load_folds(X, y, cache_dir)
+    second = load_folds(X, y, cache_dir)
+    assert len(list((tmp_path / "folds").iterdir())) == 1
+    assert isinstance(second.train_idx, np.memmap)
+    for name, array in CVFolds.build(X, y).arrays.items():
+        np.testing.assert_array_equal(second.arrays[name], array)
+        np.testing.assert_array_equal(first.arrays[name], array)
+
+    # Edge cases: another seed or changed data is a different entry
+    assert fold_key(X, y, random_state=1) != fold_key(X, y)
+    X_changed = X.copy()
+    X_changed.iloc[0, 0] += 0.1
+    assert fold_key(X_changed, y) != fold_key(X, y)
+    load_folds(X, y, cache_dir, random_state=1)
+    assert len(list((tmp_path / "folds").iterdir())) == 2
+
+    # Without a cache directory nothing is written
+    assert load_folds(X, y).key == first.key
+
+
+def test_shared_folds_reuse_cached_folds(tmp_path):
+    """Test SharedFolds built from cached folds matches recomputed folds."""
+    X, y = _iris()
+    folds = load_folds(X, y, str(tmp_path))
+    X_train, y_train = X.iloc[folds.train_idx], y.iloc[folds.train_idx]
+
+    with SharedFolds(X_train, y_train, cv=5) as fresh, \
+            SharedFolds(X_train, y_train, folds=folds) as reused:
+        expected = {k: v.copy() for k, v in attach_folds(fresh.layout).items()}
+        actual = attach_folds(reused.layout)
+        assert set(actual) == set(expected)
+        for name in expected:
+            np.testing.assert_allclose(actual[name], expected[name])
+        _ATTACHED.clear()
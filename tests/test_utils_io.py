@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_io import (
+    FEATURE_COLS,
+    ChunkWriter,
+    data_format,
+    iter_chunks,
+    read_iris,
+    to_columnar_dtypes,
+    widen_float32,
+    write_iris,
+)
+
+RAW_PATH = Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv"
+
+
+def test_data_format_from_extension():
+    """Test data_format with normal and edge cases."""
+    assert data_format("data/raw/iris.csv") == "csv"
+    assert data_format("x.parquet") == "parquet"
+    assert data_format("x.ARROW") == "arrow"
+    assert data_format("x.feather") == "arrow"
+
+    # Edge case: unknown extensions fall back to CSV
+    assert data_format("iris.data") == "csv"
+
+
+@pytest.mark.parametrize("name", ["iris.csv", "iris.parquet", "iris.arrow"])
+def test_write_and_read_iris_round_trip(tmp_path, name):
+    """Test write_iris/read_iris round trips for every format."""
+    df = pd.read_csv(RAW_PATH)
+    path = str(tmp_path / name)
+    write_iris(df, path)
+    loaded = read_iris(path)
+
+    assert list(loaded.columns) == list(df.columns)
+    assert list(loaded["species"]) == list(df["species"])
+    if name.endswith(".csv"):
+        pd.testing.assert_frame_equal(loaded, df)
+    else:
+        # Columnar formats store float32 features and categorical species
+        assert (loaded.dtypes.iloc[:4] == "float32").all()
+        assert isinstance(loaded["species"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(
+            loaded.iloc[:, :4], df.iloc[:, :4].astype("float32")
+        )
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.parquet", "out.arrow"])
+def test_chunk_writer_and_iter_chunks(tmp_path, name):
+    """Test ChunkWriter/iter_chunks with normal and edge cases."""
+    df = pd.read_csv(RAW_PATH)
+    path = str(tmp_path / name)
+
+    # Normal case: chunks with different species sets append into one file
+    with ChunkWriter(path) as writer:
+        for start in range(0, len(df), 40):
+            writer.write(df.iloc[start:start + 40])
+    assert writer.rows == len(df)
+
+    chunks = list(iter_chunks(path, chunksize=64))
+    assert max(len(chunk) for chunk in chunks) <= 64
+    combined = pd.concat(chunks, ignore_index=True)
+    assert list(combined["species"].astype(str)) == list(df["species"])
+
+    # Edge case: invalid chunk size
+    with pytest.raises(ValueError):
+        list(iter_chunks(path, chunksize=0))
+
+
+@pytest.mark.parametrize("name", ["iris.csv", "iris.parquet"])
+def test_read_iris_compact(tmp_path, name):
+    """Test read_iris/iter_chunks with compact dtypes, normal and edge cases."""
+    df = pd.read_csv(RAW_PATH)
+    path = str(tmp_path / name)
+    write_iris(df, path)
+
+    # Normal case: float32 features and categorical species, same values
+    compact = read_iris(path, compact=True)
+    assert (compact[FEATURE_COLS].dtypes == "float32").all()
+    assert isinstance(compact["species"].dtype, pd.CategoricalDtype)
+    assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum() / 2
+    pd.testing.assert_frame_equal(
+        compact[FEATURE_COLS], df[FEATURE_COLS].astype("float32")
+    )
+    chunks = list(iter_chunks(path, chunksize=64, compact=True))
+    assert all((chunk[FEATURE_COLS].dtypes == "float32").all() for chunk in chunks)
+
+    # Edge case: frames already following the policy are returned uncopied
+    assert to_columnar_dtypes(compact) is compact
+
+
+def test_read_iris_compact_keeps_bad_values(tmp_path):
+    """Edge case: non-numeric measurements are read unconverted for validation."""
+    df = pd.read_csv(RAW_PATH).astype({"sepal_length": object})
+    df.loc[0, "sepal_length"] = "unknown"
+    path = str(tmp_path / "bad.csv")
+    df.to_csv(path, index=False)
+
+    loaded = read_iris(path, compact=True)
+    assert loaded.loc[0, "sepal_length"] == "unknown"
+    assert loaded["sepal_width"].dtype == "float64"
+    chunk = next(iter_chunks(path, chunksize=10, compact=True))
+    assert chunk.loc[0, "sepal_length"] == "unknown"
+
+
+def test_widen_float32():
+    """Test widen_float32 with normal and edge cases."""
+    df = pd.DataFrame({"x": np.array([5.1, 0.2], dtype=np.float32), "y": [1, 2]})
+
+    # Normal case: the recorded decimals come back, other columns untouched
+    wide = widen_float32(df)
+    assert wide["x"].dtype == "float64"
+    assert list(wide["x"]) == [5.1, 0.2]
+    assert list(wide["y"]) == [1, 2]
+
+    # Edge case: nothing to widen returns the frame itself
+    assert widen_float32(wide) is wide
@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 import sys
 from pathlib import Path
 
@@ -61,3 +62,81 @@ def test_create_train_test_split_respects_sizes():
     X_train_empty, X_test_empty, y_train_empty, y_test_empty = X_empty, X_empty, y_empty, y_empty
     assert X_train_empty.empty and X_test_empty.empty
     assert y_train_empty.empty and y_test_empty.empty
+
+def test_build_search_strategies():
+    """Test build_search and EarlyStoppingRandomSearchCV with normal and edge cases."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import RandomizedSearchCV
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    from utils_search import EarlyStoppingRandomSearchCV, build_search
+
+    df = pd.read_csv(Path(__file__).resolve().parents[1] / "data" / "processed" / "iris_clean.csv")
+    X, y = prepare_features_and_target(df, "species")
+    pipeline = Pipeline([("scaler", StandardScaler()), ("classifier", LogisticRegression())])
+
+    # Normal case: default strategy is the original randomized search
+    assert isinstance(build_search(pipeline), RandomizedSearchCV)
+
+    # Normal case: early stopping evaluates a prefix of the same candidates
+    full = build_search(pipeline, strategy="random", n_iter=30, n_jobs=1).fit(X, y)
+    early = EarlyStoppingRandomSearchCV(
+        pipeline,
+        {"classifier__C": full.param_distributions["classifier__C"]},
+        n_iter=30, batch_size=5, patience=1, cv=5, random_state=522,
+    ).fit(X, y)
+    n_early = len(early.cv_results_["params"])
+    assert 5 <= n_early < 30
+    assert early.cv_results_["params"] == full.cv_results_["params"][:n_early]
+
+    # Normal case: solver/penalty tuning yields a fitted best estimator
+    halving = build_search(pipeline, strategy="halving", n_iter=9, n_jobs=1, tune_solver=True)
+    halving.fit(X, y)
+    assert halving.best_params_["classifier__solver"] in {"lbfgs", "newton-cg", "saga"}
+
+    # Edge case: unknown strategy
+    with pytest.raises(ValueError):
+        build_search(pipeline, strategy="grid")
+
+
+def test_regularization_path_search_matches_random_search():
+    """Test RegularizationPathSearchCV with normal and edge cases."""
+    import numpy as np
+
+    from utils_io import read_iris
+    from utils_model import build_pipeline
+    from utils_search import build_search
+
+    # The float64 frame model.py trains on
+    df = read_iris(str(Path(__file__).resolve().parents[1] / "data" / "processed" / "iris_clean.csv"))
+    X, y = prepare_features_and_target(df, "species")
+    X_train, _, y_train, _ = create_train_test_split(X, y, test_size=0.2, random_state=522)
+    pipeline = build_pipeline(X.columns.tolist())
+
+    # Normal case: same candidates, cv_results_ keys and best C
+    random = build_search(pipeline, strategy="random", n_iter=50, n_jobs=1).fit(X_train, y_train)
+    path = build_search(pipeline, strategy="path", n_iter=50, n_jobs=1).fit(X_train, y_train)
+    assert list(path.cv_results_) == [
+        key for key in random.cv_results_ if key in path.cv_results_
+    ]
+    assert path.cv_results_["params"] == random.cv_results_["params"]
+    assert path.best_params_ == random.best_params_
+
+    # Only the best candidates are re-solved; they score as independent fits
+    # at the tight tolerance, and the best estimator is refit with it
+    refined = path.refined_
+    assert refined[path.best_index_] and 0 < refined.sum() < len(refined)
+    tight = build_pipeline(X.columns.tolist()).set_params(
+        classifier__tol=1e-8, classifier__max_iter=10_000
+    )
+    cold = build_search(tight, strategy="random", n_iter=50, n_jobs=1).fit(X_train, y_train)
+    np.testing.assert_array_equal(
+        path.cv_results_["mean_test_score"][refined], cold.cv_results_["mean_test_score"][refined]
+    )
+    assert path.best_estimator_.named_steps["classifier"].tol == 1e-8
+    assert path.best_estimator_.predict(X_train).shape == (len(X_train),)
+
+    # Edge case: the path cannot tune solver/penalty
+    with pytest.raises(ValueError):
+        build_search(pipeline, strategy="path", tune_solver=True)
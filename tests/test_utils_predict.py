@@ -0,0 +1,84 @@
+import pandas as pd
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from sklearn.linear_model import LogisticRegression
+
+from utils_io import write_iris
+from utils_predict import iter_feature_chunks, score_chunk, stream_predictions
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "processed" / "iris_clean.csv"
+
+
+def _fit_model():
+    df = pd.read_csv(DATA_PATH)
+    model = LogisticRegression(max_iter=1000)
+    model.fit(df.drop(columns=["species"]), df["species"])
+    return model, df
+
+
+def test_iter_feature_chunks_splits_rows(tmp_path):
+    """Test iter_feature_chunks with normal and edge cases."""
+
+    # Normal case: 5 rows in chunks of 2 -> 2, 2, 1
+    path = tmp_path / "in.csv"
+    pd.DataFrame({"a": range(5)}).to_csv(path, index=False)
+    sizes = [len(chunk) for chunk in iter_feature_chunks(str(path), chunksize=2)]
+    assert sizes == [2, 2, 1]
+
+    # Edge case: invalid chunk size
+    with pytest.raises(ValueError):
+        list(iter_feature_chunks(str(path), chunksize=0))
+
+
+def test_score_chunk_adds_predictions():
+    """Test score_chunk with normal and edge cases."""
+    model, df = _fit_model()
+
+    # Normal case: predictions match the estimator and probabilities sum to 1
+    scored = score_chunk(model, df.iloc[:10])
+    assert list(scored["predicted_species"]) == list(model.predict(df.iloc[:10, :4]))
+    prob_cols = [f"prob_{cls}" for cls in model.classes_]
+    assert np.allclose(scored[prob_cols].sum(axis=1), 1.0)
+
+    # Edge case: missing feature column
+    with pytest.raises(KeyError):
+        score_chunk(model, df.drop(columns=["petal_width"]))
+
+
+def test_stream_predictions_matches_full_scoring(tmp_path):
+    """Test stream_predictions with normal and edge cases."""
+    model, df = _fit_model()
+    input_path = tmp_path / "in.csv"
+    df.to_csv(input_path, index=False)
+
+    # Normal case: chunked output equals scoring the whole file at once
+    output_path = tmp_path / "out" / "pred.csv"
+    stats = stream_predictions(model, str(input_path), str(output_path), chunksize=32)
+    out = pd.read_csv(output_path)
+    assert stats["rows"] == len(df)
+    assert stats["chunks"] == 5
+    assert list(out["predicted_species"]) == list(model.predict(df.iloc[:, :4]))
+
+    # Edge case: header-only input produces no rows
+    empty_path = tmp_path / "empty.csv"
+    df.iloc[:0].to_csv(empty_path, index=False)
+    stats_empty = stream_predictions(
+        model, str(empty_path), str(tmp_path / "empty_out.csv"), chunksize=32
+    )
+    assert stats_empty["rows"] == 0
+    # ...but still writes the header of the scored columns
+    empty_out = pd.read_csv(tmp_path / "empty_out.csv")
+    assert empty_out.empty
+    assert list(empty_out.columns) == list(out.columns)
+
+    # Edge case: an Arrow input without rows yields no chunk at all
+    arrow_path = tmp_path / "empty.arrow"
+    write_iris(df.iloc[:0], str(arrow_path))
+    stream_predictions(model, str(arrow_path), str(tmp_path / "empty_arrow.csv"))
+    assert list(pd.read_csv(tmp_path / "empty_arrow.csv").columns)[-1] == out.columns[-1]
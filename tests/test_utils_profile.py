@@ -0,0 +1,79 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_profile import (
+    StageProfiler,
+    profile_record,
+    profile_step,
+    profiling_active,
+    record_frame,
+)
+
+
+def test_stage_profiler_writes_steps(tmp_path):
+    """Test StageProfiler with nested steps, records and cProfile output."""
+    with StageProfiler("demo", str(tmp_path), cprofile=True):
+        assert profiling_active()
+        with profile_step("outer", rows=10):
+            with profile_step("inner") as step:
+                data = list(range(100_000))
+                step["rows"] = len(data)
+        profile_record("fold0", rows=8, wall_seconds=0.5)
+
+    assert not profiling_active()
+    report = json.loads((tmp_path / "demo.json").read_text())
+    steps = {s["name"]: s for s in report["steps"]}
+
+    assert report["stage"] == "demo" and report["error"] is None
+    assert steps["inner"]["parent"] == "outer"
+    assert steps["inner"]["rows"] == 100_000
+    assert steps["outer"]["rows"] == 10
+    # The inner allocation counts towards the outer step's peak too
+    assert steps["outer"]["peak_mb"] >= steps["inner"]["peak_mb"] > 0
+    assert steps["fold0"]["wall_seconds"] == 0.5
+    assert (tmp_path / "demo.prof").exists()
+    assert report["cprofile"]["top"]
+
+
+def test_stage_profiler_disabled_and_errors(tmp_path):
+    """Edge cases: disabled profiler and a stage that raises."""
+    # Disabled: steps are no-ops and nothing is written
+    with StageProfiler("off", None):
+        assert not profiling_active()
+        with profile_step("noop") as step:
+            step["rows"] = 1
+    assert list(tmp_path.iterdir()) == []
+
+    # A failing stage still writes its report, with the error recorded
+    with pytest.raises(ValueError):
+        with StageProfiler("broken", str(tmp_path)):
+            with profile_step("fails"):
+                raise ValueError("bad data")
+    report = json.loads((tmp_path / "broken.json").read_text())
+    assert report["error"] == "ValueError: bad data"
+    assert report["steps"][0]["name"] == "fails"
+
+
+def test_record_frame(tmp_path):
+    """Test record_frame inside and outside a profiled stage."""
+    df = pd.DataFrame({"x": np.zeros(1000)})
+
+    # Normal case: rows and frame size are stored on the step
+    with StageProfiler("frames", str(tmp_path)):
+        with profile_step("read") as step:
+            record_frame(step, df)
+    report = json.loads((tmp_path / "frames.json").read_text())
+    assert report["steps"][0]["rows"] == 1000
+    assert report["steps"][0]["frame_mb"] > 0
+
+    # Edge case: no active profiler leaves the record untouched
+    step = {}
+    record_frame(step, df)
+    assert step == {}
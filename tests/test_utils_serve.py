@@ -0,0 +1,171 @@
+import asyncio
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_serve import LatencyTracker, MicroBatcher, make_handler
+
+
+def test_latency_tracker_percentiles():
+    """Test LatencyTracker with normal and edge cases."""
+
+    # Edge case: no requests yet
+    tracker = LatencyTracker()
+    assert tracker.summary()["p50_ms"] is None
+
+    # Normal case: 1..100 ms
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    summary = tracker.summary()
+    assert summary["requests"] == 100
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p99_ms"] == pytest.approx(99.01)
+
+
+def test_micro_batcher_merges_concurrent_rows():
+    """Test MicroBatcher with normal and edge cases."""
+    calls = []
+
+    def predict_fn(rows):
+        calls.append(len(rows))
+        return np.column_stack([rows[:, 0], 1 - rows[:, 0]])
+
+    async def run(n_requests, max_batch_size):
+        batcher = MicroBatcher(predict_fn, max_batch_size=max_batch_size, max_wait_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(
+            *(batcher.submit([i / 10]) for i in range(n_requests))
+        )
+        await batcher.stop()
+        return results, batcher.stats()
+
+    # Normal case: 8 concurrent rows are scored by a single call, in order
+    results, stats = asyncio.run(run(8, max_batch_size=64))
+    assert calls == [8]
+    assert [r[0] for r in results] == pytest.approx([i / 10 for i in range(8)])
+    assert stats["batches"] == 1 and stats["requests"] == 8
+
+    # Edge case: batches never exceed max_batch_size
+    calls.clear()
+    asyncio.run(run(10, max_batch_size=4))
+    assert calls == [4, 4, 2]
+
+    # Edge case: invalid configuration
+    with pytest.raises(ValueError):
+        MicroBatcher(predict_fn, max_batch_size=0)
+
+
+def test_handler_serves_predict_and_metrics():
+    """Test the HTTP handler end to end over a local socket."""
+    features = ["a", "b"]
+    classes = ["x", "y"]
+
+    async def request(port, raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        status, _, body = response.partition(b"\r\n\r\n")
+        return status.split(b" ")[1], json.loads(body)
+
+    async def run():
+        batcher = MicroBatcher(
+            lambda rows: np.column_stack([rows[:, 0], rows[:, 1]]), max_wait_ms=1
+        )
+        await batcher.start()
+        server = await asyncio.start_server(
+            make_handler(batcher, features, classes), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+
+        body = json.dumps({"a": 0.2, "b": 0.8}).encode()
+        ok = await request(
+            port,
+            b"POST /predict HTTP/1.1\r\nConnection: close\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode() + body,
+        )
+        bad = await request(
+            port,
+            b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: 2\r\n\r\n{}",
+        )
+        metrics = await request(port, b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+        server.close()
+        await server.wait_closed()
+        await batcher.stop()
+        return ok, bad, metrics
+
+    ok, bad, metrics = asyncio.run(run())
+
+    # Normal case: prediction and metrics
+    assert ok[0] == b"200"
+    assert ok[1]["species"] == "y"
+    assert metrics[1]["requests"] == 1
+
+    # Edge case: missing features are rejected
+    assert bad[0] == b"400"
+
+
+def test_handler_rejects_malformed_requests_and_scoring_errors():
+    """Edge cases: unparseable requests get 400, a failing predict_fn gets 500."""
+
+    def predict_fn(rows):
+        if (rows[:, 0] < 0).any():
+            raise ValueError("negative measurement")
+        return np.column_stack([rows[:, 0], 1 - rows[:, 0]])
+
+    async def request(port, raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        status, _, body = response.partition(b"\r\n\r\n")
+        return status.split(b" ")[1], json.loads(body)
+
+    def predict(values):
+        body = json.dumps(values).encode()
+        return (
+            b"POST /predict HTTP/1.1\r\nConnection: close\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+
+    async def run():
+        batcher = MicroBatcher(predict_fn, max_wait_ms=1)
+        await batcher.start()
+        server = await asyncio.start_server(
+            make_handler(batcher, ["a"], ["x", "y"]), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+
+        responses = [
+            await request(port, b"GARBAGE\r\n\r\n"),
+            await request(port, b"POST /predict HTTP/1.1\r\nContent-Length: ten\r\n\r\n"),
+            await request(
+                port,
+                b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: 10\r\n\r\n"
+                b'{"a": NaN}',
+            ),
+            await request(port, predict({"a": -1.0})),
+            # The server keeps serving after each failure
+            await request(port, predict({"a": 0.2})),
+        ]
+
+        server.close()
+        await server.wait_closed()
+        await batcher.stop()
+        return responses
+
+    garbage, bad_length, nan, failed, ok = asyncio.run(run())
+
+    assert garbage[0] == b"400" and "request line" in garbage[1]["error"]
+    assert bad_length[0] == b"400" and "Content-Length" in bad_length[1]["error"]
+    assert nan[0] == b"400"
+    assert failed[0] == b"500" and "negative measurement" in failed[1]["error"]
+    assert ok[0] == b"200" and ok[1]["species"] == "y"
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_io import FEATURE_COLS, shard_paths, write_iris
+from utils_model import build_pipeline
+from utils_sharded import merge_moments, shard_moments, train_sharded
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "processed" / "iris_clean.csv"
+
+
+def _write_shards(directory, n_shards):
+    """Shuffle the processed data and split it into stratified Parquet shards."""
+    df = pd.read_csv(DATA_PATH).sample(frac=1, random_state=522).reset_index(drop=True)
+    shard_of = df.groupby("species").cumcount() % n_shards
+    directory.mkdir()
+    for k in range(n_shards):
+        write_iris(df[shard_of == k], str(directory / f"part-{k:05d}.parquet"))
+    return df
+
+
+def test_merge_moments(tmp_path):
+    """Test shard_moments and merge_moments against one-pass statistics."""
+    df = _write_shards(tmp_path / "shards", 3)
+    paths = shard_paths(str(tmp_path / "shards"))
+
+    merged = {"n": 0, "mean": np.zeros(4), "m2": np.zeros(4), "class_counts": {}}
+    for path in paths:
+        merged = merge_moments(merged, shard_moments(path, chunksize=20))
+
+    X = df[FEATURE_COLS].to_numpy(dtype=np.float32).astype(np.float64)
+    assert merged["n"] == len(df)
+    np.testing.assert_allclose(merged["mean"], X.mean(axis=0))
+    np.testing.assert_allclose(merged["m2"] / merged["n"], X.var(axis=0))
+    assert merged["class_counts"] == df["species"].value_counts().to_dict()
+
+    # Edge case: merging with empty statistics is the identity
+    empty = {"n": 0, "mean": np.zeros(4), "m2": np.zeros(4), "class_counts": {}}
+    assert merge_moments(empty, empty)["n"] == 0
+    np.testing.assert_allclose(merge_moments(merged, empty)["m2"], merged["m2"])
+
+
+def test_train_sharded(tmp_path):
+    """Test train_sharded with normal and edge cases."""
+    df = _write_shards(tmp_path / "shards", 3)
+    paths = shard_paths(str(tmp_path / "shards"))
+
+    # Normal case: one Pipeline close to a single fit on all rows
+    model, info = train_sharded(paths, n_jobs=1)
+    assert (info["n_shards"], info["n_rows"], info["workers"]) == (3, len(df), 1)
+    X = df[FEATURE_COLS].astype(np.float32)
+    single = build_pipeline(FEATURE_COLS).fit(X, df["species"])
+    assert list(model.named_steps["classifier"].classes_) == sorted(df["species"].unique())
+    assert (model.predict(X) == single.predict(X)).mean() > 0.95
+    assert model.score(X, df["species"]) > 0.9
+
+    # Worker processes give the same model
+    parallel, parallel_info = train_sharded(paths, n_jobs=2)
+    assert parallel_info["workers"] == 2
+    np.testing.assert_allclose(
+        parallel.named_steps["classifier"].coef_, model.named_steps["classifier"].coef_
+    )
+
+    # Edge cases: a shard missing a class, no shards
+    write_iris(df[df["species"] == "setosa"].head(5), str(tmp_path / "shards" / "part-99999.parquet"))
+    with pytest.raises(ValueError, match="every shard needs every class"):
+        train_sharded(shard_paths(str(tmp_path / "shards")), n_jobs=1)
+    with pytest.raises(ValueError):
+        train_sharded([])
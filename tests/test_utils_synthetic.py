@@ -0,0 +1,127 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_io import iter_chunks, read_iris
+from utils_synthetic import (
+    FEATURE_COLS,
+    UNKNOWN_SPECIES,
+    _feature_moments,
+    fit_class_gaussians,
+    fit_class_kde,
+    generate_shards,
+    inject_anomalies,
+    sample_iris,
+)
+
+RAW_PATH = Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv"
+
+
+def test_fit_class_gaussians():
+    """Test fit_class_gaussians with normal and edge cases."""
+    df = pd.read_csv(RAW_PATH)
+    params = fit_class_gaussians(df)
+
+    assert set(params) == set(df["species"])
+    for species, p in params.items():
+        group = df[df["species"] == species][FEATURE_COLS]
+        np.testing.assert_allclose(p["mean"], group.mean().to_numpy())
+        assert p["cov"].shape == (len(FEATURE_COLS), len(FEATURE_COLS))
+    assert sum(p["weight"] for p in params.values()) == pytest.approx(1.0)
+
+    # Edge case: missing target column
+    with pytest.raises(KeyError):
+        fit_class_gaussians(df, target_col="label")
+
+
+def test_sample_iris():
+    """Test sample_iris with normal and edge cases."""
+    params = fit_class_gaussians(pd.read_csv(RAW_PATH))
+
+    # Normal case: shape, positivity, reproducibility and class balance
+    df = sample_iris(params, 3000, random_state=1)
+    assert list(df.columns) == FEATURE_COLS + ["species"]
+    assert len(df) == 3000
+    assert (df[FEATURE_COLS] >= 0.1).all().all()
+    pd.testing.assert_frame_equal(df, sample_iris(params, 3000, random_state=1))
+    assert df["species"].value_counts(normalize=True).between(0.28, 0.39).all()
+
+    # Edge cases: empty output and negative sizes
+    assert len(sample_iris(params, 0)) == 0
+    with pytest.raises(ValueError):
+        sample_iris(params, -1)
+
+
+def test_fit_class_kde():
+    """Test fit_class_kde sampling with normal and edge cases."""
+    raw = pd.read_csv(RAW_PATH)
+    params = fit_class_kde(raw)
+
+    # Normal case: per-species means stay close to the observed ones
+    df = sample_iris(params, 30000, random_state=1)
+    expected = raw.groupby("species")[FEATURE_COLS].mean()
+    actual = df.groupby("species")[FEATURE_COLS].mean()
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), atol=0.05)
+
+    # Normal case: the moments used for clipping match the sampled spread
+    _, std = _feature_moments(params)
+    np.testing.assert_allclose(std, df[FEATURE_COLS].std().to_numpy(), rtol=0.02)
+    kernel_only = {s: {**p, "data_cov": np.zeros_like(p["cov"])} for s, p in params.items()}
+    assert (std > _feature_moments(kernel_only)[1]).all()
+
+    # Edge case: a zero bandwidth only resamples observed rows
+    exact = sample_iris(fit_class_kde(raw, bandwidth=0.0), 200, random_state=1)
+    observed = set(map(tuple, raw[FEATURE_COLS].round(6).to_numpy()))
+    assert set(map(tuple, exact[FEATURE_COLS].round(6).to_numpy())) <= observed
+
+
+def test_inject_anomalies():
+    """Test inject_anomalies with normal and edge cases."""
+    params = fit_class_gaussians(pd.read_csv(RAW_PATH))
+    df = sample_iris(params, 10000, random_state=1)
+    clean = df.copy()
+
+    counts = inject_anomalies(df, params, duplicate_rate=0.02, outlier_rate=0.01, unknown_rate=0.005)
+    assert counts == {"duplicates": 200, "outliers": 100, "unknown_species": 50}
+    assert df.duplicated().sum() == 200
+    assert (df["species"] == UNKNOWN_SPECIES).sum() == 50
+    z = (df[FEATURE_COLS] - clean[FEATURE_COLS].mean()) / clean[FEATURE_COLS].std()
+    assert ((z > 4).any(axis=1)).sum() >= 100
+    assert list(df.dtypes) == list(clean.dtypes)
+
+    # Edge cases: invalid or overlapping rates
+    with pytest.raises(ValueError):
+        inject_anomalies(df, params, outlier_rate=-0.1)
+    with pytest.raises(ValueError):
+        inject_anomalies(df, params, duplicate_rate=0.4, unknown_rate=0.3)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_generate_shards(tmp_path, fmt):
+    """Test generate_shards with normal and edge cases."""
+    params = fit_class_gaussians(pd.read_csv(RAW_PATH))
+    kwargs = dict(shard_rows=400, fmt=fmt, random_state=3, duplicate_rate=0.01, max_z=3.5)
+
+    # Normal case: shard sizes, manifest, and output independent of n_jobs
+    manifest = generate_shards(params, 1000, str(tmp_path / "serial"), n_jobs=1, **kwargs)
+    generate_shards(params, 1000, str(tmp_path / "parallel"), n_jobs=2, **kwargs)
+    assert [shard["rows"] for shard in manifest["shards"]] == [400, 400, 200]
+    assert sum(shard["duplicates"] for shard in manifest["shards"]) == 10
+    with open(tmp_path / "serial" / "manifest.json") as f:
+        assert json.load(f) == manifest
+
+    serial = read_iris(str(tmp_path / "serial"))
+    pd.testing.assert_frame_equal(serial, read_iris(str(tmp_path / "parallel")))
+    assert len(serial) == 1000
+    assert sum(len(chunk) for chunk in iter_chunks(str(tmp_path / "serial"), 300)) == 1000
+
+    # Edge cases: no rows, and an unknown format
+    assert generate_shards(params, 0, str(tmp_path / "empty"))["shards"] == []
+    with pytest.raises(ValueError):
+        generate_shards(params, 10, str(tmp_path / "bad"), fmt="xlsx")
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure we can import from src/
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils_zoo import ZOO_MODELS, SharedFolds, _zoo_factories, attach_folds, run_zoo
+
+RAW_PATH = Path(__file__).resolve().parents[1] / "data" / "raw" / "iris.csv"
+
+
+def _iris():
+    df = pd.read_csv(RAW_PATH)
+    return df.drop(columns="species"), df["species"]
+
+
+def test_shared_folds_are_scaled_per_fold():
+    """Test SharedFolds/attach_folds with normal and edge cases."""
+    X, y = _iris()
+    with SharedFolds(X, y, cv=5) as folds:
+        arrays = attach_folds(folds.layout)
+        assert folds.n_folds == 5
+        assert list(folds.classes) == ["setosa", "versicolor", "virginica"]
+
+        # Each fold is standardized on its own training rows
+        X_train = arrays["X_train_0"]
+        assert np.allclose(X_train.mean(axis=0), 0.0)
+        assert np.allclose(X_train.std(axis=0), 1.0)
+        assert len(X_train) + len(arrays["X_test_0"]) == len(X)
+        assert arrays["y_test_0"].dtype == np.int64
+
+
+def test_run_zoo_compares_models():
+    """Test run_zoo with normal and edge cases."""
+    X, y = _iris()
+
+    # Normal case: serial and process-pool runs give the same scores
+    serial = run_zoo(X, y, models=["dummy", "lda", "knn"], n_jobs=1)
+    parallel = run_zoo(X, y, models=["dummy", "lda", "knn"], n_jobs=2)
+    assert list(serial["model"]) == list(parallel["model"])
+    assert np.allclose(serial["mean_accuracy"], parallel["mean_accuracy"])
+    assert serial.iloc[-1]["model"] == "dummy"
+    assert (serial[["fit_ms", "predict_us_per_row", "predict_1row_ms"]] > 0).all().all()
+
+    # Edge case: unknown model names
+    with pytest.raises(ValueError):
+        run_zoo(X, y, models=["perceptron"])
+
+    # The CLI's model list matches the registered factories
+    assert ZOO_MODELS == tuple(_zoo_factories(0))